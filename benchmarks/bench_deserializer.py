@@ -0,0 +1,78 @@
+"""Compare the default item converter with the native deserializer.
+
+The default path is `DynamoDbConnector.item_to_record` with the default
+settings, which keeps numbers as strings. The native path is
+`deserialize_item`, which converts numbers to JSON numbers.
+
+Usage:
+    poetry run python benchmarks/bench_deserializer.py --items 1000 --width 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from tap_dynamodb.deserializer import deserialize_item
+from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+
+CONNECTOR = DynamoDbConnector({})
+
+
+def make_item(num: int, width: int) -> dict:
+    """Build a synthetic item in DynamoDB wire format."""
+    item: dict = {"pk": {"S": f"pk_{num}"}, "sk": {"N": str(num)}}
+    for col in range(width):
+        kind = col % 5
+        if kind == 0:
+            item[f"s_{col}"] = {"S": f"value_{num}_{col}"}
+        elif kind == 1:
+            item[f"n_{col}"] = {"N": str(num * col)}
+        elif kind == 2:
+            item[f"f_{col}"] = {"N": f"{num}.{col}"}
+        elif kind == 3:
+            item[f"m_{col}"] = {
+                "M": {"a": {"S": "x"}, "b": {"N": "1"}, "c": {"BOOL": True}}
+            }
+        else:
+            item[f"l_{col}"] = {"L": [{"N": str(i)} for i in range(5)]}
+    return item
+
+
+def default_path(items: list[dict]) -> list[dict]:
+    """Convert the items the way the connector does by default."""
+    return [CONNECTOR.item_to_record(item) for item in items]
+
+
+def native_path(items: list[dict]) -> list[dict]:
+    """Deserialize with the native deserializer."""
+    return [deserialize_item(item) for item in items]
+
+
+def bench(func, items: list[dict], rounds: int) -> float:
+    """Return the best records/sec over a number of rounds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(items)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    items = [make_item(num, args.width) for num in range(args.items)]
+    default = bench(default_path, items, args.rounds)
+    native = bench(native_path, items, args.rounds)
+    print(f"default path: {default:12,.0f} records/sec")
+    print(f"native path:  {native:12,.0f} records/sec ({native / default:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Benchmark each stage of the extraction hot path against a local DynamoDB.
+
+A synthetic table is filled in moto, or in DynamoDB Local when an endpoint URL
+is given, and every stage a record goes through is measured on its own:
+
+* scan: reading the records through `DynamoDbConnector.scan_pages`, the way
+  the tap does, with its rate limiter, retry policy, page sizer and prefetch
+  thread or segment workers. Converting the items into records is included.
+* deserialize: converting the wire format items into records on their own.
+* schema: inferring the JSON schema from the records.
+* serialize: formatting the records as Singer RECORD messages.
+
+For each stage the best records/sec and bytes/sec over a number of rounds, the
+CPU time and the peak memory are reported as JSON, so runs can be compared
+over time. The memory of a stage is measured twice:
+
+* peak_traced_bytes: the peak of the Python allocations made by the stage,
+  traced in a round of its own.
+* peak_rss_delta_bytes: how far the resident set size of the process grew
+  above its size at the start of the stage, during the timed rounds. The
+  high-water mark of the process is reset before every stage, which needs
+  Linux; elsewhere the RSS fields are null.
+
+Usage:
+    poetry run python benchmarks/bench_extraction.py --items 5000 --depth 2
+
+    Use `--endpoint-url http://localhost:8000` to run against DynamoDB Local
+    and `--output bench.json` to write the results to a file. Tap settings
+    used by the scan, e.g. `scan_memory_budget`, `scan_prefetch_pages` or
+    `max_read_capacity_units`, are given as JSON with `--tap-config`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import functools
+import json
+import platform
+import time
+import tracemalloc
+import typing as t
+from importlib.metadata import version
+
+import boto3
+import genson
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk._singerlib.encoding import SimpleSingerWriter
+
+from tap_dynamodb.deserializer import deserialize_item
+from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+
+TABLE_NAME = "bench"
+
+
+def make_value(num: int, col: int, depth: int, string_size: int) -> dict:
+    """Build a synthetic attribute value nested `depth` levels deep."""
+    kind = col % 5
+    if kind == 0:
+        return {"S": f"{num}_{col}_".ljust(string_size, "x")}
+    if kind == 1:
+        return {"N": str(num * col)}
+    if kind == 2:
+        return {"N": f"{num}.{col}"}
+    if kind == 3 and depth > 0:
+        return {
+            "M": {
+                f"k_{key}": make_value(num, key, depth - 1, string_size)
+                for key in range(4)
+            }
+        }
+    if kind == 4 and depth > 0:
+        return {"L": [make_value(num, key, depth - 1, string_size) for key in range(4)]}
+    return {"BOOL": num % 2 == 0}
+
+
+def make_item(num: int, width: int, depth: int, string_size: int) -> dict:
+    """Build a synthetic item in DynamoDB wire format."""
+    item = {"pk": {"S": f"pk_{num}"}}
+    for col in range(width):
+        item[f"a_{col}"] = make_value(num, col, depth, string_size)
+    return item
+
+
+def fill_table(client, args: argparse.Namespace) -> None:
+    """Create the benchmark table and write the synthetic items to it."""
+    client.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    client.get_waiter("table_exists").wait(TableName=TABLE_NAME)
+    batch = []
+    for num in range(args.items):
+        item = make_item(num, args.width, args.depth, args.string_size)
+        batch.append({"PutRequest": {"Item": item}})
+        if len(batch) == 25 or num == args.items - 1:
+            pending = {TABLE_NAME: batch}
+            while pending:
+                pending = client.batch_write_item(RequestItems=pending)[
+                    "UnprocessedItems"
+                ]
+            batch = []
+
+
+def scan_table(client) -> list[dict]:
+    """Read the wire format items the other stages start from."""
+    items: list[dict] = []
+    scan_kwargs: dict = {"TableName": TABLE_NAME}
+    while True:
+        response = client.scan(**scan_kwargs)
+        items.extend(response["Items"])
+        if "LastEvaluatedKey" not in response:
+            return items
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def scan_records(connector: DynamoDbConnector, scan_kwargs: dict) -> list[dict]:
+    """Read the records of the table the way the tap does."""
+    return [
+        record
+        for page in connector.scan_pages(TABLE_NAME, scan_kwargs)
+        for record in page.items
+    ]
+
+
+def infer_schema(records: list[dict]) -> dict:
+    """Infer the schema the same way the connector does."""
+    builder = genson.SchemaBuilder(schema_uri=None)
+    for record in records:
+        builder.add_object(record)
+    return builder.to_schema()
+
+
+def serialize_records(records: list[dict]) -> list[str]:
+    """Format the records as Singer RECORD messages."""
+    writer = SimpleSingerWriter()
+    return [
+        writer.format_message(RecordMessage(stream=TABLE_NAME, record=record))
+        for record in records
+    ]
+
+
+def proc_status_bytes(field: str) -> int | None:
+    """Return a memory field of /proc/self/status in bytes, if available."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the RSS high-water mark of the process, returning if it worked."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def measure(
+    func: t.Callable[[t.Any], t.Any],
+    data: t.Any,
+    records: int,
+    size: int,
+    rounds: int,
+) -> dict:
+    """Measure a stage, keeping the best of a number of rounds."""
+    best_wall = best_cpu = float("inf")
+    rss_start = peak_rss = None
+    if reset_peak_rss():
+        # Right after the reset, the high-water mark is the current RSS.
+        rss_start = peak_rss = proc_status_bytes("VmHWM")
+    for _ in range(rounds):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func(data)
+        best_wall = min(best_wall, time.perf_counter() - wall_start)
+        best_cpu = min(best_cpu, time.process_time() - cpu_start)
+    if peak_rss is not None:
+        peak_rss = proc_status_bytes("VmHWM")
+    # Tracing allocations slows the stage down, so it gets a round of its own.
+    tracemalloc.start()
+    func(data)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "records": records,
+        "bytes": size,
+        "wall_seconds": best_wall,
+        "cpu_seconds": best_cpu,
+        "records_per_second": records / best_wall,
+        "bytes_per_second": size / best_wall,
+        "peak_traced_bytes": peak_traced,
+        "rss_start_bytes": rss_start,
+        "peak_rss_delta_bytes": (
+            # The kernel updates the RSS counters lazily, so allow for noise.
+            max(0, peak_rss - rss_start)
+            if peak_rss is not None and rss_start is not None
+            else None
+        ),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Fill the table and measure every stage."""
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        endpoint_url=args.endpoint_url,
+        aws_access_key_id="bench",
+        aws_secret_access_key="bench",
+    )
+    fill_table(client, args)
+    connector = DynamoDbConnector(
+        {
+            **json.loads(args.tap_config),
+            "aws_access_key_id": "bench",
+            "aws_secret_access_key": "bench",
+            "aws_default_region": "us-east-1",
+            "aws_endpoint_url": args.endpoint_url,
+        }
+    )
+    scan_kwargs = {"TotalSegments": args.segments} if args.segments > 1 else {}
+    try:
+        wire_items = scan_table(client)
+        wire_size = len(json.dumps(wire_items))
+        records = [deserialize_item(item, str) for item in wire_items]
+        record_size = len(json.dumps(records))
+        count = len(wire_items)
+        stages = {
+            "scan": measure(
+                functools.partial(scan_records, connector),
+                scan_kwargs,
+                count,
+                wire_size,
+                args.rounds,
+            ),
+            "deserialize": measure(
+                lambda items: [deserialize_item(item, str) for item in items],
+                wire_items,
+                count,
+                wire_size,
+                args.rounds,
+            ),
+            "schema": measure(infer_schema, records, count, record_size, args.rounds),
+            "serialize": measure(
+                serialize_records, records, count, record_size, args.rounds
+            ),
+        }
+    finally:
+        client.delete_table(TableName=TABLE_NAME)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.endpoint_url or "moto",
+            "versions": {
+                package: version(package)
+                for package in ("boto3", "botocore", "singer-sdk", "moto")
+            },
+            "parameters": {
+                "items": args.items,
+                "width": args.width,
+                "depth": args.depth,
+                "string_size": args.string_size,
+                "rounds": args.rounds,
+                "segments": args.segments,
+                "tap_config": json.loads(args.tap_config),
+            },
+        },
+        "stages": stages,
+    }
+
+
+def main() -> None:
+    """Run the benchmark suite and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=50, help="Attributes per item.")
+    parser.add_argument("--depth", type=int, default=1, help="Map/list nesting.")
+    parser.add_argument("--string-size", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--segments", type=int, default=1, help="Scan segments read in parallel."
+    )
+    parser.add_argument(
+        "--tap-config", default="{}", help="Tap settings used by the scan, as JSON."
+    )
+    parser.add_argument(
+        "--endpoint-url",
+        help="A DynamoDB Local endpoint, moto is used if not given.",
+    )
+    parser.add_argument("--output", help="The JSON file, stdout if not given.")
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        results = run(args)
+    else:
+        from moto import mock_aws
+
+        with mock_aws():
+            results = run(args)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark the startup time of the tap.
+
+Every measurement runs in a fresh interpreter with `python -X importtime`:
+
+* import: importing `tap_dynamodb.tap`, in total and on top of the Singer SDK.
+* about, version: running the CLI with `--about` and `--version`.
+
+For each the best time over a number of rounds is reported as JSON, along
+with the heavy modules loaded, which should be none of boto3, botocore,
+genson or the boto3 stubs.
+
+Usage:
+    poetry run python benchmarks/bench_import.py --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("boto3", "botocore", "genson", "mypy_boto3_dynamodb")
+COMMANDS = {
+    "import": ["-c", "import tap_dynamodb.tap"],
+    # The SDK and click are imported first, so the tap's own share is measured.
+    "import_tap_only": ["-c", "import singer_sdk, click; import tap_dynamodb.tap"],
+    "about": ["-m", "tap_dynamodb", "--about"],
+    "version": ["-m", "tap_dynamodb", "--version"],
+}
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Return the cumulative import time of each module, in microseconds."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def run_command(args: list[str]) -> tuple[float, dict[str, int]]:
+    """Run the interpreter, returning its wall time and the import times."""
+    started_at = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - started_at, parse_importtime(process.stderr)
+
+
+def measure(args: list[str], rounds: int) -> dict:
+    """Measure a command, keeping the best of a number of rounds."""
+    best_wall = best_import = float("inf")
+    modules: dict[str, int] = {}
+    for _ in range(rounds):
+        wall, modules = run_command(args)
+        best_wall = min(best_wall, wall)
+        best_import = min(best_import, modules.get("tap_dynamodb.tap", 0) / 1e6)
+    return {
+        "wall_seconds": best_wall,
+        "tap_import_seconds": best_import,
+        "heavy_modules": sorted(
+            module for module in modules if module.split(".")[0] in HEAVY_MODULES
+        ),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="The JSON file, stdout if not given.")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {"rounds": args.rounds},
+        },
+        "commands": {
+            name: measure(command, args.rounds) for name, command in COMMANDS.items()
+        },
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
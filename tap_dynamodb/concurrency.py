@@ -0,0 +1,209 @@
+"""Helpers for running producers in worker threads."""
+
+from __future__ import annotations
+
+import collections
+import queue
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+if t.TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+_K = t.TypeVar("_K")
+_T = t.TypeVar("_T")
+
+_DONE = object()
+
+
+def iter_concurrently(
+    producers: Iterable[t.Callable[[], Iterable[_T]]],
+    max_workers: int,
+    max_buffered_items: int,
+    thread_name_prefix: str = "",
+) -> Generator[_T, None, None]:
+    """Run producers in worker threads and merge their items into one iterator.
+
+    Items are handed over through a bounded queue, so a slow consumer blocks the
+    workers instead of letting memory grow. The first exception raised by a
+    producer is re-raised to the consumer. When the consumer stops early, or
+    fails, the workers stop before their next item and are joined.
+
+    Args:
+        producers: Callables returning the items to produce, one per task.
+        max_workers: The number of worker threads.
+        max_buffered_items: The maximum number of items waiting to be consumed.
+        thread_name_prefix: The prefix of the worker thread names.
+
+    Yields:
+        The produced items, in arrival order.
+    """
+    producers = list(producers)
+    items: queue.Queue = queue.Queue(maxsize=max(1, max_buffered_items))
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _worker(producer: t.Callable[[], Iterable[_T]]) -> None:
+        try:
+            for item in producer():
+                if not _put(item):
+                    return
+        except Exception as err:
+            _put(err)
+        else:
+            _put(_DONE)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, max_workers),
+        thread_name_prefix=thread_name_prefix,
+    )
+    try:
+        for producer in producers:
+            executor.submit(_worker, producer)
+        remaining = len(producers)
+        while remaining:
+            item = items.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ConcurrentPartitions(t.Generic[_K, _T]):
+    """Run a producer per partition in worker threads, keeping their items apart.
+
+    The partitions are consumed one after the other, in the order of the
+    producers, while the workers read ahead. At most `max_buffered_items` items
+    of the partitions ahead of the consumer are held, and as many of the one
+    being consumed, so a worker reading ahead blocks instead of letting memory
+    grow, while the partition being consumed never waits on the others.
+    Workers start the partitions in order, so a partition is always started by
+    the time the consumer reaches it.
+
+    The workers start when the first partition is consumed. The first exception
+    raised by a producer is re-raised when its partition is consumed. Without
+    workers, each partition is produced on demand by the consumer's thread.
+    """
+
+    def __init__(
+        self,
+        producers: dict[_K, t.Callable[[], Iterable[_T]]],
+        max_workers: int,
+        max_buffered_items: int,
+        thread_name_prefix: str = "",
+    ) -> None:
+        """Initialize the partitions.
+
+        Args:
+            producers: A mapping of partition to the callable returning its
+                items, in the order the partitions are consumed.
+            max_workers: The number of worker threads, 0 to produce the items
+                on demand in the consumer's thread.
+            max_buffered_items: The maximum number of items waiting to be
+                consumed, besides those of the partition being consumed.
+            thread_name_prefix: The prefix of the worker thread names.
+        """
+        self._producers = producers
+        self._max_workers = max(0, max_workers)
+        self._max_buffered_items = max(1, max_buffered_items)
+        self._thread_name_prefix = thread_name_prefix
+        self._buffers: dict[_K, collections.deque] = {
+            key: collections.deque() for key in producers
+        }
+        self._buffered_items = 0
+        self._current: _K | None = None
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _put(self, key: _K, item: t.Any) -> bool:
+        with self._condition:
+            while not self._stopped and not (
+                self._buffered_items < self._max_buffered_items
+                or (
+                    key == self._current
+                    and len(self._buffers[key]) < self._max_buffered_items
+                )
+            ):
+                self._condition.wait()
+            if self._stopped:
+                return False
+            self._buffers[key].append(item)
+            self._buffered_items += 1
+            self._condition.notify_all()
+            return True
+
+    def _finish(self, key: _K, marker: t.Any) -> None:
+        # The end of a partition never waits, so its worker is freed at once.
+        with self._condition:
+            self._buffers[key].append(marker)
+            self._condition.notify_all()
+
+    def _worker(self, key: _K) -> None:
+        try:
+            for item in self._producers[key]():
+                if not self._put(key, item):
+                    return
+        except Exception as err:
+            self._finish(key, err)
+        else:
+            self._finish(key, _DONE)
+
+    def iter_partition(self, key: _K) -> Generator[_T, None, None]:
+        """Yield the items of a partition.
+
+        Args:
+            key: The partition.
+
+        Yields:
+            The items of the partition, in the order they were produced.
+        """
+        if not self._max_workers:
+            yield from self._producers[key]()
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix=self._thread_name_prefix,
+            )
+            for producer_key in self._producers:
+                self._executor.submit(self._worker, producer_key)
+        buffer = self._buffers[key]
+        with self._condition:
+            self._current = key
+            self._condition.notify_all()
+        while True:
+            with self._condition:
+                while not buffer:
+                    self._condition.wait()
+                item = buffer.popleft()
+                if item is not _DONE and not isinstance(item, Exception):
+                    self._buffered_items -= 1
+                    self._condition.notify_all()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        """Stop the workers before their next item and join them."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
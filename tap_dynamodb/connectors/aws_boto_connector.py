@@ -2,13 +2,21 @@
 
 import logging
 import os
+import threading
 import typing as t
 
 import boto3.session
+import botocore.session
 from boto3.resources.base import ServiceResource
 from boto3.session import Session
 from botocore.client import BaseClient
-from singer_sdk import typing as th  # JSON schema typing helpers
+from botocore.config import Config
+from botocore.credentials import CredentialProvider, RefreshableCredentials
+
+from tap_dynamodb.connectors.aws_config import (  # noqa: F401
+    AWS_AUTH_CONFIG,
+    AWS_CONNECTION_CONFIG,
+)
 
 try:
     import boto3
@@ -22,65 +30,47 @@ if t.TYPE_CHECKING:
     from mypy_boto3_sts import STSClient
 
 
-AWS_AUTH_CONFIG = th.PropertiesList(
-    th.Property(
-        "aws_access_key_id",
-        th.StringType,
-        secret=True,
-        description="The access key for your AWS account.",
-    ),
-    th.Property(
-        "aws_secret_access_key",
-        th.StringType,
-        secret=True,
-        description="The secret key for your AWS account.",
-    ),
-    th.Property(
-        "aws_session_token",
-        th.StringType,
-        secret=True,
-        description=(
-            "The session key for your AWS account. This is only needed when"
-            " you are using temporary credentials."
-        ),
-    ),
-    th.Property(
-        "aws_profile",
-        th.StringType,
-        description=(
-            "The AWS credentials profile name to use. The profile must be "
-            "configured and accessible."
-        ),
-    ),
-    th.Property(
-        "aws_default_region",
-        th.StringType,
-        description="The default AWS region name (e.g. us-east-1) ",
-    ),
-    th.Property(
-        "aws_endpoint_url",
-        th.StringType,
-        description="The complete URL to use for the constructed client.",
-    ),
-    th.Property(
-        "aws_assume_role_arn",
-        th.StringType,
-        description="The role ARN to assume.",
-    ),
-    th.Property(
-        "use_aws_env_vars",
-        th.BooleanType,
-        default=False,
-        description=("Whether to retrieve aws credentials from environment variables."),
-    ),
-).to_dict()
-
+# botocore's own default pool size.
+DEFAULT_MAX_POOL_CONNECTIONS = 10
 
 _T = t.TypeVar("_T", bound=t.Union[ServiceResource, BaseClient])
 _R = t.TypeVar("_R", bound=ServiceResource)
 _C = t.TypeVar("_C", bound=BaseClient)
 
 
+class AssumedRoleCredentialProvider(CredentialProvider):
+    """Provides the credentials of an assumed role, renewed before they expire.
+
+    botocore renews the credentials from the first thread using them within 15
+    minutes of their expiry, while the other threads keep using the current
+    ones. Only within 10 minutes of the expiry do threads wait for the renewal.
+    """
+
+    METHOD = "custom-tap-dynamodb-assume-role"
+    CANONICAL_NAME = "custom-tap-dynamodb-assume-role"
+
+    def __init__(self, assume_role: t.Callable[[], dict]) -> None:
+        """Initialize the provider.
+
+        Args:
+            assume_role: Assumes the role, returning the credentials metadata.
+        """
+        super().__init__()
+        self._assume_role = assume_role
+
+    def load(self) -> RefreshableCredentials:
+        """Assume the role.
+
+        Returns:
+            The credentials of the role.
+        """
+        return RefreshableCredentials.create_from_metadata(
+            metadata=self._assume_role(),
+            refresh_using=self._assume_role,
+            method=self.METHOD,
+        )
+
+
 class AWSBotoConnector(t.Generic[_R, _C]):
     """AWS Boto Connector class for Singer SDK."""
 
@@ -97,8 +87,12 @@ class AWSBotoConnector(t.Generic[_R, _C]):
         """
         self._service_name = service_name
         self._config = config
+        self._session: Session | None = None
         self._client: _C | None = None
         self._resource: _R | None = None
+        # Guards the lazy creation of the session, client and resource, which
+        # are shared by every thread using the connector.
+        self._lock = threading.RLock()
         # config for use environment variables
         if config.get("use_aws_env_vars"):
             self.aws_access_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
@@ -134,18 +128,33 @@ class AWSBotoConnector(t.Generic[_R, _C]):
         """
         return logging.getLogger("aws_boto_connector")
 
+    @property
+    def session(self) -> Session:
+        """Return the boto3 session shared by the client and the resource.
+
+        Returns:
+            boto3.session: The boto3 session.
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = self.get_session()
+            return self._session
+
     @property
     def client(self) -> _C:
         """Return the boto3 client for the service.
 
+        The client is created once and shared by every thread, so its pooled
+        connections are reused by all workers.
+
         Returns:
             boto3.client: The boto3 client for the service.
         """
         if self._client:
             return self._client
-        else:
-            session = self.get_session()
-            self._client = self.get_client(session, self._service_name)  # type: ignore[assignment]
+        with self._lock:
+            if not self._client:
+                self._client = self.get_client(self.session, self._service_name)  # type: ignore[assignment]
             return self._client  # type: ignore[return-value]
 
     @property
@@ -157,11 +166,35 @@ class AWSBotoConnector(t.Generic[_R, _C]):
         """
         if self._resource:
             return self._resource
-        else:
-            session = self.get_session()
-            self._resource = self.get_resource(session, self._service_name)  # type: ignore[assignment]
+        with self._lock:
+            if not self._resource:
+                self._resource = self.get_resource(self.session, self._service_name)  # type: ignore[assignment]
             return self._resource  # type: ignore[return-value]
 
+    @property
+    def default_max_pool_connections(self) -> int:
+        """Return the pool size used when `aws_max_pool_connections` is not set.
+
+        Returns:
+            The maximum number of pooled connections.
+        """
+        return DEFAULT_MAX_POOL_CONNECTIONS
+
+    def get_client_config(self) -> Config:
+        """Return the botocore config of the clients and resources.
+
+        Returns:
+            The connection pool, timeout and retry settings.
+        """
+        return Config(
+            max_pool_connections=self.config.get("aws_max_pool_connections")
+            or self.default_max_pool_connections,
+            connect_timeout=self.config.get("aws_connect_timeout", 60),
+            read_timeout=self.config.get("aws_read_timeout", 60),
+            tcp_keepalive=self.config.get("aws_tcp_keepalive", False),
+            retries={"mode": self.config.get("aws_retry_mode", "legacy")},
+        )
+
     def get_session(self) -> Session:
         """Return the boto3 session.
 
@@ -214,15 +247,22 @@ class AWSBotoConnector(t.Generic[_R, _C]):
             session = self._assume_role(session, self.aws_assume_role_arn)
         return session
 
-    def _factory(self, aws_obj: t.Callable[..., _T], service_name: str) -> _T:
+    def _factory(
+        self,
+        aws_obj: t.Callable[..., _T],
+        service_name: str,
+        config: t.Optional[Config] = None,
+    ) -> _T:
         if self.aws_endpoint_url:
             return aws_obj(
                 service_name,
                 endpoint_url=self.aws_endpoint_url,
+                config=config or self.get_client_config(),
             )
         else:
             return aws_obj(
                 service_name,
+                config=config or self.get_client_config(),
             )
 
     def get_resource(self, session: Session, service_name: str) -> ServiceResource:
@@ -237,28 +277,59 @@ class AWSBotoConnector(t.Generic[_R, _C]):
         """
         return self._factory(session.resource, service_name)
 
-    def get_client(self, session: Session, service_name: str) -> BaseClient:
+    def get_client(
+        self,
+        session: Session,
+        service_name: str,
+        config: t.Optional[Config] = None,
+    ) -> BaseClient:
         """Return the boto3 client for the service.
 
         Args:
             session (boto3.session.Session): The boto3 session.
             service_name (str): The name of the AWS service.
+            config (botocore.config.Config): The client config, defaults to the
+                one from `get_client_config`.
 
         Returns:
             boto3.client: The boto3 client for the service.
         """
-        return self._factory(session.client, service_name)
+        return self._factory(session.client, service_name, config)
 
     def _assume_role(self, session: Session, role_arn: str) -> Session:
-        # TODO: use for auto refresh https://github.com/benkehoe/aws-assume-role-lib
+        """Return a session using the credentials of a role.
+
+        The role is assumed when the credentials are first used, and again
+        before they expire. Each connector creates its session once, so the
+        credentials are neither shared with nor kept by other connectors.
+
+        Args:
+            session (boto3.session.Session): The session assuming the role.
+            role_arn (str): The role ARN to assume.
+
+        Returns:
+            boto3.session: The session of the role.
+        """
         sts_client: STSClient = self.get_client(session, "sts")  # type: ignore[assignment]
-        response = sts_client.assume_role(
-            RoleArn=role_arn,
-            RoleSessionName="tap-dynamodb",
+
+        def _assume_role() -> dict:
+            self.logger.info("Assuming role %s.", role_arn)
+            credentials = sts_client.assume_role(
+                RoleArn=role_arn,
+                RoleSessionName="tap-dynamodb",
+            )["Credentials"]
+            return {
+                "access_key": credentials["AccessKeyId"],
+                "secret_key": credentials["SecretAccessKey"],
+                "token": credentials["SessionToken"],
+                "expiry_time": credentials["Expiration"].isoformat(),
+            }
+
+        botocore_session = botocore.session.get_session()
+        botocore_session.get_component("credential_provider").insert_before(
+            "env", AssumedRoleCredentialProvider(_assume_role)
         )
         return boto3.Session(
-            aws_access_key_id=response["Credentials"]["AccessKeyId"],
-            aws_secret_access_key=response["Credentials"]["SecretAccessKey"],
-            aws_session_token=response["Credentials"]["SessionToken"],
+            botocore_session=botocore_session,
             region_name=self.aws_default_region,
         )
@@ -0,0 +1,106 @@
+"""Settings of the AWS connectors.
+
+They are kept apart from the connectors, so the tap's settings are known
+without importing boto3.
+"""
+
+from singer_sdk import typing as th  # JSON schema typing helpers
+
+AWS_AUTH_CONFIG = th.PropertiesList(
+    th.Property(
+        "aws_access_key_id",
+        th.StringType,
+        secret=True,
+        description="The access key for your AWS account.",
+    ),
+    th.Property(
+        "aws_secret_access_key",
+        th.StringType,
+        secret=True,
+        description="The secret key for your AWS account.",
+    ),
+    th.Property(
+        "aws_session_token",
+        th.StringType,
+        secret=True,
+        description=(
+            "The session key for your AWS account. This is only needed when"
+            " you are using temporary credentials."
+        ),
+    ),
+    th.Property(
+        "aws_profile",
+        th.StringType,
+        description=(
+            "The AWS credentials profile name to use. The profile must be "
+            "configured and accessible."
+        ),
+    ),
+    th.Property(
+        "aws_default_region",
+        th.StringType,
+        description="The default AWS region name (e.g. us-east-1) ",
+    ),
+    th.Property(
+        "aws_endpoint_url",
+        th.StringType,
+        description="The complete URL to use for the constructed client.",
+    ),
+    th.Property(
+        "aws_assume_role_arn",
+        th.StringType,
+        description=(
+            "The role ARN to assume. The role's credentials are renewed before "
+            "they expire."
+        ),
+    ),
+    th.Property(
+        "use_aws_env_vars",
+        th.BooleanType,
+        default=False,
+        description=("Whether to retrieve aws credentials from environment variables."),
+    ),
+).to_dict()
+
+AWS_CONNECTION_CONFIG = th.PropertiesList(
+    th.Property(
+        "aws_max_pool_connections",
+        th.IntegerType,
+        description=(
+            "The maximum number of pooled HTTP connections per client. Pages "
+            "are read with a client of their own, separate from the one listing "
+            "and describing tables. Defaults to enough connections for every "
+            "thread using a client at once."
+        ),
+    ),
+    th.Property(
+        "aws_connect_timeout",
+        th.NumberType,
+        description="The number of seconds before a connection attempt times out.",
+        default=60,
+    ),
+    th.Property(
+        "aws_read_timeout",
+        th.NumberType,
+        description="The number of seconds before reading a response times out.",
+        default=60,
+    ),
+    th.Property(
+        "aws_tcp_keepalive",
+        th.BooleanType,
+        description="Whether to send TCP keep-alive packets on pooled connections.",
+        default=False,
+    ),
+    th.Property(
+        "aws_retry_mode",
+        th.StringType,
+        description=(
+            "The botocore retry mode, see the [boto3 retries guide]"
+            "(https://boto3.amazonaws.com/v1/documentation/api/latest/guide/retries.html)."
+            " Scan and query pages are retried by the tap's own retry settings "
+            "instead."
+        ),
+        default="legacy",
+        allowed_values=["legacy", "standard", "adaptive"],
+    ),
+).to_dict()
@@ -0,0 +1,89 @@
+"""Fast conversion of DynamoDB values into JSON native types."""
+
+from __future__ import annotations
+
+import base64
+import typing as t
+
+
+def _number(value: str) -> int | float:
+    """Convert a DynamoDB number string to an int, or a float if it has a fraction.
+
+    Args:
+        value: The number as sent over the wire.
+
+    Returns:
+        The number as an int or float.
+    """
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _binary(value: bytes | str) -> str:
+    # Raw DynamoDB JSON (e.g. from exports) already holds base64 strings.
+    if isinstance(value, str):
+        return value
+    return base64.b64encode(value).decode("ascii")
+
+
+def deserialize_value(
+    attribute_value: dict,
+    number: t.Callable[[str], t.Any] = _number,
+) -> t.Any:
+    """Deserialize a single DynamoDB attribute value.
+
+    Unlike boto3's `TypeDeserializer` no `Decimal`, `Binary` or `set` objects are
+    created: numbers become ints or floats, sets become sorted lists and binary
+    values become base64 strings, so the result can be serialized to JSON as is.
+
+    Args:
+        attribute_value: A DynamoDB attribute value, e.g. `{"N": "1"}`.
+        number: The function used to convert number strings. Pass `str` to keep
+            numbers as strings.
+
+    Returns:
+        The JSON native value.
+
+    Raises:
+        TypeError: If the attribute value has an unknown type descriptor.
+    """
+    for type_descriptor, value in attribute_value.items():
+        if type_descriptor == "S":
+            return value
+        if type_descriptor == "N":
+            return number(value)
+        if type_descriptor == "M":
+            return {key: deserialize_value(item, number) for key, item in value.items()}
+        if type_descriptor == "L":
+            return [deserialize_value(item, number) for item in value]
+        if type_descriptor == "BOOL":
+            return value
+        if type_descriptor == "NULL":
+            return None
+        if type_descriptor == "SS":
+            return sorted(value)
+        if type_descriptor == "NS":
+            return sorted(number(item) for item in value)
+        if type_descriptor == "B":
+            return _binary(value)
+        if type_descriptor == "BS":
+            return sorted(_binary(item) for item in value)
+        raise TypeError(f"Unknown DynamoDB type descriptor: {type_descriptor}")
+    raise TypeError("Empty DynamoDB attribute value")
+
+
+def deserialize_item(
+    item: dict,
+    number: t.Callable[[str], t.Any] = _number,
+) -> dict:
+    """Deserialize a DynamoDB item returned by the low-level client.
+
+    Args:
+        item: A mapping of attribute names to DynamoDB attribute values.
+        number: The function used to convert number strings.
+
+    Returns:
+        The item as a JSON native dict.
+    """
+    return {key: deserialize_value(value, number) for key, value in item.items()}
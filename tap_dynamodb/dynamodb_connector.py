@@ -1,16 +1,128 @@
 """DynamoDB connector class."""
 
-import genson
-import orjson
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import math
+import time
+import typing as t
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
 from singer_sdk import typing as th  # JSON schema typing helpers
 
+from tap_dynamodb.concurrency import ConcurrentPartitions, iter_concurrently
 from tap_dynamodb.connectors.aws_boto_connector import AWSBotoConnector
-from tap_dynamodb.exception import EmptyTableException
+from tap_dynamodb.deserializer import deserialize_item
+from tap_dynamodb.metrics import log_page_metrics, timed_pages
+from tap_dynamodb.page_sizer import PageSizer
+from tap_dynamodb.rate_limiter import ReadCapacityLimiter
+from tap_dynamodb.retry import DEFAULT_RETRYABLE_ERROR_CODES, RetryPolicy, error_code
+from tap_dynamodb.scan_planner import MAX_SEGMENTS, ScanPlan, plan_scan
+from tap_dynamodb.schema_cache import SchemaCache
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from boto3.session import Session
+    from botocore.client import BaseClient
+
+    # The stubs are only used by the quoted type arguments of the base class.
+    from mypy_boto3_dynamodb import (  # noqa: F401
+        DynamoDBClient,
+        DynamoDBServiceResource,
+    )
+    from mypy_boto3_dynamodb.type_defs import (
+        ExportDescriptionTypeDef,
+        ScanOutputTypeDef,
+        TableDescriptionTypeDef,
+    )
+
+# Errors after which the read capacity limiter backs off.
+_THROTTLING_ERROR_CODES = frozenset(
+    (
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "ThrottlingException",
+    )
+)
+
+
+def _attribute_paths(value: t.Any, prefix: str = "") -> Iterator[str]:
+    """Yield the path of every attribute in a record, including nested ones.
+
+    Args:
+        value: The record or a value nested in it.
+        prefix: The path of the value.
+
+    Yields:
+        The attribute paths, e.g. `address.city` or `tags[]`.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            path = f"{prefix}.{key}" if prefix else key
+            yield path
+            yield from _attribute_paths(item, path)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _attribute_paths(item, f"{prefix}[]")
+
+
+def projection_scan_kwargs(attribute_paths: t.Iterable[t.Sequence[str]]) -> dict:
+    """Build the scan kwargs projecting items onto the given attributes.
+
+    Every path element is referenced through an expression attribute name, so
+    reserved words and names containing dots can be projected.
+
+    Args:
+        attribute_paths: The paths of the attributes to read, e.g.
+            `("info", "plot")` for the nested `plot` attribute of `info`.
+
+    Returns:
+        The ProjectionExpression and its ExpressionAttributeNames.
+    """
+    attribute_names: dict[str, str] = {}
+    placeholders: dict[str, str] = {}
+    expressions = []
+    for path in attribute_paths:
+        parts = []
+        for name in path:
+            if name not in placeholders:
+                placeholders[name] = f"#proj{len(placeholders)}"
+                attribute_names[placeholders[name]] = name
+            parts.append(placeholders[name])
+        expressions.append(".".join(parts))
+    return {
+        "ProjectionExpression": ", ".join(expressions),
+        "ExpressionAttributeNames": attribute_names,
+    }
+
 
+def _record_content_length(http_response, parsed: dict, **kwargs) -> None:
+    """Save the size of a response body in the response metadata.
 
-class DynamoDbConnector(AWSBotoConnector[DynamoDBServiceResource, DynamoDBClient]):
+    Args:
+        http_response: The raw HTTP response.
+        parsed: The parsed response.
+        kwargs: The other arguments of the botocore event.
+    """
+    parsed.setdefault("ResponseMetadata", {})["ContentLength"] = len(
+        http_response.content
+    )
+
+
+class ScanPage(t.NamedTuple):
+    """A single page of items returned by a scan."""
+
+    segment: int
+    items: list[dict]
+    last_evaluated_key: dict | None
+
+
+class DynamoDbConnector(AWSBotoConnector["DynamoDBServiceResource", "DynamoDBClient"]):
     """DynamoDB connector class."""
 
     def __init__(
@@ -23,16 +135,158 @@ class DynamoDbConnector(AWSBotoConnector[DynamoDBServiceResource, DynamoDBClient
             config: The connector configuration.
         """
         super().__init__(config, "dynamodb")
+        self._serializer = TypeSerializer()
+        self.native_deserializer: bool = config.get("native_deserializer", False)
+        self.page_metrics: bool = config.get("page_metrics", False)
+        self._scan_client: DynamoDBClient | None = None
+        self._table_descriptions: dict[str, TableDescriptionTypeDef] = {}
+        self.retry_policy = RetryPolicy(
+            base_delay=config.get("retry_base_delay", 0.1),
+            max_delay=config.get("retry_max_delay", 20),
+            max_elapsed_time=config.get("retry_max_elapsed_time", 300),
+            retryable_error_codes=config.get(
+                "retryable_error_codes", DEFAULT_RETRYABLE_ERROR_CODES
+            ),
+        )
+        self.total_read_capacity_limiter: ReadCapacityLimiter | None = None
+        if config.get("max_total_read_capacity_units"):
+            self.total_read_capacity_limiter = ReadCapacityLimiter(
+                config["max_total_read_capacity_units"]
+            )
+        self.schema_cache: SchemaCache | None = None
+        if config.get("schema_cache_path"):
+            self.schema_cache = SchemaCache(
+                config["schema_cache_path"],
+                ttl=config.get("schema_cache_ttl", 86400),
+                max_entries=config.get("schema_cache_max_entries", 1000),
+            )
+
+    @property
+    def default_max_pool_connections(self) -> int:
+        """Return a pool size giving every concurrent request of `client` one.
+
+        The client lists and describes the tables and starts and polls exports,
+        one request at a time per table discovered or synced at once. Pages
+        are read with `scan_client`, which has a pool of its own.
+
+        Returns:
+            The maximum number of pooled connections.
+        """
+        return max(
+            super().default_max_pool_connections,
+            self.config.get("discovery_workers", 8),
+            self.config.get("table_sync_workers", 1),
+        )
+
+    @property
+    def default_scan_max_pool_connections(self) -> int:
+        """Return a pool size giving every concurrent page request a connection.
+
+        The scan client is shared by all tables synced at once and all their
+        scan or query workers, and during discovery by all tables sampled at
+        once.
+
+        Returns:
+            The maximum number of pooled connections.
+        """
+        sync_connections = self._max_table_workers() * max(
+            1, self.config.get("table_sync_workers", 1)
+        )
+        sample_segments = 1
+        if self.config.get("infer_schema_sampling") == "distributed":
+            sample_segments = self.config.get("infer_schema_sample_segments", 16)
+        discovery_connections = (
+            max(1, self.config.get("discovery_workers", 8)) * sample_segments
+        )
+        return max(
+            super().default_max_pool_connections,
+            sync_connections,
+            discovery_connections,
+        )
+
+    def _max_table_workers(self) -> int:
+        """Return the most requests a single table is read with at once.
+
+        A table is read with a worker per scan segment or queried partition
+        key value, up to `scan_workers`. Planned scans may use up to the most
+        segments the planner gives a table, as their plans need the table
+        descriptions, which are not known yet.
+
+        Returns:
+            The number of workers.
+        """
+        tasks = [self.config.get("scan_segments") or 1]
+        tasks.extend(
+            scan_kwargs.get("TotalSegments") or 1
+            for scan_kwargs in self.config.get("table_scan_kwargs", {}).values()
+        )
+        tasks.extend(
+            len(query_config.get("partition_values", []))
+            for query_config in self.config.get("table_query_configs", {}).values()
+        )
+        if self.config.get("plan_scans"):
+            tasks.append(MAX_SEGMENTS)
+        workers = max(tasks)
+        if self.config.get("scan_workers"):
+            workers = min(workers, self.config["scan_workers"])
+        return max(1, workers)
+
+    def get_client(
+        self,
+        session: Session,
+        service_name: str,
+        config: Config | None = None,
+    ) -> BaseClient:
+        """Return the boto3 client for the service.
 
-    @staticmethod
-    def _coerce_types(record):
-        return orjson.loads(
-            orjson.dumps(
-                record,
-                default=lambda o: str(o),
-                option=orjson.OPT_OMIT_MICROSECONDS,
-            ).decode("utf-8")
+        The size of every response body is saved in its `ResponseMetadata` as
+        `ContentLength`, for the page metrics.
+
+        Args:
+            session (boto3.session.Session): The boto3 session.
+            service_name (str): The name of the AWS service.
+            config (botocore.config.Config): The client config, defaults to the
+                one from `get_client_config`.
+
+        Returns:
+            boto3.client: The boto3 client for the service.
+        """
+        client = super().get_client(session, service_name, config)
+        client.meta.events.register(
+            f"after-call.{service_name}", _record_content_length
         )
+        return client
+
+    @property
+    def scan_client(self) -> DynamoDBClient:
+        """Return the client scan and query pages are read with.
+
+        botocore does not retry the requests of this client, the retry policy
+        does. Otherwise botocore would retry a throttled page up to 10 times
+        before the rate limiter and the retry policy see the error. Its pool is
+        sized for the page requests, see `default_scan_max_pool_connections`.
+
+        Returns:
+            The DynamoDB client.
+        """
+        if self._scan_client:
+            return self._scan_client
+        with self._lock:
+            if not self._scan_client:
+                config = self.get_client_config().merge(
+                    Config(
+                        max_pool_connections=self.config.get("aws_max_pool_connections")
+                        or self.default_scan_max_pool_connections,
+                        retries={
+                            "mode": self.config.get("aws_retry_mode", "legacy"),
+                            "total_max_attempts": 1,
+                        },
+                    )
+                )
+                self._scan_client = self.get_client(  # type: ignore[assignment]
+                    self.session, self._service_name, config
+                )
+            return self._scan_client  # type: ignore[return-value]
 
     def _recursively_drop_required(self, schema: dict) -> None:
         """Recursively drop the required property from a schema.
@@ -52,9 +306,11 @@ class DynamoDbConnector(AWSBotoConnector[DynamoDBServiceResource, DynamoDBClient
         """List tables in DynamoDB."""
         try:
             tables = []
-            for table in self.resource.tables.all():
-                if include is None or table.name in include:
-                    tables.append(table.name)
+            paginator = self.client.get_paginator("list_tables")
+            for page in paginator.paginate():
+                for table_name in page["TableNames"]:
+                    if include is None or table_name in include:
+                        tables.append(table_name)
         except ClientError as err:
             self.logger.error(
                 "Couldn't list tables. Here's why: %s: %s",
@@ -65,70 +321,986 @@ class DynamoDbConnector(AWSBotoConnector[DynamoDBServiceResource, DynamoDBClient
         else:
             return tables
 
-    def get_items_iter(self, table_name: str, scan_kwargs_override: dict):
-        """Get items from a table in DynamoDB."""
-        scan_kwargs = scan_kwargs_override.copy()
-        if "ConsistentRead" not in scan_kwargs:
-            scan_kwargs["ConsistentRead"] = True
+    def _serialize_scan_kwargs(self, scan_kwargs: dict) -> dict:
+        """Convert resource style scan kwargs to the low-level client format.
+
+        Scans are issued through the thread-safe client rather than the table
+        resource, so attribute values have to be serialized the same way the
+        resource would have done it.
+
+        Args:
+            scan_kwargs: The scan kwargs using native Python attribute values.
+
+        Returns:
+            The scan kwargs using DynamoDB attribute values.
+        """
+        serialized = scan_kwargs.copy()
+        for arg in ("ExpressionAttributeValues", "ExclusiveStartKey"):
+            if serialized.get(arg):
+                serialized[arg] = {
+                    key: self._serializer.serialize(value)
+                    for key, value in serialized[arg].items()
+                }
+        return serialized
+
+    def item_to_record(self, item: dict) -> dict:
+        """Convert a low-level client item into a record.
+
+        Args:
+            item: A mapping of attribute names to DynamoDB attribute values.
 
-        table = self.resource.Table(table_name)
+        Returns:
+            The record with JSON serializable values.
+        """
+        if self.native_deserializer:
+            return deserialize_item(item)
+        # Numbers are kept as strings, so no precision is lost.
+        return deserialize_item(item, str)
+
+    def describe_table(self, table_name: str) -> TableDescriptionTypeDef:
+        """Describe a table in DynamoDB.
+
+        The description is fetched once and reused for the lifetime of the
+        connector.
+
+        Args:
+            table_name: The table name.
+
+        Returns:
+            The table description.
+        """
+        if table_name in self._table_descriptions:
+            return self._table_descriptions[table_name]
+        try:
+            description = self.client.describe_table(TableName=table_name)["Table"]
+        except ClientError as err:
+            self.logger.error(
+                "Couldn't describe table %s. Here's why: %s: %s",
+                table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+        self._table_descriptions[table_name] = description
+        return description
+
+    def get_latest_stream_arn(self, table_name: str) -> str:
+        """Get the ARN of the DynamoDB stream of a table.
+
+        Args:
+            table_name: The table name.
+
+        Returns:
+            The latest stream ARN.
+
+        Raises:
+            Exception: If the table has no stream enabled.
+        """
+        table = self.describe_table(table_name)
+        if not table.get("StreamSpecification", {}).get("StreamEnabled"):
+            raise Exception(
+                f"DynamoDB Streams is not enabled for table '{table_name}'."
+            )
+        return table["LatestStreamArn"]
+
+    def start_export(
+        self,
+        table_name: str,
+        s3_bucket: str,
+        s3_prefix: str | None = None,
+    ) -> ExportDescriptionTypeDef:
+        """Start a point in time export of a table to S3.
+
+        Point in time recovery must be enabled on the table.
+
+        Args:
+            table_name: The table name.
+            s3_bucket: The bucket the export is written to.
+            s3_prefix: The key prefix of the export in the bucket.
+
+        Returns:
+            The export description.
+        """
+        table_arn = self.describe_table(table_name)["TableArn"]
+        export_kwargs: dict = {
+            "TableArn": table_arn,
+            "S3Bucket": s3_bucket,
+            "ExportFormat": "DYNAMODB_JSON",
+        }
+        if s3_prefix:
+            export_kwargs["S3Prefix"] = s3_prefix
         try:
-            done = False
-            start_key = None
-            while not done:
-                if start_key:
-                    scan_kwargs["ExclusiveStartKey"] = start_key
-                response = table.scan(**scan_kwargs)
-                yield [self._coerce_types(record) for record in response.get("Items", [])]
+            description = self.client.export_table_to_point_in_time(**export_kwargs)[
+                "ExportDescription"
+            ]
+        except ClientError as err:
+            self.logger.error(
+                "Couldn't export table %s. Here's why: %s: %s",
+                table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+        self.logger.info(
+            "Started export %s of table %s.", description["ExportArn"], table_name
+        )
+        return description
+
+    def wait_for_export(
+        self,
+        export_arn: str,
+        poll_interval: float = 30,
+    ) -> ExportDescriptionTypeDef:
+        """Wait until an export is completed.
+
+        Args:
+            export_arn: The export ARN.
+            poll_interval: The number of seconds between status checks.
+
+        Returns:
+            The description of the completed export.
+
+        Raises:
+            Exception: If the export failed.
+        """
+        while True:
+            try:
+                description = self.client.describe_export(ExportArn=export_arn)[
+                    "ExportDescription"
+                ]
+            except ClientError as err:
+                self.logger.error(
+                    "Couldn't describe export %s. Here's why: %s: %s",
+                    export_arn,
+                    err.response["Error"]["Code"],
+                    err.response["Error"]["Message"],
+                )
+                raise
+            status = description["ExportStatus"]
+            if status == "COMPLETED":
+                return description
+            if status == "FAILED":
+                raise Exception(
+                    f"Export {export_arn} failed: "
+                    f"{description.get('FailureCode')}: "
+                    f"{description.get('FailureMessage')}"
+                )
+            self.logger.info("Waiting for export %s to complete.", export_arn)
+            time.sleep(poll_interval)
+
+    def get_read_capacity_rate(self, table_name: str) -> float | None:
+        """Return the read capacity units per second configured for a table.
+
+        The rate is the lower of `max_read_capacity_units`,
+        `read_capacity_percent` of the table's provisioned read capacity and
+        `max_total_read_capacity_units`.
+
+        Args:
+            table_name: The table name.
+
+        Returns:
+            The rate, or None if no limit is configured.
+        """
+        rate = self.config.get("max_read_capacity_units")
+        percent = self.config.get("read_capacity_percent")
+        if percent:
+            table = self.describe_table(table_name)
+            provisioned = table.get("ProvisionedThroughput", {}).get(
+                "ReadCapacityUnits", 0
+            )
+            if provisioned:
+                percent_rate = provisioned * percent / 100
+                rate = min(rate, percent_rate) if rate else percent_rate
+            else:
+                self.logger.warning(
+                    "Table '%s' has no provisioned read capacity, "
+                    "ignoring read_capacity_percent.",
+                    table_name,
+                )
+        total_limiter = self.total_read_capacity_limiter
+        if total_limiter is not None:
+            rate = min(rate, total_limiter.rate) if rate else total_limiter.rate
+        return rate or None
+
+    def get_read_capacity_limiter(
+        self,
+        table_name: str,
+        max_concurrency: int = 1,
+        rate: float | None = None,
+    ) -> ReadCapacityLimiter | None:
+        """Build the read capacity limiter configured for a table.
+
+        When `max_total_read_capacity_units` is set, the limiter is also bound
+        by a limiter shared by every table scanned through this connector.
+
+        Args:
+            table_name: The table name.
+            max_concurrency: The maximum number of concurrent scan requests.
+            rate: The read capacity units per second, e.g. a planned rate.
+                Defaults to the configured rate.
+
+        Returns:
+            A ReadCapacityLimiter, or None if no limit is configured.
+        """
+        rate = rate or self.get_read_capacity_rate(table_name)
+        if not rate:
+            return None
+        total_limiter = self.total_read_capacity_limiter
+        return ReadCapacityLimiter(
+            rate, max_concurrency=max_concurrency, parent=total_limiter
+        )
+
+    def get_page_sizer(self, table_name: str, pages_in_memory: int) -> PageSizer | None:
+        """Build the page sizer fitting a table's pages in the memory budget.
+
+        The `scan_memory_budget` is shared by all tables synced at once, so each
+        table gets its share of it.
+
+        Args:
+            table_name: The table name.
+            pages_in_memory: The number of pages of the table held in memory at
+                once.
+
+        Returns:
+            A PageSizer, or None if no memory budget is configured.
+        """
+        budget = self.config.get("scan_memory_budget")
+        if not budget:
+            return None
+        table = self.describe_table(table_name)
+        item_count = table.get("ItemCount", 0)
+        return PageSizer(
+            budget / max(1, self.config.get("table_sync_workers", 1)),
+            pages_in_memory,
+            item_bytes=table.get("TableSizeBytes", 0) / item_count
+            if item_count
+            else None,
+        )
+
+    def plan_scan(self, table_name: str, consistent_read: bool = False) -> ScanPlan:
+        """Plan a full scan of a table within its configured read capacity.
+
+        Args:
+            table_name: The table name.
+            consistent_read: Whether items are read strongly consistent.
+
+        Returns:
+            The plan.
+        """
+        return plan_scan(
+            self.describe_table(table_name),
+            read_capacity_units=self.get_read_capacity_rate(table_name),
+            consistent_read=consistent_read,
+        )
+
+    def _scan_page(
+        self,
+        table_name: str,
+        scan_kwargs: dict,
+        rate_limiter: ReadCapacityLimiter | None,
+        operation: str = "scan",
+        on_retry: t.Callable[[Exception], None] | None = None,
+    ) -> ScanOutputTypeDef:
+        """Issue a single scan request, paced by the rate limiter if given.
+
+        Transient errors are retried by the retry policy, re-issuing the request
+        with the same ExclusiveStartKey. As the scan client does not retry on
+        its own, the policy makes and counts every attempt within its elapsed
+        time budget, and the rate limiter backs off whenever a request is
+        throttled.
+
+        Args:
+            table_name: The table name.
+            scan_kwargs: The client scan kwargs.
+            rate_limiter: The limiter pacing the requests.
+            operation: The client operation, `scan` or `query`.
+            on_retry: A function called with the error before each retry.
+
+        Returns:
+            The scan response.
+        """
+        request = getattr(self.scan_client, operation)
+
+        def _request() -> ScanOutputTypeDef:
+            if rate_limiter is None:
+                return request(TableName=table_name, **scan_kwargs)
+            with rate_limiter.slot():
+                rate_limiter.wait()
+                response = request(TableName=table_name, **scan_kwargs)
+            rate_limiter.consume(
+                response.get("ConsumedCapacity", {}).get("CapacityUnits", 0)
+            )
+            rate_limiter.on_success()
+            return response
+
+        def _on_retry(err: Exception) -> None:
+            if on_retry is not None:
+                on_retry(err)
+            if rate_limiter is not None and error_code(err) in _THROTTLING_ERROR_CODES:
+                rate_limiter.on_throttle()
+                self.logger.warning(
+                    "%s of %s throttled, lowering rate to %.1f RCU/s.",
+                    operation.capitalize(),
+                    table_name,
+                    rate_limiter.rate,
+                )
+
+        return self.retry_policy.call(
+            _request,
+            description=f"{operation.capitalize()} of {table_name}",
+            on_retry=_on_retry,
+            scope=table_name,
+        )
+
+    def _scan_segment(
+        self,
+        table_name: str,
+        scan_kwargs: dict,
+        segment: int = 0,
+        rate_limiter: ReadCapacityLimiter | None = None,
+        operation: str = "scan",
+        page_sizer: PageSizer | None = None,
+    ) -> Iterator[ScanPage]:
+        """Scan a single segment of a table, following LastEvaluatedKey.
+
+        The request duration, deserialization duration, size, consumed capacity
+        and retries of every page are logged as metrics tagged with the table,
+        operation and segment when `page_metrics` is enabled.
+
+        With a page sizer, the `Limit` of every page is the one fitting the
+        memory budget, or the configured one if that is lower.
+
+        Args:
+            table_name: The table name.
+            scan_kwargs: The client scan kwargs, including any Segment and
+                TotalSegments arguments.
+            segment: The segment number reported on each page.
+            rate_limiter: The limiter pacing the requests.
+            operation: The client operation, `scan` or `query`.
+            page_sizer: The sizer adapting the `Limit` to the memory budget.
+
+        Yields:
+            A ScanPage for each page returned by DynamoDB.
+        """
+        scan_kwargs = scan_kwargs.copy()
+        configured_limit = scan_kwargs.get("Limit")
+        tags = {"table": table_name, "operation": operation, "segment": segment}
+        retries = 0
+
+        def _count_retry(err: Exception) -> None:
+            nonlocal retries
+            retries += 1
+
+        try:
+            while True:
+                if page_sizer is not None:
+                    limit = page_sizer.limit
+                    scan_kwargs["Limit"] = (
+                        min(limit, configured_limit) if configured_limit else limit
+                    )
+                retries = 0
+                requested_at = time.perf_counter()
+                response = self._scan_page(
+                    table_name, scan_kwargs, rate_limiter, operation, _count_retry
+                )
+                received_at = time.perf_counter()
+                byte_count = t.cast(
+                    "int", response["ResponseMetadata"].get("ContentLength", 0)
+                )
+                # Release every item once converted, so a page is not held
+                # twice in memory.
+                items = response.get("Items", [])
+                items.reverse()
+                records = [self.item_to_record(items.pop()) for _ in range(len(items))]
+                if page_sizer is not None:
+                    page_sizer.observe(len(records), byte_count)
+                if self.page_metrics:
+                    log_page_metrics(
+                        tags,
+                        request_duration=received_at - requested_at,
+                        deserialization_duration=time.perf_counter() - received_at,
+                        item_count=len(records),
+                        byte_count=byte_count,
+                        consumed_capacity=response.get("ConsumedCapacity", {}).get(
+                            "CapacityUnits", 0
+                        ),
+                        retry_count=retries,
+                    )
                 start_key = response.get("LastEvaluatedKey", None)
-                done = start_key is None
+                yield ScanPage(segment, records, start_key)
+                if start_key is None:
+                    break
+                scan_kwargs["ExclusiveStartKey"] = start_key
         except ClientError as err:
             self.logger.error(
-                "Couldn't scan for %s. Here's why: %s: %s",
+                "Couldn't %s for %s. Here's why: %s: %s",
+                operation,
                 table_name,
                 err.response["Error"]["Code"],
                 err.response["Error"]["Message"],
             )
             raise
 
-    def _get_sample_records(self, table_name: str, sample_size: int, scan_kwargs_override: dict) -> list:
+    def _parallel_scan(
+        self,
+        table_name: str,
+        segment_scan_kwargs: dict[int, dict],
+        max_workers: int,
+        max_buffered_pages: int,
+        rate_limiter: ReadCapacityLimiter | None = None,
+        operation: str = "scan",
+        page_sizer: PageSizer | None = None,
+    ) -> Iterator[ScanPage]:
+        """Scan several segments of a table concurrently.
+
+        Each segment is scanned by a worker thread which pushes its pages into a
+        bounded queue, so at most `max_buffered_pages` pages are held in memory
+        while the consumer is busy emitting records.
+
+        Args:
+            table_name: The table name.
+            segment_scan_kwargs: A mapping of segment number to its client scan
+                kwargs.
+            max_workers: The number of worker threads.
+            max_buffered_pages: The maximum number of pages waiting to be consumed.
+            rate_limiter: The limiter shared by all workers.
+            operation: The client operation, `scan` or `query`.
+            page_sizer: The sizer shared by all workers.
+
+        Yields:
+            A ScanPage for each page returned by DynamoDB, in arrival order.
+        """
+        yield from iter_concurrently(
+            (
+                functools.partial(
+                    self._scan_segment,
+                    table_name,
+                    segment_kwargs,
+                    segment,
+                    rate_limiter,
+                    operation,
+                    page_sizer,
+                )
+                for segment, segment_kwargs in segment_scan_kwargs.items()
+            ),
+            max_workers=max_workers,
+            max_buffered_items=max_buffered_pages,
+            thread_name_prefix=f"{operation}-{table_name}",
+        )
+
+    def _get_segment_scan_kwargs(
+        self,
+        scan_kwargs_override: dict,
+        start_keys: dict[int, dict] | None,
+        completed_segments: t.Collection[int],
+    ) -> dict[int, dict]:
+        """Return the client scan kwargs of each segment left to scan.
+
+        Args:
+            scan_kwargs_override: Scan kwargs overriding the defaults.
+            start_keys: A mapping of segment number to the key to resume the
+                segment from, in the low-level client format.
+            completed_segments: Segments which are skipped because they were
+                already scanned.
+
+        Returns:
+            A mapping of segment number to its client scan kwargs.
+        """
+        scan_kwargs = self._serialize_scan_kwargs(scan_kwargs_override)
+        if "ConsistentRead" not in scan_kwargs:
+            scan_kwargs["ConsistentRead"] = True
+        if "ReturnConsumedCapacity" not in scan_kwargs:
+            scan_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+
+        total_segments = scan_kwargs.pop("TotalSegments", None) or 1
+        if "Segment" in scan_kwargs:
+            # An explicit segment is scanned on its own.
+            segments = [scan_kwargs.pop("Segment")]
+        else:
+            segments = list(range(total_segments))
+        start_keys = start_keys or {}
+        segment_scan_kwargs = {}
+        for segment in segments:
+            if segment in completed_segments:
+                continue
+            segment_kwargs = scan_kwargs.copy()
+            if total_segments > 1:
+                segment_kwargs["Segment"] = segment
+                segment_kwargs["TotalSegments"] = total_segments
+            if start_keys.get(segment):
+                segment_kwargs["ExclusiveStartKey"] = start_keys[segment]
+            segment_scan_kwargs[segment] = segment_kwargs
+        return segment_scan_kwargs
+
+    def scan_pages(
+        self,
+        table_name: str,
+        scan_kwargs_override: dict,
+        max_workers: int | None = None,
+        max_buffered_pages: int | None = None,
+        rate_limiter: ReadCapacityLimiter | None = None,
+        start_keys: dict[int, dict] | None = None,
+        completed_segments: t.Collection[int] = (),
+        prefetch_pages: int | None = None,
+    ) -> Iterator[ScanPage]:
+        """Scan a table in DynamoDB page by page.
+
+        When `TotalSegments` is set in the scan kwargs without an explicit
+        `Segment`, all segments are scanned in parallel. A single segment is
+        scanned in a background thread which fetches up to `prefetch_pages`
+        pages ahead, so requests overlap with the consumer emitting records.
+
+        An interrupted scan can be resumed by passing the last evaluated key of
+        each segment, as reported on its pages, and the segments that finished.
+
+        Consumed capacity is requested on every page so the scan can be paced by
+        a read capacity limiter, which is built from the config if not given.
+        With a `scan_memory_budget`, the `Limit` of every page is adapted to the
+        size of the items read so far, so the pages held in memory fit it.
+
+        Args:
+            table_name: The table name.
+            scan_kwargs_override: Scan kwargs overriding the defaults.
+            max_workers: The number of worker threads for a parallel scan.
+                Defaults to one thread per segment.
+            max_buffered_pages: The maximum number of pages buffered between the
+                workers and the consumer. Defaults to two per worker.
+            rate_limiter: The limiter pacing the scan requests.
+            start_keys: A mapping of segment number to the key to resume the
+                segment from, in the low-level client format.
+            completed_segments: Segments which are skipped because they were
+                already scanned.
+            prefetch_pages: The number of pages fetched ahead of the consumer
+                when a single segment is scanned, 0 to fetch pages on demand.
+                Defaults to the `scan_prefetch_pages` setting.
+
+        Yields:
+            A ScanPage for each page returned by DynamoDB.
+        """
+        segment_scan_kwargs = self._get_segment_scan_kwargs(
+            scan_kwargs_override, start_keys, completed_segments
+        )
+        pending = max(1, len(segment_scan_kwargs))
+        max_workers = min(max_workers or pending, pending)
+        if rate_limiter is None:
+            rate_limiter = self.get_read_capacity_limiter(table_name, max_workers)
+
+        if prefetch_pages is None:
+            prefetch_pages = self.config.get("scan_prefetch_pages", 2)
+        if len(segment_scan_kwargs) == 1 and prefetch_pages:
+            max_buffered_pages = max_buffered_pages or prefetch_pages
+        elif len(segment_scan_kwargs) <= 1:
+            page_sizer = self.get_page_sizer(table_name, 1)
+            for segment, segment_kwargs in segment_scan_kwargs.items():
+                yield from self._scan_segment(
+                    table_name,
+                    segment_kwargs,
+                    segment,
+                    rate_limiter,
+                    "scan",
+                    page_sizer,
+                )
+            return
+
+        max_buffered_pages = max_buffered_pages or 2 * max_workers
+        yield from self._parallel_scan(
+            table_name,
+            segment_scan_kwargs,
+            max_workers,
+            max_buffered_pages,
+            rate_limiter,
+            page_sizer=self.get_page_sizer(
+                table_name, max_buffered_pages + max_workers + 1
+            ),
+        )
+
+    def scan_partitions(
+        self,
+        table_name: str,
+        scan_kwargs_override: dict,
+        max_workers: int | None = None,
+        max_buffered_pages: int | None = None,
+        rate_limiter: ReadCapacityLimiter | None = None,
+        start_keys: dict[int, dict] | None = None,
+        completed_segments: t.Collection[int] = (),
+        prefetch_pages: int | None = None,
+    ) -> ConcurrentPartitions[int, ScanPage]:
+        """Scan the segments of a table concurrently, keeping their pages apart.
+
+        The pages of each segment are consumed one segment after the other,
+        while the workers scan the next segments ahead, the same way and with
+        the same arguments as `scan_pages`. A single segment left to scan is
+        read up to `prefetch_pages` pages ahead by a worker, or on demand.
+
+        Args:
+            table_name: The table name.
+            scan_kwargs_override: Scan kwargs overriding the defaults.
+            max_workers: The number of worker threads. Defaults to one thread
+                per segment.
+            max_buffered_pages: The maximum number of pages buffered ahead of
+                the segment being consumed. Defaults to two per worker.
+            rate_limiter: The limiter pacing the scan requests.
+            start_keys: A mapping of segment number to the key to resume the
+                segment from, in the low-level client format.
+            completed_segments: Segments which are skipped because they were
+                already scanned.
+            prefetch_pages: The number of pages fetched ahead of the consumer
+                when a single segment is left to scan, 0 to fetch pages on
+                demand. Defaults to the `scan_prefetch_pages` setting.
+
+        Returns:
+            The pages of each segment left to scan, by segment number.
+        """
+        segment_scan_kwargs = self._get_segment_scan_kwargs(
+            scan_kwargs_override, start_keys, completed_segments
+        )
+        pending = max(1, len(segment_scan_kwargs))
+        max_workers = min(max_workers or pending, pending)
+        if rate_limiter is None:
+            rate_limiter = self.get_read_capacity_limiter(table_name, max_workers)
+
+        if prefetch_pages is None:
+            prefetch_pages = self.config.get("scan_prefetch_pages", 2)
+        if len(segment_scan_kwargs) <= 1:
+            if prefetch_pages:
+                max_buffered_pages = max_buffered_pages or prefetch_pages
+            else:
+                max_workers = max_buffered_pages = 0
+            page_sizer = self.get_page_sizer(
+                table_name, max_buffered_pages + max_workers + 1
+            )
+        else:
+            max_buffered_pages = max_buffered_pages or 2 * max_workers
+            # The segment being consumed buffers as many pages as all the others.
+            page_sizer = self.get_page_sizer(
+                table_name, 2 * max_buffered_pages + max_workers + 1
+            )
+        return ConcurrentPartitions(
+            {
+                segment: functools.partial(
+                    self._scan_segment,
+                    table_name,
+                    segment_kwargs,
+                    segment,
+                    rate_limiter,
+                    "scan",
+                    page_sizer,
+                )
+                for segment, segment_kwargs in segment_scan_kwargs.items()
+            },
+            max_workers=max_workers,
+            max_buffered_items=max_buffered_pages,
+            thread_name_prefix=f"scan-{table_name}",
+        )
+
+    def query_pages(
+        self,
+        table_name: str,
+        queries: list[dict],
+        max_workers: int | None = None,
+        max_buffered_pages: int | None = None,
+        rate_limiter: ReadCapacityLimiter | None = None,
+        prefetch_pages: int | None = None,
+    ) -> Iterator[ScanPage]:
+        """Run queries against a table in DynamoDB page by page.
+
+        The queries, typically one per partition key value, run concurrently the
+        same way the segments of a parallel scan do. A single query prefetches
+        pages the same way a single scan segment does.
+
+        Args:
+            table_name: The table name.
+            queries: The kwargs of each query, using native Python attribute
+                values.
+            max_workers: The number of worker threads. Defaults to one thread per
+                query.
+            max_buffered_pages: The maximum number of pages buffered between the
+                workers and the consumer. Defaults to two per worker.
+            rate_limiter: The limiter pacing the query requests.
+            prefetch_pages: The number of pages fetched ahead of the consumer
+                when a single query is run, 0 to fetch pages on demand.
+                Defaults to the `scan_prefetch_pages` setting.
+
+        Yields:
+            A ScanPage for each page returned by DynamoDB, with the position of
+            its query in `queries` as segment.
+        """
+        query_kwargs = {}
+        for index, query in enumerate(queries):
+            query_kwargs[index] = self._serialize_scan_kwargs(query)
+            query_kwargs[index].setdefault("ReturnConsumedCapacity", "TOTAL")
+
+        pending = max(1, len(query_kwargs))
+        max_workers = min(max_workers or pending, pending)
+        if rate_limiter is None:
+            rate_limiter = self.get_read_capacity_limiter(table_name, max_workers)
+
+        if prefetch_pages is None:
+            prefetch_pages = self.config.get("scan_prefetch_pages", 2)
+        if len(query_kwargs) == 1 and prefetch_pages:
+            max_buffered_pages = max_buffered_pages or prefetch_pages
+        elif len(query_kwargs) <= 1:
+            page_sizer = self.get_page_sizer(table_name, 1)
+            for index, kwargs in query_kwargs.items():
+                yield from self._scan_segment(
+                    table_name, kwargs, index, rate_limiter, "query", page_sizer
+                )
+            return
+
+        max_buffered_pages = max_buffered_pages or 2 * max_workers
+        yield from self._parallel_scan(
+            table_name,
+            query_kwargs,
+            max_workers,
+            max_buffered_pages,
+            rate_limiter,
+            "query",
+            self.get_page_sizer(table_name, max_buffered_pages + max_workers + 1),
+        )
+
+    def get_items_iter(
+        self,
+        table_name: str,
+        scan_kwargs_override: dict,
+        max_workers: int | None = None,
+        max_buffered_pages: int | None = None,
+        prefetch_pages: int | None = None,
+    ):
+        """Get items from a table in DynamoDB."""
+        pages = self.scan_pages(
+            table_name,
+            scan_kwargs_override,
+            max_workers=max_workers,
+            max_buffered_pages=max_buffered_pages,
+            prefetch_pages=prefetch_pages,
+        )
+        if self.page_metrics:
+            pages = timed_pages(pages, {"table": table_name, "operation": "scan"})
+        for page in pages:
+            yield page.items
+
+    def _sample_segment(
+        self,
+        table_name: str,
+        scan_kwargs: dict,
+        segment: int,
+        quota: int,
+        deadline: float,
+        rate_limiter: ReadCapacityLimiter | None,
+    ) -> Iterator[ScanPage]:
+        """Scan a segment until it yielded its share of the sample.
+
+        Args:
+            table_name: The table name.
+            scan_kwargs: The client scan kwargs of the segment.
+            segment: The segment number.
+            quota: The number of items to sample from the segment.
+            deadline: The monotonic time after which sampling stops.
+            rate_limiter: The limiter pacing the requests.
+
+        Yields:
+            A ScanPage for each page, trimmed to the quota.
+        """
+        for page in self._scan_segment(table_name, scan_kwargs, segment, rate_limiter):
+            items = page.items[:quota]
+            quota -= len(items)
+            yield ScanPage(segment, items, page.last_evaluated_key)
+            if quota <= 0 or time.monotonic() >= deadline:
+                return
+
+    def _get_distributed_sample_records(
+        self, table_name: str, sample_size: int, scan_kwargs_override: dict
+    ) -> list:
+        """Sample a few items from many scan segments concurrently.
+
+        Every segment contributes an equal share of the sample, so attributes
+        that only appear in some partitions are seen. Reads are eventually
+        consistent and sampling stops once `infer_schema_time_budget` seconds
+        have passed, with whatever was sampled by then.
+
+        Args:
+            table_name: The table name.
+            sample_size: The number of items to sample.
+            scan_kwargs_override: Scan kwargs overriding the defaults.
+
+        Returns:
+            The sampled records.
+        """
+        started_at = time.monotonic()
+        deadline = started_at + self.config.get("infer_schema_time_budget", 10)
+        total_segments = max(1, self.config.get("infer_schema_sample_segments", 16))
+        quota = max(1, math.ceil(sample_size / total_segments))
+        scan_kwargs = self._serialize_scan_kwargs(scan_kwargs_override)
+        scan_kwargs.pop("Segment", None)
+        scan_kwargs["TotalSegments"] = total_segments
+        scan_kwargs.setdefault("ConsistentRead", False)
+        scan_kwargs.setdefault("ReturnConsumedCapacity", "TOTAL")
+        scan_kwargs.setdefault("Limit", quota)
+        if total_segments == 1:
+            scan_kwargs.pop("TotalSegments")
+        rate_limiter = self.get_read_capacity_limiter(table_name, total_segments)
+
+        sample_records: list = []
+        segments_sampled = set()
+        pages = iter_concurrently(
+            (
+                functools.partial(
+                    self._sample_segment,
+                    table_name,
+                    {**scan_kwargs, "Segment": segment}
+                    if total_segments > 1
+                    else scan_kwargs,
+                    segment,
+                    quota,
+                    deadline,
+                    rate_limiter,
+                )
+                for segment in range(total_segments)
+            ),
+            max_workers=total_segments,
+            max_buffered_items=2 * total_segments,
+            thread_name_prefix=f"sample-{table_name}",
+        )
+        try:
+            for page in pages:
+                sample_records.extend(page.items)
+                if page.items:
+                    segments_sampled.add(page.segment)
+                if len(sample_records) >= sample_size or time.monotonic() >= deadline:
+                    break
+        finally:
+            pages.close()
+        self.logger.info(
+            "Sampled %d items from %d of %d segments of table '%s' in %.1fs.",
+            len(sample_records),
+            len(segments_sampled),
+            total_segments,
+            table_name,
+            time.monotonic() - started_at,
+        )
+        return sample_records[:sample_size]
+
+    def _get_sample_records(
+        self, table_name: str, sample_size: int, scan_kwargs_override: dict
+    ) -> list:
+        if self.config.get("infer_schema_sampling") == "distributed":
+            return self._get_distributed_sample_records(
+                table_name, sample_size, scan_kwargs_override
+            )
         scan_kwargs = scan_kwargs_override.copy()
-        sample_records = []
+        sample_records: list = []
         if "ConsistentRead" not in scan_kwargs:
             scan_kwargs["ConsistentRead"] = True
         if "Limit" not in scan_kwargs:
             scan_kwargs["Limit"] = sample_size
+        # Sampling only needs the first pages, scanning every segment is wasteful.
+        scan_kwargs.pop("TotalSegments", None)
+        scan_kwargs.pop("Segment", None)
 
-        for batch in self.get_items_iter(table_name, scan_kwargs):
-            sample_records.extend(batch)
+        # Pages fetched ahead would be thrown away once the sample is complete.
+        for batch in self.get_items_iter(table_name, scan_kwargs, prefetch_pages=0):
+            sample_records.extend(batch[: sample_size - len(sample_records)])
             if len(sample_records) >= sample_size:
                 break
         return sample_records
 
-    def get_table_json_schema(self, table_name: str, sample_size, scan_kwargs: dict, strategy: str = "infer") -> dict:
-        """Get the JSON schema for a table in DynamoDB."""
+    def get_table_fingerprint(
+        self, table_name: str, sample_size, scan_kwargs: dict, strategy: str
+    ) -> str:
+        """Fingerprint a table and the settings its schema is inferred with.
+
+        The fingerprint changes when the table is recreated, its key schema
+        changes or its item count changes by an order of magnitude.
+
+        Args:
+            table_name: The table name.
+            sample_size: The number of items sampled.
+            scan_kwargs: The scan kwargs used for sampling.
+            strategy: The schema strategy.
+
+        Returns:
+            A hex digest of the fingerprint.
+        """
+        table = self.describe_table(table_name)
+        item_count = table.get("ItemCount", 0)
+        fingerprint = {
+            "table_arn": table["TableArn"],
+            "key_schema": table["KeySchema"],
+            "item_count_bucket": len(str(item_count)) if item_count else 0,
+            "sample_size": sample_size,
+            "sampling": self.config.get("infer_schema_sampling", "first"),
+            "scan_kwargs": scan_kwargs,
+            "strategy": strategy,
+            "native_deserializer": self.native_deserializer,
+        }
+        return hashlib.sha256(
+            json.dumps(fingerprint, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_table_json_schema(
+        self, table_name: str, sample_size, scan_kwargs: dict, strategy: str = "infer"
+    ) -> dict:
+        """Get the JSON schema for a table in DynamoDB.
+
+        When a schema cache is configured the schema is only inferred again once
+        the fingerprint of the table changed or its cache entry expired.
+        """
+        if self.schema_cache is None:
+            return self._infer_table_json_schema(
+                table_name, sample_size, scan_kwargs, strategy
+            )
+        fingerprint = self.get_table_fingerprint(
+            table_name, sample_size, scan_kwargs, strategy
+        )
+        schema = self.schema_cache.get(table_name, fingerprint)
+        if schema is not None:
+            self.logger.info(f"Using cached schema for table: '{table_name}'")
+            return schema
+        schema = self._infer_table_json_schema(
+            table_name, sample_size, scan_kwargs, strategy
+        )
+        self.schema_cache.put(table_name, fingerprint, schema)
+        return schema
+
+    def _infer_table_json_schema(
+        self, table_name: str, sample_size, scan_kwargs: dict, strategy: str
+    ) -> dict:
         sample_records = self._get_sample_records(table_name, sample_size, scan_kwargs)
 
         if not sample_records:
-            self.logger.warning(f"No records found for table '{table_name}', generating empty schema.")
+            self.logger.warning(
+                f"No records found for table '{table_name}', generating empty schema."
+            )
             self._primary_keys = self.get_table_key_properties(table_name)
             properties = [th.Property(key, th.StringType) for key in self._primary_keys]
             return th.PropertiesList(*properties).to_dict()
+        self.logger.info(
+            "Sampled %d distinct attribute paths from %d items of table '%s'.",
+            len(
+                {path for record in sample_records for path in _attribute_paths(record)}
+            ),
+            len(sample_records),
+            table_name,
+        )
         if strategy == "infer":
+            import genson
+
             builder = genson.SchemaBuilder(schema_uri=None)
             for record in sample_records:
-                builder.add_object(self._coerce_types(record))
+                builder.add_object(record)
             schema = builder.to_schema()
             self._recursively_drop_required(schema)
             if not schema:
                 raise Exception("Inferring schema failed")
             else:
-                self.logger.info(f"Inferring schema successful for table: '{table_name}'")
+                self.logger.info(
+                    f"Inferring schema successful for table: '{table_name}'"
+                )
         else:
             raise Exception(f"Strategy {strategy} not supported")
         return schema
 
     def get_table_key_properties(self, table_name):
         """Get the key properties for a table in DynamoDB."""
-        key_schema = self.resource.Table(table_name).key_schema
+        key_schema = self.describe_table(table_name)["KeySchema"]
         return [key.get("AttributeName") for key in key_schema]
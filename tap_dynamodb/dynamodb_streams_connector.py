@@ -0,0 +1,232 @@
+"""DynamoDB Streams connector class."""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import time
+import typing as t
+
+from boto3.resources.base import ServiceResource
+from botocore.exceptions import ClientError
+
+from tap_dynamodb.concurrency import iter_concurrently
+from tap_dynamodb.connectors.aws_boto_connector import AWSBotoConnector
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# GetRecords may return empty pages before the records of an open shard, so an
+# open shard is only considered caught up after this many empty pages in a row.
+MAX_EMPTY_PAGES = 10
+# The pause between empty pages, keeping within the five GetRecords calls per
+# second a shard allows.
+EMPTY_PAGE_DELAY = 0.25
+
+
+class ShardPage(t.NamedTuple):
+    """A single page of change records read from a stream shard."""
+
+    shard_id: str
+    records: list[dict]
+    sequence_number: str | None
+    finished: bool
+
+
+class DynamoDbStreamsConnector(AWSBotoConnector[ServiceResource, t.Any]):
+    """DynamoDB Streams connector class.
+
+    DynamoDB Streams has no boto3 resource, only the client is used.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+    ) -> None:
+        """Initialize the connector.
+
+        Args:
+            config: The connector configuration.
+        """
+        super().__init__(config, "dynamodbstreams")
+
+    def list_shards(self, stream_arn: str) -> list[dict]:
+        """List all shards of a stream.
+
+        Args:
+            stream_arn: The stream ARN.
+
+        Returns:
+            The shard descriptions.
+        """
+        shards: list[dict] = []
+        describe_kwargs = {"StreamArn": stream_arn}
+        try:
+            while True:
+                description = self.client.describe_stream(**describe_kwargs)[
+                    "StreamDescription"
+                ]
+                shards.extend(description.get("Shards", []))
+                last_shard_id = description.get("LastEvaluatedShardId")
+                if not last_shard_id:
+                    return shards
+                describe_kwargs["ExclusiveStartShardId"] = last_shard_id
+        except ClientError as err:
+            self.logger.error(
+                "Couldn't describe stream %s. Here's why: %s: %s",
+                stream_arn,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def _read_shard(
+        self,
+        stream_arn: str,
+        shard: dict,
+        sequence_number: str | None,
+        read_until: datetime.datetime,
+        max_empty_pages: int = MAX_EMPTY_PAGES,
+    ) -> Iterator[ShardPage]:
+        """Read a shard from a sequence number until it is caught up.
+
+        A closed shard is read until it has no more records. An open shard is
+        read until it returns a record written at or after `read_until`. Since
+        GetRecords can return empty pages before records that are already in
+        the shard, an open shard is only considered caught up on empty pages
+        once `max_empty_pages` of them came in a row.
+
+        Args:
+            stream_arn: The stream ARN.
+            shard: The shard description.
+            sequence_number: The sequence number of the last record read, or None
+                to read from the oldest record.
+            read_until: The time the records of an open shard are read up to.
+            max_empty_pages: The number of empty pages in a row after which an
+                open shard is considered caught up.
+
+        Yields:
+            A ShardPage for each page of records.
+        """
+        shard_id = shard["ShardId"]
+        iterator_kwargs = {"StreamArn": stream_arn, "ShardId": shard_id}
+        if sequence_number:
+            iterator_kwargs["ShardIteratorType"] = "AFTER_SEQUENCE_NUMBER"
+            iterator_kwargs["SequenceNumber"] = sequence_number
+        else:
+            iterator_kwargs["ShardIteratorType"] = "TRIM_HORIZON"
+        is_open = "EndingSequenceNumber" not in shard.get("SequenceNumberRange", {})
+        try:
+            iterator = self.client.get_shard_iterator(**iterator_kwargs)[
+                "ShardIterator"
+            ]
+            empty_pages = 0
+            while iterator:
+                response = self.client.get_records(ShardIterator=iterator)
+                records = response.get("Records", [])
+                if records:
+                    sequence_number = records[-1]["dynamodb"]["SequenceNumber"]
+                iterator = response.get("NextShardIterator")
+                finished = iterator is None
+                if records or finished:
+                    yield ShardPage(shard_id, records, sequence_number, finished)
+                if not is_open or finished:
+                    continue
+                if records:
+                    empty_pages = 0
+                    created_at = records[-1]["dynamodb"].get(
+                        "ApproximateCreationDateTime"
+                    )
+                    if created_at and created_at >= read_until:
+                        return
+                    continue
+                empty_pages += 1
+                if empty_pages >= max_empty_pages:
+                    return
+                time.sleep(EMPTY_PAGE_DELAY)
+        except ClientError as err:
+            self.logger.error(
+                "Couldn't read shard %s of stream %s. Here's why: %s: %s",
+                shard_id,
+                stream_arn,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def get_change_pages(
+        self,
+        stream_arn: str,
+        shard_positions: dict[str, dict],
+        shards: list[dict] | None = None,
+        max_workers: int = 4,
+        max_buffered_pages: int | None = None,
+        read_until: datetime.datetime | None = None,
+    ) -> Iterator[ShardPage]:
+        """Read the changes of a stream since the given shard positions.
+
+        Shards are read in parallel, but a child shard is only read once its
+        parent shard has been read to the end, so the changes of an item are
+        returned in order. Open shards are read until they caught up with the
+        writes made before `read_until`.
+
+        Args:
+            stream_arn: The stream ARN.
+            shard_positions: A mapping of shard id to its position, with the
+                `sequence_number` of the last record read or `finished` if the
+                shard was read to the end. Shards without a position are read
+                from their oldest record.
+            shards: The shard descriptions, listed from the stream if not given.
+            max_workers: The number of shards read concurrently.
+            max_buffered_pages: The maximum number of pages buffered between the
+                readers and the consumer. Defaults to two per worker.
+            read_until: The time open shards are read up to, defaults to now.
+
+        Yields:
+            A ShardPage for each page of records.
+        """
+        if read_until is None:
+            read_until = datetime.datetime.now(datetime.timezone.utc)
+        if shards is None:
+            shards = self.list_shards(stream_arn)
+        shard_ids = {shard["ShardId"] for shard in shards}
+        finished = {
+            shard_id
+            for shard_id, position in shard_positions.items()
+            if position.get("finished")
+        }
+        started: set[str] = set()
+        while True:
+            ready = [
+                shard
+                for shard in shards
+                if shard["ShardId"] not in finished
+                and shard["ShardId"] not in started
+                and (
+                    shard.get("ParentShardId") not in shard_ids
+                    or shard.get("ParentShardId") in finished
+                )
+            ]
+            if not ready:
+                return
+            started.update(shard["ShardId"] for shard in ready)
+            for page in iter_concurrently(
+                (
+                    functools.partial(
+                        self._read_shard,
+                        stream_arn,
+                        shard,
+                        shard_positions.get(shard["ShardId"], {}).get(
+                            "sequence_number"
+                        ),
+                        read_until,
+                    )
+                    for shard in ready
+                ),
+                max_workers=max_workers,
+                max_buffered_items=max_buffered_pages or 2 * max_workers,
+                thread_name_prefix="stream-shard",
+            ):
+                if page.finished:
+                    finished.add(page.shard_id)
+                yield page
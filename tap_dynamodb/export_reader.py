@@ -0,0 +1,197 @@
+"""Reader for DynamoDB table exports."""
+
+from __future__ import annotations
+
+import functools
+import gzip
+import json
+import logging
+import typing as t
+
+import fs
+
+from tap_dynamodb.concurrency import iter_concurrently
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from fs.base import FS
+
+    from tap_dynamodb.connectors.aws_boto_connector import AWSBotoConnector
+
+
+class ExportPage(t.NamedTuple):
+    """A chunk of records read from an export data file."""
+
+    path: str
+    records: list[dict]
+    finished: bool
+
+
+def open_export_filesystem(
+    connector: AWSBotoConnector,
+    s3_bucket: str | None,
+    fs_url: str | None = None,
+) -> FS:
+    """Open the filesystem holding the export files.
+
+    Args:
+        connector: The connector whose credentials are used to read the bucket.
+        s3_bucket: The bucket the export was written to.
+        fs_url: A PyFilesystem URL used instead of the bucket, e.g. a local
+            directory the bucket was copied to.
+
+    Returns:
+        The filesystem.
+
+    Raises:
+        Exception: If no location is given or fs-s3fs is not installed.
+    """
+    if fs_url:
+        return fs.open_fs(fs_url)
+    if not s3_bucket:
+        raise Exception("An export bucket or filesystem URL is required.")
+    try:
+        from fs_s3fs import S3FS
+    except ImportError:
+        raise Exception(
+            "fs-s3fs is required to read exports from S3. "
+            "Please install the `s3` extra of tap-dynamodb."
+        )
+    session = connector.get_session()
+    credentials = session.get_credentials()
+    frozen = credentials.get_frozen_credentials() if credentials else None
+    return S3FS(
+        s3_bucket,
+        aws_access_key_id=frozen.access_key if frozen else None,
+        aws_secret_access_key=frozen.secret_key if frozen else None,
+        aws_session_token=frozen.token if frozen else None,
+        endpoint_url=connector.aws_endpoint_url,
+        region=session.region_name,
+        # Exports have no directory markers.
+        strict=False,
+    )
+
+
+class ExportReader:
+    """Reads the data files of a full DynamoDB JSON table export."""
+
+    def __init__(
+        self,
+        filesystem: FS,
+        item_to_record: t.Callable[[dict], dict],
+        page_size: int = 1000,
+    ) -> None:
+        """Initialize the reader.
+
+        Args:
+            filesystem: The filesystem holding the export files.
+            item_to_record: The function converting an exported item to a record.
+            page_size: The number of records per page.
+        """
+        self.filesystem = filesystem
+        self.item_to_record = item_to_record
+        self.page_size = page_size
+
+    @property
+    def logger(self) -> logging.Logger:
+        """Get logger.
+
+        Returns:
+            Plugin logger.
+        """
+        return logging.getLogger("export_reader")
+
+    def _read_lines(self, path: str) -> Iterator[str]:
+        with self.filesystem.openbin(path) as raw:
+            if path.endswith(".gz"):
+                with gzip.open(raw, "rt", encoding="utf-8") as lines:
+                    yield from lines
+            else:
+                for line in raw:
+                    yield line.decode("utf-8")
+
+    def list_data_files(self, description: t.Mapping[str, t.Any]) -> list[str]:
+        """List the data files of a completed export.
+
+        Args:
+            description: The export description.
+
+        Returns:
+            The paths of the data files.
+
+        Raises:
+            Exception: If the export is not a full DynamoDB JSON export.
+        """
+        export_format = description.get("ExportFormat") or "DYNAMODB_JSON"
+        if export_format != "DYNAMODB_JSON":
+            raise Exception(
+                f"Export format '{export_format}' not supported, "
+                "export the table as DYNAMODB_JSON."
+            )
+        export_type = description.get("ExportType") or "FULL_EXPORT"
+        if export_type != "FULL_EXPORT":
+            raise Exception(f"Export type '{export_type}' not supported.")
+        manifest_path = description.get("ExportManifest")
+        if not manifest_path:
+            export_id = description["ExportArn"].rsplit("/", 1)[-1]
+            prefix = description.get("S3Prefix")
+            manifest_path = "/".join(
+                [
+                    *([prefix.strip("/")] if prefix else []),
+                    "AWSDynamoDB",
+                    export_id,
+                    "manifest-summary.json",
+                ]
+            )
+        summary = json.loads(self.filesystem.readtext(manifest_path))
+        return [
+            json.loads(line)["dataFileS3Key"]
+            for line in self._read_lines(summary["manifestFilesS3Key"])
+            if line.strip()
+        ]
+
+    def _read_data_file(self, path: str) -> Iterator[ExportPage]:
+        """Read the records of an export data file.
+
+        Args:
+            path: The data file path.
+
+        Yields:
+            An ExportPage for each chunk of records, the last one is flagged
+            as finished.
+        """
+        records: list[dict] = []
+        for line in self._read_lines(path):
+            if not line.strip():
+                continue
+            records.append(self.item_to_record(json.loads(line)["Item"]))
+            if len(records) >= self.page_size:
+                yield ExportPage(path, records, False)
+                records = []
+        yield ExportPage(path, records, True)
+
+    def get_pages(
+        self,
+        paths: list[str],
+        max_workers: int = 4,
+        max_buffered_pages: int | None = None,
+    ) -> Iterator[ExportPage]:
+        """Read export data files in parallel.
+
+        Args:
+            paths: The data file paths.
+            max_workers: The number of files read concurrently.
+            max_buffered_pages: The maximum number of pages buffered between the
+                readers and the consumer. Defaults to two per worker.
+
+        Yields:
+            An ExportPage for each chunk of records.
+        """
+        self.logger.info("Reading %d export data files.", len(paths))
+        yield from iter_concurrently(
+            (functools.partial(self._read_data_file, path) for path in paths),
+            max_workers=max_workers,
+            max_buffered_items=max_buffered_pages or 2 * max_workers,
+            thread_name_prefix="export-file",
+        )
@@ -0,0 +1,164 @@
+"""Hot path metrics logged through the Singer SDK metrics logger."""
+
+from __future__ import annotations
+
+import enum
+import time
+import typing as t
+
+from singer_sdk import metrics
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_T = t.TypeVar("_T")
+
+
+class PageMetric(str, enum.Enum):
+    """Metrics logged for every page read from a table."""
+
+    REQUEST_DURATION = "page_request_duration"
+    DESERIALIZATION_DURATION = "page_deserialization_duration"
+    ITEM_COUNT = "page_item_count"
+    BYTE_COUNT = "page_byte_count"
+    CONSUMED_CAPACITY = "page_consumed_capacity"
+    RETRY_COUNT = "page_retry_count"
+    WAIT_DURATION = "page_wait_duration"
+
+
+class PartitionMetric(str, enum.Enum):
+    """Metrics logged for every stream partition synced."""
+
+    RECORD_COUNT = "partition_record_count"
+    PAGE_COUNT = "partition_page_count"
+    DURATION = "partition_duration"
+
+
+class SyncMetric(str, enum.Enum):
+    """Metrics logged once a stream is synced."""
+
+    RETRY_COUNT = "sync_retry_count"
+
+
+def log_metric(
+    metric_type: str,
+    metric: PageMetric | PartitionMetric | SyncMetric,
+    value: float,
+    tags: dict[str, t.Any],
+) -> None:
+    """Log a measurement in the Singer SDK metrics format.
+
+    Args:
+        metric_type: The metric type, `timer` or `counter`.
+        metric: The metric.
+        value: The measured value.
+        tags: The tags of the measurement.
+    """
+    metrics.log(
+        metrics.get_metrics_logger(),
+        # The SDK only reads the value of the metric enum.
+        metrics.Point(metric_type, metric, value, tags),  # type: ignore[arg-type]
+    )
+
+
+def log_page_metrics(
+    tags: dict[str, t.Any],
+    request_duration: float,
+    deserialization_duration: float,
+    item_count: int,
+    byte_count: int,
+    consumed_capacity: float,
+    retry_count: int,
+) -> None:
+    """Log the metrics of a page read from a table.
+
+    Comparing the request and deserialization durations tells whether reading
+    the table is bound by the network or by the CPU.
+
+    Args:
+        tags: The tags of the page, e.g. its table and segment.
+        request_duration: The seconds spent on the request, including retries
+            and read capacity pacing.
+        deserialization_duration: The seconds spent converting the items to
+            records.
+        item_count: The number of items on the page.
+        byte_count: The size of the response body.
+        consumed_capacity: The read capacity units consumed by the request.
+        retry_count: The number of times the request was retried.
+    """
+    log_metric("timer", PageMetric.REQUEST_DURATION, request_duration, tags)
+    log_metric(
+        "timer", PageMetric.DESERIALIZATION_DURATION, deserialization_duration, tags
+    )
+    log_metric("counter", PageMetric.ITEM_COUNT, item_count, tags)
+    log_metric("counter", PageMetric.BYTE_COUNT, byte_count, tags)
+    log_metric("counter", PageMetric.CONSUMED_CAPACITY, consumed_capacity, tags)
+    log_metric("counter", PageMetric.RETRY_COUNT, retry_count, tags)
+
+
+def log_partition_metrics(
+    tags: dict[str, t.Any],
+    record_count: int,
+    page_count: int,
+    duration: float,
+) -> None:
+    """Log the progress of a stream partition, e.g. a scan segment.
+
+    Unlike the SDK's record count, which is logged at intervals spanning
+    several partitions, these are logged once per partition, when it is synced
+    or interrupted.
+
+    Args:
+        tags: The tags of the partition, i.e. its stream and context.
+        record_count: The number of records emitted.
+        page_count: The number of pages emitted.
+        duration: The seconds spent syncing the partition.
+    """
+    log_metric("counter", PartitionMetric.RECORD_COUNT, record_count, tags)
+    log_metric("counter", PartitionMetric.PAGE_COUNT, page_count, tags)
+    log_metric("timer", PartitionMetric.DURATION, duration, tags)
+
+
+def log_retry_metrics(tags: dict[str, t.Any], retry_counts: dict[str, int]) -> None:
+    """Log the retries of a stream's requests, one measurement per error code.
+
+    Args:
+        tags: The tags of the stream.
+        retry_counts: The number of retries of each error code.
+    """
+    for code, count in sorted(retry_counts.items()):
+        log_metric(
+            "counter", SyncMetric.RETRY_COUNT, count, {**tags, "error_code": code}
+        )
+
+
+def timed_pages(pages: Iterator[_T], tags: dict[str, t.Any]) -> Iterator[_T]:
+    """Yield pages, logging how long the consumer waited for them in total.
+
+    A wait close to the sync duration means the sync is bound by reading the
+    table, a wait close to zero that it is bound by emitting the records.
+
+    Args:
+        pages: The pages.
+        tags: The tags of the measurement, e.g. its table.
+
+    Yields:
+        The pages.
+    """
+    waited = 0.0
+    try:
+        while True:
+            started_at = time.perf_counter()
+            try:
+                page = next(pages)
+            except StopIteration:
+                return
+            finally:
+                waited += time.perf_counter() - started_at
+            yield page
+    finally:
+        # Stop any workers still reading pages when the consumer stops early.
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+        log_metric("timer", PageMetric.WAIT_DURATION, waited, tags)
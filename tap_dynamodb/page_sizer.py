@@ -0,0 +1,92 @@
+"""Sizing of scan pages to fit a memory budget."""
+
+from __future__ import annotations
+
+import math
+import threading
+
+# A record held in memory takes a few times the bytes of its DynamoDB JSON, as
+# every value becomes a Python object of its own.
+RECORD_MEMORY_FACTOR = 4
+
+
+class PageSizer:
+    """Adapts the page `Limit` so the pages held in memory fit a budget.
+
+    The budget is split evenly between the pages that can be held in memory at
+    once: those buffered between the workers and the consumer, those being read
+    by the workers and the one being emitted. The size of an item is estimated
+    from the response bodies of the pages read so far, taking the larger of the
+    average over all pages and over the latest page, so the `Limit` drops as
+    soon as wider items show up.
+
+    Before the first page is read, the average item size DynamoDB reports for
+    the table is used. Without one, the first page of each segment is limited
+    to a single item.
+
+    A single sizer is thread-safe and can be shared by all segments of a scan.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: float,
+        pages_in_memory: int = 1,
+        item_bytes: float | None = None,
+    ) -> None:
+        """Initialize the sizer.
+
+        Args:
+            budget_bytes: The memory the pages may take, in bytes.
+            pages_in_memory: The number of pages held in memory at once.
+            item_bytes: The expected size of an item in DynamoDB JSON, e.g.
+                the table's average item size.
+        """
+        if budget_bytes <= 0:
+            raise ValueError("The memory budget must be positive.")
+        self.page_budget_bytes = budget_bytes / max(1, pages_in_memory)
+        self._initial_item_bytes = item_bytes or None
+        self._item_count = 0
+        self._byte_count = 0
+        self._last_item_bytes = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def item_bytes(self) -> float | None:
+        """Return the estimated size of an item.
+
+        Returns:
+            The size in bytes of an item in DynamoDB JSON, or None if unknown.
+        """
+        with self._lock:
+            if not self._item_count:
+                return self._initial_item_bytes
+            return max(self._byte_count / self._item_count, self._last_item_bytes)
+
+    @property
+    def limit(self) -> int:
+        """Return the `Limit` of the next page.
+
+        Returns:
+            The number of items a page may hold to fit the budget.
+        """
+        item_bytes = self.item_bytes
+        if not item_bytes:
+            return 1
+        return max(
+            1,
+            math.floor(self.page_budget_bytes / (item_bytes * RECORD_MEMORY_FACTOR)),
+        )
+
+    def observe(self, item_count: int, byte_count: int) -> None:
+        """Refine the item size estimate with a page read from the table.
+
+        Args:
+            item_count: The number of items on the page.
+            byte_count: The size of the response body.
+        """
+        if item_count <= 0 or byte_count <= 0:
+            return
+        with self._lock:
+            self._item_count += item_count
+            self._byte_count += byte_count
+            self._last_item_bytes = byte_count / item_count
@@ -0,0 +1,136 @@
+"""Read capacity rate limiting for DynamoDB scans."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+import typing as t
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class ReadCapacityLimiter:
+    """Token bucket limiting the read capacity units consumed per second.
+
+    The cost of a page is only known once DynamoDB reports its ConsumedCapacity,
+    so requests are let through while the bucket is not in debt and the reported
+    units are charged afterwards. The rate and the number of concurrent requests
+    are halved whenever DynamoDB throttles a request and recover gradually while
+    requests succeed (additive increase, multiplicative decrease).
+
+    A single limiter is thread-safe and can be shared by all workers scanning
+    the same table. The limiters of several tables can share a parent limiter,
+    which caps the read capacity consumed across all of them.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_concurrency: int = 1,
+        min_rate: float | None = None,
+        recovery_steps: int = 20,
+        parent: ReadCapacityLimiter | None = None,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: The target read capacity units per second.
+            max_concurrency: The maximum number of concurrent requests.
+            min_rate: The rate is never lowered below this value after throttling.
+                Defaults to 5% of the target rate.
+            recovery_steps: The number of successful requests needed to recover
+                from a throttled rate back to the target rate.
+            parent: A limiter that is also waited on and charged, e.g. one
+                shared by all tables.
+        """
+        if rate <= 0:
+            raise ValueError("The read capacity rate must be positive.")
+        self.target_rate = float(rate)
+        self.rate = self.target_rate
+        self.min_rate = min_rate or self.target_rate * 0.05
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.throttle_count = 0
+        self.parent = parent
+        self._recovery_step = self.target_rate / max(1, recovery_steps)
+        self._successes = 0
+        self._active = 0
+        self._tokens = self.target_rate
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.rate, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def wait(self) -> None:
+        """Block until the bucket, and the bucket of the parent, is out of debt."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 0:
+                    break
+                delay = -self._tokens / self.rate
+            time.sleep(delay)
+        if self.parent is not None:
+            self.parent.wait()
+
+    def consume(self, units: float) -> None:
+        """Charge the read capacity units consumed by a request.
+
+        Args:
+            units: The consumed read capacity units.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= units
+        if self.parent is not None:
+            self.parent.consume(units)
+
+    def on_success(self) -> None:
+        """Record a request that was not throttled."""
+        with self._slots:
+            self.rate = min(self.target_rate, self.rate + self._recovery_step)
+            self._successes += 1
+            if (
+                self.concurrency < self.max_concurrency
+                and self._successes >= self.concurrency
+            ):
+                self.concurrency += 1
+                self._successes = 0
+                self._slots.notify()
+
+    def on_throttle(self) -> None:
+        """Record a throttled request, backing off the rate and concurrency."""
+        with self._lock:
+            self.throttle_count += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.concurrency = max(1, self.concurrency // 2)
+            self._successes = 0
+            self._refill()
+            # Pause everyone for a second's worth of the reduced rate.
+            self._tokens = min(self._tokens, 0) - self.rate
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the currently allowed concurrent request slots.
+
+        Yields:
+            None once a slot is available.
+        """
+        with self._slots:
+            while self._active >= self.concurrency:
+                self._slots.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._active -= 1
+                self._slots.notify()
@@ -0,0 +1,169 @@
+"""Retrying of transient AWS errors."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import random
+import threading
+import time
+import typing as t
+
+_T = t.TypeVar("_T")
+
+DEFAULT_RETRYABLE_ERROR_CODES = (
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "ThrottlingException",
+    "InternalServerError",
+    "ServiceUnavailable",
+)
+
+
+def error_code(err: Exception) -> str:
+    """Return the AWS error code of an exception, or its class name.
+
+    Args:
+        err: The exception.
+
+    Returns:
+        The error code.
+    """
+    from botocore.exceptions import ClientError
+
+    if isinstance(err, ClientError):
+        return err.response.get("Error", {}).get("Code", "Unknown")
+    return type(err).__name__
+
+
+class RetryPolicy:
+    """Retries transient errors with decorrelated jitter backoff.
+
+    Each delay is drawn between the base delay and three times the previous
+    delay, capped at `max_delay`, which spreads out the retries of concurrent
+    workers. A request is given up once retrying would take it past
+    `max_elapsed_time`. Connection errors are always retried, client errors
+    only when their code is retryable.
+
+    A single policy is thread-safe and counts the retries of every request
+    made through it, in total and per scope, e.g. per table.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 0.1,
+        max_delay: float = 20,
+        max_elapsed_time: float = 300,
+        retryable_error_codes: t.Iterable[str] = DEFAULT_RETRYABLE_ERROR_CODES,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            base_delay: The minimum number of seconds between attempts.
+            max_delay: The maximum number of seconds between attempts.
+            max_elapsed_time: The number of seconds after which a request is no
+                longer retried.
+            retryable_error_codes: The AWS error codes which are retried.
+        """
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self.max_elapsed_time = max_elapsed_time
+        self.retryable_error_codes = frozenset(retryable_error_codes)
+        self.retry_counts: collections.Counter[str] = collections.Counter()
+        self._scope_retry_counts: dict[str, collections.Counter[str]] = (
+            collections.defaultdict(collections.Counter)
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def logger(self) -> logging.Logger:
+        """Get logger.
+
+        Returns:
+            Plugin logger.
+        """
+        return logging.getLogger("retry")
+
+    @property
+    def retry_count(self) -> int:
+        """Return the total number of retries.
+
+        Returns:
+            The number of retries made through this policy.
+        """
+        with self._lock:
+            return sum(self.retry_counts.values())
+
+    def pop_retry_counts(self, scope: str) -> dict[str, int]:
+        """Return the retries of a scope by error code, and reset them.
+
+        Args:
+            scope: The scope the requests were made in.
+
+        Returns:
+            The number of retries of each error code.
+        """
+        with self._lock:
+            return dict(self._scope_retry_counts.pop(scope, {}))
+
+    def is_retryable(self, err: Exception) -> bool:
+        """Check whether an error is transient.
+
+        Args:
+            err: The exception raised by a request.
+
+        Returns:
+            True if the request should be retried.
+        """
+        from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+
+        if isinstance(err, ClientError):
+            return error_code(err) in self.retryable_error_codes
+        return isinstance(err, (ConnectionError, HTTPClientError))
+
+    def call(
+        self,
+        request: t.Callable[[], _T],
+        description: str = "Request",
+        on_retry: t.Callable[[Exception], None] | None = None,
+        scope: str | None = None,
+    ) -> _T:
+        """Make a request, retrying it on transient errors.
+
+        Args:
+            request: The function making the request.
+            description: The request, as shown in log messages.
+            on_retry: A function called with the error before each retry.
+            scope: The scope the retries are counted in, see `pop_retry_counts`.
+
+        Returns:
+            The result of the request.
+        """
+        started_at = time.monotonic()
+        delay = self.base_delay
+        attempt = 0
+        while True:
+            try:
+                return request()
+            except Exception as err:
+                if not self.is_retryable(err):
+                    raise
+                delay = min(self.max_delay, random.uniform(self.base_delay, delay * 3))
+                if time.monotonic() - started_at + delay > self.max_elapsed_time:
+                    raise
+                attempt += 1
+                code = error_code(err)
+                with self._lock:
+                    self.retry_counts[code] += 1
+                    if scope is not None:
+                        self._scope_retry_counts[scope][code] += 1
+                if on_retry is not None:
+                    on_retry(err)
+                self.logger.warning(
+                    "%s failed with %s, retrying in %.2fs (attempt %d).",
+                    description,
+                    code,
+                    delay,
+                    attempt,
+                )
+                time.sleep(delay)
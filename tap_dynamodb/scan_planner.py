@@ -0,0 +1,122 @@
+"""Planning of table scans from their DescribeTable statistics."""
+
+from __future__ import annotations
+
+import math
+import typing as t
+
+if t.TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import TableDescriptionTypeDef
+
+# A read capacity unit reads up to 4 KB, strongly consistent.
+READ_UNIT_BYTES = 4096
+# DynamoDB returns at most 1 MB of items per page.
+PAGE_BYTES = 1024 * 1024
+# Tables are split into a segment per 2 GB, as recommended by AWS.
+SEGMENT_BYTES = 2 * 1024**3
+MAX_SEGMENTS = 64
+# A rough number of 1 MB pages a single segment reads per second.
+SEGMENT_PAGES_PER_SECOND = 4
+# The share of provisioned read capacity a scan may use, leaving the rest to
+# the applications using the table.
+PROVISIONED_CAPACITY_SHARE = 0.5
+
+
+class ScanPlan(t.NamedTuple):
+    """The planned scan kwargs and the estimated cost of a table scan."""
+
+    table_name: str
+    billing_mode: str
+    table_size_bytes: int
+    item_count: int
+    total_segments: int
+    consistent_read: bool
+    limit: int | None
+    read_capacity_units: float | None
+    estimated_read_capacity_units: float
+    estimated_seconds: float
+
+    @property
+    def scan_kwargs(self) -> dict:
+        """Return the scan kwargs applying the plan.
+
+        Returns:
+            The TotalSegments, ConsistentRead and Limit scan kwargs.
+        """
+        scan_kwargs: dict = {"ConsistentRead": self.consistent_read}
+        if self.total_segments > 1:
+            scan_kwargs["TotalSegments"] = self.total_segments
+        if self.limit:
+            scan_kwargs["Limit"] = self.limit
+        return scan_kwargs
+
+    def to_dict(self) -> dict:
+        """Return the plan as a JSON serializable dict.
+
+        Returns:
+            The plan, including its scan kwargs.
+        """
+        return {**self._asdict(), "scan_kwargs": self.scan_kwargs}
+
+
+def plan_scan(
+    table: TableDescriptionTypeDef,
+    read_capacity_units: float | None = None,
+    consistent_read: bool = False,
+    max_segments: int = MAX_SEGMENTS,
+) -> ScanPlan:
+    """Plan a full scan of a table.
+
+    The table is split into a segment per 2 GB. A provisioned table is read at
+    half its provisioned capacity unless a rate is given, an on-demand table as
+    fast as its segments allow. When the scan is rate limited, the page Limit
+    is chosen so a page of each segment costs about a second of its share of
+    the rate, which keeps the consumption smooth.
+
+    The estimates are based on the size DynamoDB reports, which is updated
+    about every six hours.
+
+    Args:
+        table: The DescribeTable description of the table.
+        read_capacity_units: The configured read capacity units per second,
+            if any.
+        consistent_read: Whether items are read strongly consistent, which
+            costs twice as much as eventually consistent reads.
+        max_segments: The maximum number of segments.
+
+    Returns:
+        The plan.
+    """
+    size = table.get("TableSizeBytes", 0)
+    item_count = table.get("ItemCount", 0)
+    billing_mode = table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED")
+    provisioned = table.get("ProvisionedThroughput", {}).get("ReadCapacityUnits", 0)
+    segments = min(max(1, math.ceil(size / SEGMENT_BYTES)), max(1, max_segments))
+
+    unit_cost = 1.0 if consistent_read else 0.5
+    estimated_units = max(1, math.ceil(size / READ_UNIT_BYTES)) * unit_cost
+    rate = read_capacity_units
+    if not rate and billing_mode == "PROVISIONED" and provisioned:
+        rate = provisioned * PROVISIONED_CAPACITY_SHARE
+
+    pages = max(1, math.ceil(size / PAGE_BYTES))
+    seconds = pages / (segments * SEGMENT_PAGES_PER_SECOND)
+    limit = None
+    if rate:
+        seconds = max(seconds, estimated_units / rate)
+        page_bytes = rate / segments / unit_cost * READ_UNIT_BYTES
+        if size and item_count and page_bytes < PAGE_BYTES:
+            limit = max(1, math.floor(page_bytes / (size / item_count)))
+
+    return ScanPlan(
+        table_name=table["TableName"],
+        billing_mode=billing_mode,
+        table_size_bytes=size,
+        item_count=item_count,
+        total_segments=segments,
+        consistent_read=consistent_read,
+        limit=limit,
+        read_capacity_units=rate,
+        estimated_read_capacity_units=estimated_units,
+        estimated_seconds=seconds,
+    )
@@ -0,0 +1,110 @@
+"""On-disk cache of inferred table schemas."""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class SchemaCache:
+    """A JSON file caching inferred schemas by table name and fingerprint.
+
+    An entry is only returned while the fingerprint of the table matches and
+    it is younger than the TTL. The oldest entries are evicted once the cache
+    holds more than `max_entries` tables.
+
+    The cache is thread-safe, the file is rewritten atomically on every update.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        ttl: float = 86400,
+        max_entries: int = 1000,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: The path of the cache file, created on the first update.
+            ttl: The number of seconds an entry stays valid.
+            max_entries: The maximum number of cached tables.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def logger(self) -> logging.Logger:
+        """Get logger.
+
+        Returns:
+            Plugin logger.
+        """
+        return logging.getLogger("schema_cache")
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except FileNotFoundError:
+                self._entries = {}
+            except ValueError:
+                self.logger.warning(
+                    "Ignoring unreadable schema cache file %s.", self.path
+                )
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries: dict[str, dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(entries))
+        os.replace(temp_path, self.path)
+
+    def get(self, table_name: str, fingerprint: str) -> dict | None:
+        """Get the cached schema of a table.
+
+        Args:
+            table_name: The table name.
+            fingerprint: The current fingerprint of the table.
+
+        Returns:
+            The schema, or None if it is not cached, stale or expired.
+        """
+        with self._lock:
+            entry = self._load().get(table_name)
+            if (
+                entry is None
+                or entry["fingerprint"] != fingerprint
+                or time.time() - entry["cached_at"] > self.ttl
+            ):
+                return None
+            return copy.deepcopy(entry["schema"])
+
+    def put(self, table_name: str, fingerprint: str, schema: dict) -> None:
+        """Cache the schema of a table.
+
+        Args:
+            table_name: The table name.
+            fingerprint: The fingerprint of the table the schema was inferred for.
+            schema: The schema.
+        """
+        with self._lock:
+            entries = self._load()
+            entries[table_name] = {
+                "fingerprint": fingerprint,
+                "cached_at": time.time(),
+                "schema": copy.deepcopy(schema),
+            }
+            if len(entries) > self.max_entries:
+                by_age = sorted(entries, key=lambda name: entries[name]["cached_at"])
+                for name in by_age[: len(entries) - self.max_entries]:
+                    del entries[name]
+            self._save(entries)
@@ -2,17 +2,56 @@
 
 from __future__ import annotations
 
+import functools
+import re
+import threading
+import time
 import typing as t
+from decimal import Decimal
 
+from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk.batch import Batcher
 from singer_sdk.streams import Stream
 
+from tap_dynamodb.dynamodb_connector import projection_scan_kwargs
+from tap_dynamodb.dynamodb_streams_connector import DynamoDbStreamsConnector
+from tap_dynamodb.export_reader import ExportReader, open_export_filesystem
+from tap_dynamodb.metrics import (
+    log_partition_metrics,
+    log_retry_metrics,
+    timed_pages,
+)
+
 if t.TYPE_CHECKING:
-    from collections.abc import Iterable
+    import datetime
+    from collections.abc import Iterable, Iterator
 
+    import genson
+    from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
     from singer_sdk.helpers.types import Context
     from singer_sdk.tap_base import Tap
 
-    from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+    from tap_dynamodb.concurrency import ConcurrentPartitions
+    from tap_dynamodb.dynamodb_connector import DynamoDbConnector, ScanPage
+    from tap_dynamodb.rate_limiter import ReadCapacityLimiter
+    from tap_dynamodb.scan_planner import ScanPlan
+
+_T = t.TypeVar("_T")
+
+# Tracking more sets of attributes uses more memory than re-checking records.
+MAX_TRACKED_KEY_SETS = 10_000
+
+SYNC_MODE_SCAN = "scan"
+SYNC_MODE_STREAMS = "streams"
+SYNC_MODE_EXPORT = "export"
+SYNC_MODE_QUERY = "query"
+SYNC_MODES = (SYNC_MODE_SCAN, SYNC_MODE_STREAMS, SYNC_MODE_EXPORT, SYNC_MODE_QUERY)
+
+CHANGE_METADATA_PROPERTIES = th.PropertiesList(
+    th.Property("_sdc_event_name", th.StringType),
+    th.Property("_sdc_sequence_number", th.StringType),
+    th.Property("_sdc_deleted_at", th.DateTimeType),
+).to_dict()["properties"]
 
 
 class TableStream(Stream):
@@ -36,15 +75,71 @@ class TableStream(Stream):
 
         Raises:
             Exception: If an input catalog is provided and the table is
-                not found in it.
+                not found in it, or the sync mode of the table is not
+                supported or not configured.
         """
         self._dynamodb_conn: DynamoDbConnector = dynamodb_conn
         self._table_name: str = name
+        # Shared with the other streams synced at once, see TapDynamoDB.
+        self._state_lock: t.ContextManager = getattr(
+            tap, "state_lock", threading.RLock()
+        )
         self._schema: dict = {}
         self._infer_schema_sample_size = infer_schema_sample_size
-        self._table_scan_kwargs: dict = tap.config.get("table_scan_kwargs", {}).get(
+        self._table_scan_kwargs: dict = dict(
+            tap.config.get("table_scan_kwargs", {}).get(name, {})
+        )
+        self._scan_plan: ScanPlan | None = None
+        if tap.config.get("plan_scans") and name not in tap.config.get(
+            "table_scan_kwargs", {}
+        ):
+            self._scan_plan = dynamodb_conn.plan_scan(name)
+            self._table_scan_kwargs = self._scan_plan.scan_kwargs
+        scan_segments = tap.config.get("scan_segments") or 1
+        if (
+            scan_segments > 1
+            and self._scan_plan is None
+            and "Segment" not in self._table_scan_kwargs
+        ):
+            self._table_scan_kwargs.setdefault("TotalSegments", scan_segments)
+        self._scan_workers: int | None = tap.config.get("scan_workers")
+        self._scan_max_buffered_pages: int | None = tap.config.get(
+            "scan_max_buffered_pages"
+        )
+        self._scan_checkpoint_interval: int = tap.config.get(
+            "scan_checkpoint_interval", 10
+        )
+        self._sync_mode: str = tap.config.get("table_sync_modes", {}).get(
+            name, SYNC_MODE_SCAN
+        )
+        if self._sync_mode not in SYNC_MODES:
+            raise Exception(
+                f"Sync mode '{self._sync_mode}' for table '{name}' not supported."
+            )
+        self._query_config: dict = tap.config.get("table_query_configs", {}).get(
             name, {}
         )
+        if self._sync_mode == SYNC_MODE_QUERY and not self._query_config:
+            raise Exception(
+                f"Sync mode 'query' for table '{name}' requires an entry in "
+                "`table_query_configs`."
+            )
+        self._stream_shard_workers: int = tap.config.get("stream_shard_workers", 4)
+        self._streams_conn: DynamoDbStreamsConnector | None = None
+        self._export_arn: str | None = tap.config.get("export_arns", {}).get(name)
+        self._export_file_workers: int = tap.config.get("export_file_workers", 4)
+        self._export_poll_interval: float = tap.config.get("export_poll_interval", 30)
+        # The number of pages whose records have all been emitted.
+        self._pages_emitted = 0
+        # The progress updates waiting for the BATCH message of their records,
+        # while the records are batched.
+        self._pending_progress: list[t.Callable[[], None]] | None = None
+        # The scan of the segments, shared by the partitions of a sync.
+        self._segment_scan: ConcurrentPartitions[int, ScanPage] | None = None
+        self._schema_evolution: bool = tap.config.get("schema_evolution", False)
+        self._schema_builder: genson.SchemaBuilder | None = None
+        self._built_schema: dict = {}
+        self._seen_key_sets: set[frozenset[str]] = set()
         if tap.input_catalog:
             catalog_entry = tap.input_catalog.get(name)
             if catalog_entry:
@@ -60,14 +155,931 @@ class TableStream(Stream):
                 )
         else:
             super().__init__(name=name, tap=tap)
+        if self._sync_mode == SYNC_MODE_STREAMS:
+            self.forced_replication_method = "LOG_BASED"
+        elif self._sync_mode == SYNC_MODE_QUERY:
+            self.replication_key = self._query_config["replication_key"]
+            self.forced_replication_method = "INCREMENTAL"
+
+    @property
+    def stream_state(self) -> dict:
+        """Return the writable state of the stream, creating it if needed.
+
+        Returns:
+            The state of the stream.
+        """
+        with self._state_lock:
+            return super().stream_state
+
+    def get_context_state(self, context: Context | None) -> dict:
+        """Return the writable state of a context, creating it if needed.
+
+        The bookmarks of every stream share the tap state, so they are created
+        under the state lock, the same way the state is written.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The state of the context.
+        """
+        with self._state_lock:
+            return super().get_context_state(context)
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict,
+        *,
+        context: Context | None = None,
+    ) -> None:
+        """Advance the bookmark of a context with a record, under the state lock.
+
+        Args:
+            latest_record: The record.
+            context: Stream partition or context dictionary.
+        """
+        with self._state_lock:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_starting_replication_value(self, context: Context | None) -> None:
+        """Save the starting replication value of a context, under the state lock.
+
+        Args:
+            context: Stream partition or context dictionary.
+        """
+        with self._state_lock:
+            super()._write_starting_replication_value(context)
+
+    def _write_replication_key_signpost(
+        self,
+        context: Context | None,
+        value: datetime.datetime | str | int | float,
+    ) -> None:
+        """Save the replication key signpost of a context, under the state lock.
+
+        Args:
+            context: Stream partition or context dictionary.
+            value: The signpost.
+        """
+        with self._state_lock:
+            super()._write_replication_key_signpost(context, value)
+
+    def reset_state_progress_markers(self, state: dict | None = None) -> None:
+        """Reset the progress markers, under the state lock.
+
+        Args:
+            state: The state to reset, all contexts if not given.
+        """
+        with self._state_lock:
+            super().reset_state_progress_markers(state)
+
+    def _finalize_state(self, state: dict | None = None) -> None:
+        """Promote the progress markers of a state, under the state lock.
+
+        Args:
+            state: The state to finalize.
+        """
+        with self._state_lock:
+            super()._finalize_state(state)
+
+    def finalize_state_progress_markers(self, state: dict | None = None) -> None:
+        """Finalize the progress markers and write the state, under the state lock.
+
+        Args:
+            state: The state to finalize, all contexts if not given.
+        """
+        with self._state_lock:
+            super().finalize_state_progress_markers(state)
+
+    def _write_state_message(self) -> None:
+        """Write the state, holding the lock other streams update the state with.
+
+        The SDK compares and copies the whole tap state, so no stream synced at
+        once may update its bookmarks meanwhile.
+        """
+        with self._state_lock:
+            super()._write_state_message()
+
+    def _write_batch_message(
+        self,
+        encoding: BaseBatchFileEncoding,
+        manifest: list[str],
+    ) -> None:
+        """Write a BATCH message, then apply the progress of its records.
+
+        Args:
+            encoding: The encoding of the batch files.
+            manifest: The batch files.
+        """
+        super()._write_batch_message(encoding, manifest)
+        self._apply_pending_progress()
+
+    def _apply_pending_progress(self) -> bool:
+        """Apply the progress updates waiting for a BATCH message.
+
+        Returns:
+            Whether any update was applied.
+        """
+        with self._state_lock:
+            pending, self._pending_progress = self._pending_progress, []
+            for update in pending or []:
+                update()
+            return bool(pending)
+
+    def _advance_progress(self, update: t.Callable[[], None], write: bool) -> None:
+        """Apply a progress update to the state once its records are emitted.
+
+        While the records are batched, the update waits for the BATCH message
+        of the records emitted before it, and the SDK writes the state after
+        that message instead.
+
+        Args:
+            update: Updates the state with the progress.
+            write: Whether to write the state after the update.
+        """
+        with self._state_lock:
+            if self._pending_progress is not None:
+                self._pending_progress.append(update)
+                return
+            update()
+            if write:
+                self._write_state_message()
+
+    def log_sync_costs(self) -> None:
+        """Log the sync costs and the retries of the table's requests.
+
+        The retries are logged by error code, e.g. throttling, server or
+        connection errors, and reset, so a later sync of the table in the same
+        process reports its own.
+        """
+        super().log_sync_costs()
+        retry_counts = self._dynamodb_conn.retry_policy.pop_retry_counts(
+            self._table_name
+        )
+        if retry_counts:
+            self.logger.info(
+                "Retried requests of '%s' by error code: %s", self.name, retry_counts
+            )
+        log_retry_metrics({"stream": self.name}, retry_counts)
+
+    @property
+    def streams_conn(self) -> DynamoDbStreamsConnector:
+        """Return the connector used to read the table's DynamoDB stream.
+
+        Returns:
+            The DynamoDbStreamsConnector object.
+        """
+        if self._streams_conn is None:
+            self._streams_conn = DynamoDbStreamsConnector(dict(self.config))
+        return self._streams_conn
+
+    @property
+    def table_size(self) -> tuple[int, int]:
+        """Return the size of the table, as last reported by DynamoDB.
+
+        Returns:
+            The size of the table in bytes and its number of items.
+        """
+        table = self._dynamodb_conn.describe_table(self._table_name)
+        return table.get("TableSizeBytes", 0), table.get("ItemCount", 0)
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Return a partition per scan segment of the table.
+
+        Only full table scans are partitioned, so each segment has its own
+        state, progress and record counts.
+
+        Returns:
+            The context of each segment, or None if the table is not scanned.
+        """
+        if self._sync_mode != SYNC_MODE_SCAN:
+            return None
+        total_segments = self._table_scan_kwargs.get("TotalSegments") or 1
+        if "Segment" in self._table_scan_kwargs:
+            segments = [self._table_scan_kwargs["Segment"]]
+        else:
+            segments = list(range(total_segments))
+        return [
+            {"segment": segment, "total_segments": total_segments}
+            for segment in segments
+        ]
+
+    def _migrate_scan_checkpoint(self, partitions: list[dict]) -> None:
+        """Move a scan checkpoint of the whole stream into its partitions.
+
+        The checkpoint was taken before segments were partitions.
+
+        Args:
+            partitions: The partitions of the stream.
+        """
+        with self._state_lock:
+            stream_state = self.tap_state.get("bookmarks", {}).get(self.name) or {}
+            checkpoint = stream_state.pop("scan_checkpoint", None)
+            if not checkpoint:
+                return
+            if checkpoint.get("total_segments") != partitions[0]["total_segments"]:
+                self.logger.warning(
+                    "Ignoring scan checkpoint for '%s' taken with a different "
+                    "number of segments.",
+                    self.name,
+                )
+                return
+            for partition in partitions:
+                progress = checkpoint.get("segments", {}).get(str(partition["segment"]))
+                if progress:
+                    self.get_context_state(partition).update(progress)
+
+    def _process_record(
+        self,
+        record: dict,
+        child_context: Context | None = None,
+        partition_context: Context | None = None,
+    ) -> None:
+        """Process a record, without adding the partition context to it.
+
+        Scan segments are not properties of the records, so they are not added
+        to them the way the SDK adds the context of other partitions.
+
+        Args:
+            record: The record to process.
+            child_context: The child context.
+            partition_context: The partition context.
+        """
+        super()._process_record(record, child_context=child_context)
+
+    def get_selected_scan_kwargs(self) -> dict:
+        """Return the scan kwargs, projected onto the selected properties.
+
+        When properties are deselected in the catalog, only the selected
+        attributes, the key attributes and the replication key are read from
+        DynamoDB, unless the scan kwargs already set a projection.
+
+        Returns:
+            The scan kwargs.
+        """
+        scan_kwargs = self._table_scan_kwargs
+        properties = [
+            name
+            for name in self.schema.get("properties", {})
+            if name not in CHANGE_METADATA_PROPERTIES
+        ]
+        selected = [
+            name
+            for name in properties
+            if self.mask.get(("properties", name), True)
+            or name in (self.primary_keys or [])
+            or name == self.replication_key
+        ]
+        if len(selected) == len(properties) or "ProjectionExpression" in scan_kwargs:
+            return scan_kwargs
+        projection = projection_scan_kwargs((name,) for name in selected)
+        return {
+            **scan_kwargs,
+            "ProjectionExpression": projection["ProjectionExpression"],
+            "ExpressionAttributeNames": {
+                **scan_kwargs.get("ExpressionAttributeNames", {}),
+                **projection["ExpressionAttributeNames"],
+            },
+        }
+
+    def _get_scan_checkpoint(self, state: dict) -> dict:
+        """Return the checkpoint of an interrupted scan to resume from.
+
+        Args:
+            state: The stream state.
+
+        Returns:
+            The checkpoint, which is blank if there is nothing to resume.
+        """
+        total_segments = self._table_scan_kwargs.get("TotalSegments") or 1
+        checkpoint = state.get("scan_checkpoint") or {}
+        if checkpoint and checkpoint.get("total_segments") != total_segments:
+            self.logger.warning(
+                "Ignoring scan checkpoint for '%s' taken with a different number "
+                "of segments.",
+                self.name,
+            )
+            checkpoint = {}
+        if checkpoint:
+            self.logger.info("Resuming interrupted scan of '%s'.", self.name)
+        return {
+            "total_segments": total_segments,
+            "segments": checkpoint.get("segments", {}),
+        }
+
+    def _timed_pages(self, pages: Iterator[_T], operation: str) -> Iterator[_T]:
+        """Log how long the stream waited for pages, if page metrics are enabled.
+
+        Args:
+            pages: The pages read from the table.
+            operation: The way the pages are read, e.g. `scan`.
+
+        Returns:
+            The pages.
+        """
+        if not self._dynamodb_conn.page_metrics:
+            return pages
+        return timed_pages(pages, {"table": self._table_name, "operation": operation})
+
+    def get_batches(
+        self,
+        batch_config: BatchConfig,
+        context: Context | None = None,
+    ) -> Iterable[tuple[BaseBatchFileEncoding, list[str]]]:
+        """Write the records to batch files holding whole pages.
+
+        A batch is cut at the first page boundary after `batch_size` records,
+        and its files are reported in a single BATCH message. The state written
+        after that message then covers exactly the records in the files written
+        so far, so a resumed sync emits no record twice.
+
+        Args:
+            batch_config: Batch config for this stream.
+            context: Stream partition or context dictionary.
+
+        Yields:
+            A tuple of (encoding, manifest) for each batch.
+        """
+        batcher = Batcher(
+            tap_name=self.tap_name,
+            stream_name=self.name,
+            batch_config=batch_config,
+        )
+
+        def _write_batch(records: list[dict]) -> list[str]:
+            return [
+                path
+                for manifest in batcher.get_batches(records=iter(records))
+                for path in manifest
+            ]
+
+        records: list[dict] = []
+        pages_emitted = self._pages_emitted
+        self._pending_progress = []
+        try:
+            for record in self._sync_records(context, write_messages=False):
+                if (
+                    len(records) >= batch_config.batch_size
+                    and self._pages_emitted != pages_emitted
+                ):
+                    # The record starts a new page.
+                    yield batch_config.encoding, _write_batch(records)
+                    records = []
+                pages_emitted = self._pages_emitted
+                records.append(record)
+            if records:
+                yield batch_config.encoding, _write_batch(records)
+            # Progress left without records to batch, such as resumed segments
+            # with no items left, is written without a BATCH message.
+            with self._state_lock:
+                if self._apply_pending_progress():
+                    self._is_state_flushed = False
+                    self._write_state_message()
+        finally:
+            self._pending_progress = None
+
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        """Sync the records, once an old scan checkpoint is moved to partitions.
+
+        Args:
+            context: Stream partition or context dictionary.
+            write_messages: Whether to write Singer messages to stdout.
+
+        Yields:
+            Each record of the table.
+        """
+        partitions = self.partitions
+        if context is None and partitions:
+            self._migrate_scan_checkpoint(partitions)
+        yield from super()._sync_records(context, write_messages=write_messages)
 
     def get_records(self, context: Context | None) -> Iterable[dict]:
         """Generate records from the stream."""
-        for batch in self._dynamodb_conn.get_items_iter(
+        if self._sync_mode == SYNC_MODE_STREAMS:
+            records = self._get_change_records(context)
+        elif self._sync_mode == SYNC_MODE_EXPORT:
+            records = self._get_export_records(context)
+        elif self._sync_mode == SYNC_MODE_QUERY:
+            records = self._get_query_records(context)
+        elif context is not None:
+            records = self._get_segment_records(context)
+        else:
+            records = self._get_scan_records(context)
+        if self._schema_evolution:
+            records = self._evolve_schema(records)
+        yield from records
+
+    def _evolve_schema(self, records: Iterable[dict]) -> Iterable[dict]:
+        """Widen the schema to cover the records, emitting a SCHEMA message.
+
+        Only a record whose set of attributes has not been seen before is added
+        to the schema, so records shaped like earlier ones cost a set lookup.
+        Consequently, an attribute changing type or a nested attribute appearing
+        under an already seen set of attributes is not detected.
+
+        Args:
+            records: The records to emit.
+
+        Yields:
+            The records, each one after the schema covering it.
+        """
+        for record in records:
+            key_set = frozenset(record)
+            if key_set not in self._seen_key_sets:
+                if len(self._seen_key_sets) >= MAX_TRACKED_KEY_SETS:
+                    self._seen_key_sets.clear()
+                self._seen_key_sets.add(key_set)
+                self._widen_schema(record)
+            yield record
+
+    def _widen_schema(self, record: dict) -> None:
+        """Add a record to the schema, emitting a SCHEMA message if it widens.
+
+        Args:
+            record: The record.
+        """
+        if self._schema_builder is None:
+            import genson
+
+            self._schema_builder = genson.SchemaBuilder(schema_uri=None)
+            self._schema_builder.add_schema(self.schema)
+            self._built_schema = self._build_schema(self._schema_builder)
+        self._schema_builder.add_object(record)
+        built_schema = self._build_schema(self._schema_builder)
+        if built_schema == self._built_schema:
+            return
+        # Only replace the properties that changed, the others keep the
+        # keywords genson does not know about, e.g. `format`.
+        changed = {
+            name: prop
+            for name, prop in built_schema.get("properties", {}).items()
+            if self._built_schema.get("properties", {}).get(name) != prop
+        }
+        self._built_schema = built_schema
+        self._schema = {
+            **self._schema,
+            "properties": {**self._schema.get("properties", {}), **changed},
+        }
+        self.logger.info(
+            "Schema of '%s' widened for attributes: %s",
+            self.name,
+            ", ".join(sorted(changed)),
+        )
+        if self._tap.mapper:
+            self._tap.mapper.register_raw_stream_schema(
+                self.name, self._schema, self.primary_keys
+            )
+            self._stream_maps = None
+        self._write_schema_message()
+
+    def _build_schema(self, builder: genson.SchemaBuilder) -> dict:
+        schema = builder.to_schema()
+        self._dynamodb_conn._recursively_drop_required(schema)
+        return schema
+
+    def _get_scan_records(self, context: Context | None) -> Iterable[dict]:
+        """Generate records from a full table scan.
+
+        The last evaluated key of each scan segment is checkpointed in the stream
+        state every `scan_checkpoint_interval` pages, so an interrupted scan is
+        resumed instead of restarted on the next run.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The scanned records.
+        """
+        state = self.get_context_state(context)
+        checkpoint = self._get_scan_checkpoint(state)
+        segments: dict = checkpoint["segments"]
+        pages = 0
+        scan_pages = self._dynamodb_conn.scan_pages(
+            self._table_name,
+            self.get_selected_scan_kwargs(),
+            max_workers=self._scan_workers,
+            max_buffered_pages=self._scan_max_buffered_pages,
+            rate_limiter=self._get_scan_rate_limiter(),
+            start_keys={
+                int(segment): progress["last_evaluated_key"]
+                for segment, progress in segments.items()
+                if "last_evaluated_key" in progress
+            },
+            completed_segments={
+                int(segment)
+                for segment, progress in segments.items()
+                if progress.get("done")
+            },
+        )
+        for page in self._timed_pages(scan_pages, "scan"):
+            yield from page.items
+            # Every record of the page has been emitted once we get here.
+            pages += 1
+            self._pages_emitted += 1
+            progress = (
+                {"done": True}
+                if page.last_evaluated_key is None
+                else {"last_evaluated_key": page.last_evaluated_key}
+            )
+            self._advance_progress(
+                functools.partial(segments.__setitem__, str(page.segment), progress),
+                write=False,
+            )
+            if self._scan_checkpoint_interval and (
+                pages % self._scan_checkpoint_interval == 0
+            ):
+                self._advance_progress(
+                    functools.partial(state.__setitem__, "scan_checkpoint", checkpoint),
+                    write=True,
+                )
+        # The scan is complete, the next run starts from scratch.
+        self._advance_progress(
+            functools.partial(state.pop, "scan_checkpoint", None), write=False
+        )
+
+    def _get_scan_rate_limiter(self) -> ReadCapacityLimiter | None:
+        """Return the rate limiter of a planned scan.
+
+        Returns:
+            The limiter pacing the scan at the planned rate, or None to use
+            the configured one.
+        """
+        if self._scan_plan is None:
+            return None
+        self.logger.info(
+            "Scanning '%s' in %d segments, estimated to consume %.0f RCU in "
+            "%.0f seconds.",
+            self.name,
+            self._scan_plan.total_segments,
+            self._scan_plan.estimated_read_capacity_units,
+            self._scan_plan.estimated_seconds,
+        )
+        return self._dynamodb_conn.get_read_capacity_limiter(
+            self._table_name,
+            max_concurrency=self._scan_workers or self._scan_plan.total_segments,
+            rate=self._scan_plan.read_capacity_units,
+        )
+
+    def _start_segment_scan(self) -> ConcurrentPartitions[int, ScanPage]:
+        """Start scanning the segments left to scan.
+
+        Returns:
+            The pages of each segment left to scan, by segment number.
+        """
+        states = {
+            partition["segment"]: self.get_context_state(partition)
+            for partition in self.partitions or []
+        }
+        return self._dynamodb_conn.scan_partitions(
+            self._table_name,
+            self.get_selected_scan_kwargs(),
+            max_workers=self._scan_workers,
+            max_buffered_pages=self._scan_max_buffered_pages,
+            rate_limiter=self._get_scan_rate_limiter(),
+            start_keys={
+                segment: state["last_evaluated_key"]
+                for segment, state in states.items()
+                if "last_evaluated_key" in state
+            },
+            completed_segments={
+                segment for segment, state in states.items() if state.get("done")
+            },
+        )
+
+    def _get_segment_records(self, context: Context) -> Iterable[dict]:
+        """Generate the records of a scan segment.
+
+        The segments left to scan are all read concurrently once the first one
+        is synced, each into a buffer of its own, while the SDK syncs the
+        partitions one after the other. The last evaluated key of the segment is
+        checkpointed in its partition state every `scan_checkpoint_interval`
+        pages and the segment is marked done once scanned, so an interrupted
+        scan skips the finished segments and resumes the others. Once the last
+        segment is synced, the progress of every segment is cleared, so the
+        next run starts a new scan.
+
+        Args:
+            context: The partition of the segment.
+
+        Yields:
+            The scanned records.
+        """
+        state = self.get_context_state(context)
+        segment = context["segment"]
+
+        def _set_progress(progress: dict) -> None:
+            state.pop("last_evaluated_key", None)
+            state.pop("done", None)
+            state.update(progress)
+
+        if state.get("done"):
+            self.logger.info(
+                "Skipping segment %d of '%s', scanned by a previous run.",
+                segment,
+                self.name,
+            )
+        else:
+            if self._segment_scan is None:
+                self._segment_scan = self._start_segment_scan()
+            started_at = time.perf_counter()
+            records = pages = 0
+            finished = False
+            try:
+                segment_pages = self._segment_scan.iter_partition(segment)
+                for page in self._timed_pages(segment_pages, "scan"):
+                    yield from page.items
+                    # Every record of the page has been emitted once we get here.
+                    records += len(page.items)
+                    pages += 1
+                    self._pages_emitted += 1
+                    progress = (
+                        {"done": True}
+                        if page.last_evaluated_key is None
+                        else {"last_evaluated_key": page.last_evaluated_key}
+                    )
+                    self._advance_progress(
+                        functools.partial(_set_progress, progress),
+                        write=bool(self._scan_checkpoint_interval)
+                        and pages % self._scan_checkpoint_interval == 0,
+                    )
+                finished = True
+            finally:
+                log_partition_metrics(
+                    {"stream": self.name, "context": dict(context)},
+                    record_count=records,
+                    page_count=pages,
+                    duration=time.perf_counter() - started_at,
+                )
+                if not finished and self._segment_scan is not None:
+                    self._segment_scan.close()
+                    self._segment_scan = None
+
+        partitions = self.partitions or []
+        if context == partitions[-1]:
+            # The scan is complete, the next run starts from scratch.
+            if self._segment_scan is not None:
+                self._segment_scan.close()
+                self._segment_scan = None
+            self._advance_progress(
+                functools.partial(self._clear_segment_progress, partitions),
+                write=False,
+            )
+
+    def _clear_segment_progress(self, partitions: list[dict]) -> None:
+        """Clear the progress of every scan segment.
+
+        Args:
+            partitions: The partitions of the segments.
+        """
+        for partition in partitions:
+            partition_state = self.get_context_state(partition)
+            partition_state.pop("last_evaluated_key", None)
+            partition_state.pop("done", None)
+
+    def _get_export_records(self, context: Context | None) -> Iterable[dict]:
+        """Generate records from a point in time export of the table.
+
+        An export consumes no read capacity. A new export is started on every
+        run unless an export ARN is configured for the table. The export and
+        the data files already read are saved in the stream state, so an
+        interrupted run reuses the export and skips those files.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The exported records.
+
+        Raises:
+            Exception: If an export has to be started and no bucket is set.
+        """
+        state = self.get_context_state(context)
+        position = state.get("export_position") or {}
+        export_arn = position.get("export_arn") or self._export_arn
+        if not export_arn:
+            if not self.config.get("export_s3_bucket"):
+                raise Exception(
+                    f"`export_s3_bucket` is required to export table '{self.name}'."
+                )
+            export_arn = self._dynamodb_conn.start_export(
+                self._table_name,
+                self.config["export_s3_bucket"],
+                self.config.get("export_s3_prefix"),
+            )["ExportArn"]
+        completed: list[str] = position.get("completed_files", [])
+        position = {"export_arn": export_arn, "completed_files": completed}
+        with self._state_lock:
+            state["export_position"] = position
+            # No record was written yet, so the SDK would consider the state
+            # flushed. Write it anyway, so an export is not started again if
+            # the run is interrupted while waiting for it.
+            self._is_state_flushed = False
+            self._write_state_message()
+
+        description = self._dynamodb_conn.wait_for_export(
+            export_arn, self._export_poll_interval
+        )
+        reader = ExportReader(
+            open_export_filesystem(
+                self._dynamodb_conn,
+                description.get("S3Bucket"),
+                self.config.get("export_filesystem_url"),
+            ),
+            self._dynamodb_conn.item_to_record,
+        )
+        paths = [
+            path
+            for path in reader.list_data_files(description)
+            if path not in completed
+        ]
+        export_pages = reader.get_pages(paths, max_workers=self._export_file_workers)
+        for page in self._timed_pages(export_pages, "export"):
+            yield from page.records
+            self._pages_emitted += 1
+            # Every record of the file has been emitted once we get here.
+            if page.finished:
+                self._advance_progress(
+                    functools.partial(completed.append, page.path), write=True
+                )
+        # The export is fully read, the next run starts a new one.
+        self._advance_progress(
+            functools.partial(state.pop, "export_position", None), write=False
+        )
+
+    def _get_query_records(self, context: Context | None) -> Iterable[dict]:
+        """Generate the records changed since the replication key bookmark.
+
+        One query is issued per configured partition key value, selecting the
+        items whose replication key, the sort key of the index, is greater than
+        the bookmark. The queries run concurrently, so the records are not
+        sorted and the bookmark only advances once the sync completes.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The records changed since the last sync.
+
+        Raises:
+            Exception: If the replication key is a number attribute while
+                numbers are emitted as strings.
+        """
+        partition_key = self._query_config["partition_key"]
+        replication_key = self._query_config["replication_key"]
+        attribute_types = {
+            definition["AttributeName"]: definition["AttributeType"]
+            for definition in self._dynamodb_conn.describe_table(self._table_name)[
+                "AttributeDefinitions"
+            ]
+        }
+        if (
+            attribute_types.get(replication_key) == "N"
+            and not self._dynamodb_conn.native_deserializer
+        ):
+            raise Exception(
+                f"Replication key '{replication_key}' of table '{self.name}' is a "
+                "number, enable `native_deserializer` so bookmarks are compared "
+                "as numbers."
+            )
+
+        def _key_value(attribute: str, value: t.Any) -> t.Any:
+            if attribute_types.get(attribute) == "N":
+                return Decimal(str(value))
+            return value
+
+        bookmark = self.get_starting_replication_key_value(context)
+        key_condition = "#pk = :pk"
+        attribute_names = {"#pk": partition_key}
+        if bookmark is not None:
+            key_condition += " AND #rk > :rk"
+            attribute_names["#rk"] = replication_key
+        selected_kwargs = self.get_selected_scan_kwargs()
+        if "ProjectionExpression" in selected_kwargs:
+            # Only the names used by the projection, unused names are rejected.
+            projected_names = set(
+                re.findall(r"#\w+", selected_kwargs["ProjectionExpression"])
+            )
+            attribute_names = {
+                **{
+                    placeholder: name
+                    for placeholder, name in selected_kwargs.get(
+                        "ExpressionAttributeNames", {}
+                    ).items()
+                    if placeholder in projected_names
+                },
+                **attribute_names,
+            }
+        queries = []
+        for partition_value in self._query_config["partition_values"]:
+            attribute_values = {":pk": _key_value(partition_key, partition_value)}
+            if bookmark is not None:
+                attribute_values[":rk"] = _key_value(replication_key, bookmark)
+            query = {
+                "KeyConditionExpression": key_condition,
+                "ExpressionAttributeNames": attribute_names,
+                "ExpressionAttributeValues": attribute_values,
+            }
+            if "ProjectionExpression" in selected_kwargs:
+                query["ProjectionExpression"] = selected_kwargs["ProjectionExpression"]
+            if self._query_config.get("index_name"):
+                query["IndexName"] = self._query_config["index_name"]
+            queries.append(query)
+        query_pages = self._dynamodb_conn.query_pages(
             self._table_name,
-            self._table_scan_kwargs,
+            queries,
+            max_workers=self._scan_workers,
+            max_buffered_pages=self._scan_max_buffered_pages,
+        )
+        for page in self._timed_pages(query_pages, "query"):
+            yield from page.items
+            self._pages_emitted += 1
+
+    def _change_to_record(self, change: dict) -> dict:
+        """Convert a DynamoDB stream record into a stream record.
+
+        Args:
+            change: The DynamoDB stream record.
+
+        Returns:
+            The new image of the item, or its keys and old image if it was
+            removed, along with the change metadata.
+        """
+        data = change["dynamodb"]
+        removed = change["eventName"] == "REMOVE"
+        image = data.get("OldImage") if removed else data.get("NewImage")
+        record = self._dynamodb_conn.item_to_record(image or data["Keys"])
+        record["_sdc_event_name"] = change["eventName"]
+        record["_sdc_sequence_number"] = data["SequenceNumber"]
+        record["_sdc_deleted_at"] = None
+        if removed and data.get("ApproximateCreationDateTime"):
+            record["_sdc_deleted_at"] = data["ApproximateCreationDateTime"].isoformat()
+        return record
+
+    def _get_change_records(self, context: Context | None) -> Iterable[dict]:
+        """Generate records from the table's DynamoDB stream.
+
+        The first run does a full table scan and then reads the stream from its
+        oldest record, so changes made during the scan are not missed. Later runs
+        only read the stream from the sequence number bookmarked for each shard.
+        Changes are delivered at least once.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            A record for each INSERT, MODIFY and REMOVE event.
+        """
+        state = self.get_context_state(context)
+        stream_arn = self._dynamodb_conn.get_latest_stream_arn(self._table_name)
+        position = state.get("stream_position") or {}
+        if position.get("stream_arn") != stream_arn:
+            if position:
+                self.logger.warning(
+                    "The stream of '%s' changed, starting with a full table scan.",
+                    self.name,
+                )
+            yield from self._get_scan_records(context)
+            position = {"stream_arn": stream_arn, "shards": {}}
+            self._advance_progress(
+                functools.partial(state.__setitem__, "stream_position", position),
+                write=False,
+            )
+
+        shards = self.streams_conn.list_shards(stream_arn)
+        # Drop the bookmarks of shards trimmed from the stream.
+        live_shard_ids = {shard["ShardId"] for shard in shards}
+        positions: dict = {
+            shard_id: shard_position
+            for shard_id, shard_position in position["shards"].items()
+            if shard_id in live_shard_ids
+        }
+        with self._state_lock:
+            position["shards"] = positions
+        for page in self.streams_conn.get_change_pages(
+            stream_arn,
+            positions,
+            shards=shards,
+            max_workers=self._stream_shard_workers,
         ):
-            yield from batch
+            for change in page.records:
+                yield self._change_to_record(change)
+            # Every record of the page has been emitted once we get here.
+            self._pages_emitted += 1
+            shard_position = (
+                {"finished": True}
+                if page.finished
+                else {"sequence_number": page.sequence_number}
+            )
+            self._advance_progress(
+                functools.partial(positions.__setitem__, page.shard_id, shard_position),
+                write=True,
+            )
 
     @property
     def schema(self) -> dict:
@@ -78,13 +1090,14 @@ class TableStream(Stream):
         Returns:
             dict
         """
-        # TODO: SDC columns
         if not self._schema:
             self._schema = self._dynamodb_conn.get_table_json_schema(
                 self._table_name,
                 self._infer_schema_sample_size,
                 self._table_scan_kwargs,
             )
+            if self._sync_mode == SYNC_MODE_STREAMS:
+                self._schema["properties"].update(CHANGE_METADATA_PROPERTIES)
             self._primary_keys = self._dynamodb_conn.get_table_key_properties(
                 self._table_name
             )
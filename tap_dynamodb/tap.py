@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+import click
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk._singerlib import StateMessage
+from singer_sdk.helpers._classproperty import classproperty
+from singer_sdk.helpers.capabilities import TapCapabilities
 
-from tap_dynamodb import streams
-from tap_dynamodb.connectors.aws_boto_connector import AWS_AUTH_CONFIG
-from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+from tap_dynamodb.connectors.aws_config import AWS_AUTH_CONFIG, AWS_CONNECTION_CONFIG
+from tap_dynamodb.retry import DEFAULT_RETRYABLE_ERROR_CODES
 
 if TYPE_CHECKING:
+    from singer_sdk._singerlib import Message
+    from singer_sdk.helpers.capabilities import CapabilitiesEnum
     from singer_sdk.plugin_base import PluginBase
+    from singer_sdk.streams import Stream
+
+    from tap_dynamodb import streams
 
 
 class TapDynamoDB(Tap):
@@ -33,6 +44,78 @@ class TapDynamoDB(Tap):
             description="The amount of records to sample when inferring the schema.",
             default=100,
         ),
+        th.Property(
+            "schema_evolution",
+            th.BooleanType,
+            description=(
+                "Widen the schema during the sync when records have attributes "
+                "or types the sampled schema does not cover, emitting an updated "
+                "SCHEMA message before the first record needing it. Only records "
+                "with a set of top-level attributes not seen before are checked."
+            ),
+            default=False,
+        ),
+        th.Property(
+            "infer_schema_sampling",
+            th.StringType,
+            description=(
+                "How items are sampled to infer the schema. `first` reads the "
+                "first items of the table. `distributed` reads a few items from "
+                "many scan segments concurrently with eventually consistent "
+                "reads, so attributes only found in some partitions are seen."
+            ),
+            default="first",
+            allowed_values=["first", "distributed"],
+        ),
+        th.Property(
+            "infer_schema_sample_segments",
+            th.IntegerType,
+            description=(
+                "The number of scan segments sampled concurrently by the "
+                "`distributed` sampling strategy."
+            ),
+            default=16,
+        ),
+        th.Property(
+            "infer_schema_time_budget",
+            th.NumberType,
+            description=(
+                "The number of seconds after which the `distributed` sampling "
+                "strategy stops and infers the schema from the items sampled so "
+                "far."
+            ),
+            default=10,
+        ),
+        th.Property(
+            "schema_cache_path",
+            th.StringType,
+            description=(
+                "The path of a file caching inferred schemas between runs. A "
+                "table is only sampled again when its ARN, key schema or order of "
+                "magnitude of items changes, or its entry expires."
+            ),
+        ),
+        th.Property(
+            "schema_cache_ttl",
+            th.NumberType,
+            description="The number of seconds a cached schema stays valid.",
+            default=86400,
+        ),
+        th.Property(
+            "schema_cache_max_entries",
+            th.IntegerType,
+            description=(
+                "The maximum number of tables in the schema cache, the oldest "
+                "entries are evicted first."
+            ),
+            default=1000,
+        ),
+        th.Property(
+            "discovery_workers",
+            th.IntegerType,
+            description="The number of tables discovered concurrently.",
+            default=8,
+        ),
         th.Property(
             "table_scan_kwargs",
             th.ObjectType(),
@@ -41,28 +124,447 @@ class TapDynamoDB(Tap):
                 "override the default when querying that table."
             ),
         ),
+        th.Property(
+            "scan_segments",
+            th.IntegerType,
+            description=(
+                "The number of segments to split each table scan into. Segments are "
+                "scanned in parallel when greater than 1. A `TotalSegments` value in "
+                "`table_scan_kwargs` takes precedence for that table."
+            ),
+            default=1,
+        ),
+        th.Property(
+            "scan_workers",
+            th.IntegerType,
+            description=(
+                "The number of worker threads used per table for a parallel scan. "
+                "Defaults to one thread per segment."
+            ),
+        ),
+        th.Property(
+            "scan_max_buffered_pages",
+            th.IntegerType,
+            description=(
+                "The maximum number of scanned pages held in memory while waiting "
+                "to be emitted. Defaults to two pages per worker."
+            ),
+        ),
+        th.Property(
+            "scan_memory_budget",
+            th.IntegerType,
+            description=(
+                "The approximate number of bytes the scanned and queried records "
+                "held in memory may take, shared by all tables synced at once. "
+                "The page `Limit` is adapted to the size of the items read so "
+                "far, with records estimated at 4 times their DynamoDB JSON. It "
+                "is a target, not a hard bound: the first pages read after items "
+                "get wider may exceed it."
+            ),
+        ),
+        th.Property(
+            "scan_prefetch_pages",
+            th.IntegerType,
+            description=(
+                "The number of pages fetched in the background, ahead of the "
+                "records being emitted, when a table is scanned or queried "
+                "without parallelism. Set to 0 to fetch pages on demand."
+            ),
+            default=2,
+        ),
+        th.Property(
+            "page_metrics",
+            th.BooleanType,
+            description=(
+                "Log metrics for every page read from a table: the request and "
+                "deserialization durations, the number of items, bytes, consumed "
+                "read capacity units and retries, and the time spent waiting on "
+                "pages per table. Produces several log lines per page, so it is "
+                "meant for investigating a slow sync."
+            ),
+            default=False,
+        ),
+        th.Property(
+            "native_deserializer",
+            th.BooleanType,
+            description=(
+                "Deserialize items straight into JSON native types. Numbers are "
+                "emitted as JSON numbers instead of strings, sets as arrays and "
+                "binary values as base64 strings."
+            ),
+            default=False,
+        ),
+        th.Property(
+            "max_read_capacity_units",
+            th.NumberType,
+            description=(
+                "The maximum read capacity units per second a table scan may "
+                "consume. The scan backs off automatically when throttled."
+            ),
+        ),
+        th.Property(
+            "read_capacity_percent",
+            th.NumberType,
+            description=(
+                "The percentage of a table's provisioned read capacity a scan may "
+                "consume. Ignored for on-demand tables. When combined with "
+                "`max_read_capacity_units` the lower limit applies."
+            ),
+        ),
+        th.Property(
+            "max_total_read_capacity_units",
+            th.NumberType,
+            description=(
+                "The maximum read capacity units per second consumed across all "
+                "tables synced at once."
+            ),
+        ),
+        th.Property(
+            "plan_scans",
+            th.BooleanType,
+            description=(
+                "Plan the scan of every table without `table_scan_kwargs` from "
+                "its size, item count and billing mode: a segment per 2 GB, "
+                "eventually consistent reads, half the provisioned read capacity "
+                "unless a limit is configured, and a page `Limit` smoothing the "
+                "consumption. Run the tap with `--plan` to print the plans and "
+                "their estimated cost without reading any items."
+            ),
+            default=False,
+        ),
+        th.Property(
+            "table_sync_workers",
+            th.IntegerType,
+            description=(
+                "The number of tables synced at once, the largest tables first."
+            ),
+            default=1,
+        ),
+        th.Property(
+            "retry_base_delay",
+            th.NumberType,
+            description=(
+                "The minimum number of seconds before a failed scan or query page "
+                "is retried. Delays grow with decorrelated jitter. Pages are only "
+                "retried this way, not by botocore. The retries of each table are "
+                "logged by error code at the end of the sync, and as "
+                "`sync_retry_count` metrics."
+            ),
+            default=0.1,
+        ),
+        th.Property(
+            "retry_max_delay",
+            th.NumberType,
+            description="The maximum number of seconds between two retries.",
+            default=20,
+        ),
+        th.Property(
+            "retry_max_elapsed_time",
+            th.NumberType,
+            description=(
+                "The number of seconds after which a failing page is no longer "
+                "retried and the sync fails."
+            ),
+            default=300,
+        ),
+        th.Property(
+            "retryable_error_codes",
+            th.ArrayType(th.StringType),
+            description=(
+                "The AWS error codes for which a page is retried. Connection "
+                "errors are always retried."
+            ),
+            default=list(DEFAULT_RETRYABLE_ERROR_CODES),
+        ),
+        th.Property(
+            "scan_checkpoint_interval",
+            th.IntegerType,
+            description=(
+                "The number of scanned pages after which the position of the scan "
+                "is saved in the state, so an interrupted scan resumes from there. "
+                "Set to 0 to disable checkpoints."
+            ),
+            default=10,
+        ),
+        th.Property(
+            "table_sync_modes",
+            th.ObjectType(),
+            description=(
+                "A mapping of table name to how the table is synced. `scan` (the "
+                "default) scans the whole table on every run. `streams` scans the "
+                "table once and then reads changes from its DynamoDB stream. "
+                "`export` reads a point in time export of the table from S3. "
+                "`query` reads the items changed since the last sync, as set in "
+                "`table_query_configs`."
+            ),
+        ),
+        th.Property(
+            "table_query_configs",
+            th.ObjectType(
+                additional_properties=th.ObjectType(
+                    th.Property(
+                        "index_name",
+                        th.StringType,
+                        description=(
+                            "The index to query, the table itself if not set."
+                        ),
+                    ),
+                    th.Property(
+                        "partition_key",
+                        th.StringType,
+                        required=True,
+                        description="The partition key of the index.",
+                    ),
+                    th.Property(
+                        "partition_values",
+                        th.ArrayType(th.CustomType({"type": ["string", "number"]})),
+                        required=True,
+                        description="The partition key values to query.",
+                    ),
+                    th.Property(
+                        "replication_key",
+                        th.StringType,
+                        required=True,
+                        description="The sort key of the index, used as bookmark.",
+                    ),
+                )
+            ),
+            description=(
+                "A mapping of table name to the index and partitions queried by "
+                "the `query` sync mode. The index must project every attribute "
+                "that should be replicated."
+            ),
+        ),
+        th.Property(
+            "stream_shard_workers",
+            th.IntegerType,
+            description="The number of DynamoDB stream shards read concurrently.",
+            default=4,
+        ),
+        th.Property(
+            "export_s3_bucket",
+            th.StringType,
+            description="The S3 bucket tables in `export` sync mode are exported to.",
+        ),
+        th.Property(
+            "export_s3_prefix",
+            th.StringType,
+            description="The key prefix of the table exports in the S3 bucket.",
+        ),
+        th.Property(
+            "export_arns",
+            th.ObjectType(),
+            description=(
+                "A mapping of table name to the ARN of an existing export to read "
+                "instead of starting a new one."
+            ),
+        ),
+        th.Property(
+            "export_filesystem_url",
+            th.StringType,
+            description=(
+                "A PyFilesystem URL the export files are read from instead of the "
+                "S3 bucket, e.g. a local directory the bucket was copied to. "
+                "Reading from S3 requires the `s3` extra."
+            ),
+        ),
+        th.Property(
+            "export_file_workers",
+            th.IntegerType,
+            description="The number of export data files read concurrently.",
+            default=4,
+        ),
+        th.Property(
+            "export_poll_interval",
+            th.NumberType,
+            description="The number of seconds between export status checks.",
+            default=30,
+        ),
     ).to_dict()
 
+    @classproperty
+    def capabilities(self) -> list[CapabilitiesEnum]:
+        """Get tap capabilities.
+
+        Returns:
+            A list of capabilities supported by this tap.
+        """
+        return [*super().capabilities, TapCapabilities.LOG_BASED]
+
     def discover_streams(self) -> list[streams.TableStream]:
         """Return a list of discovered streams.
 
+        Tables are discovered concurrently, as building a stream samples the
+        table to infer its schema.
+
         Returns:
             A list of discovered streams.
         """
+        # Imported on first use, so `--about` and `--version` skip boto3.
+        from tap_dynamodb import streams
+        from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+
         dynamodb_conn = DynamoDbConnector(
             dict(self.config),  # type: ignore
         )
-        discovered_streams = []
-        for table_name in self.config.get("tables") or dynamodb_conn.list_tables():
-            stream = streams.TableStream(
+        table_names = self.config.get("tables") or dynamodb_conn.list_tables()
+
+        def _discover_table(table_name: str) -> streams.TableStream:
+            return streams.TableStream(
                 tap=self,
                 name=table_name,
                 dynamodb_conn=dynamodb_conn,
                 infer_schema_sample_size=self.config.get("infer_schema_sample_size"),
             )
-            discovered_streams.append(stream)
 
-        return discovered_streams
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.config.get("discovery_workers", 8)),
+            thread_name_prefix="discover",
+        ) as executor:
+            return list(executor.map(_discover_table, table_names))
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the tap.
+
+        Args:
+            kwargs: The arguments of the SDK tap.
+        """
+        # Guards stdout and the state, which are shared by every stream synced
+        # at once. Streams hold it while updating the state, including when they
+        # write a state message. Created first, as the streams take it when the
+        # tap discovers them.
+        self.state_lock = threading.RLock()
+        super().__init__(**kwargs)
+
+    def write_message(self, message: Message) -> None:
+        """Write a message to stdout.
+
+        Messages of streams synced at once are written one at a time, under the
+        lock the streams update the state with, so a line is never interleaved
+        with another or built from a state another stream is updating.
+
+        Args:
+            message: The message to write.
+        """
+        with self.state_lock:
+            super().write_message(message)
+
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams.
+
+        With `table_sync_workers` greater than 1, several tables are synced at
+        once. The largest tables are started first, so the sync is not held up
+        by a large table started last.
+        """
+        workers = self.config.get("table_sync_workers", 1)
+        if workers <= 1:
+            super().sync_all()
+            return
+
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        self.write_message(StateMessage(value=self.state))
+
+        selected = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+                continue
+            selected.append(stream)
+        selected.sort(
+            key=lambda stream: getattr(stream, "table_size", (0, 0)), reverse=True
+        )
+
+        def _sync_stream(stream: Stream) -> None:
+            stream.sync()
+            stream.finalize_state_progress_markers()
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sync"
+        ) as executor:
+            futures = [executor.submit(_sync_stream, stream) for stream in selected]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def get_scan_plans(self) -> dict:
+        """Plan the scan of every configured table without reading any items.
+
+        Returns:
+            The plan of each table and the estimated totals.
+        """
+        from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+
+        dynamodb_conn = DynamoDbConnector(
+            dict(self.config),  # type: ignore
+        )
+        table_names = self.config.get("tables") or dynamodb_conn.list_tables()
+        plans = [dynamodb_conn.plan_scan(table_name) for table_name in table_names]
+        return {
+            "tables": [plan.to_dict() for plan in plans],
+            "estimated_read_capacity_units": sum(
+                plan.estimated_read_capacity_units for plan in plans
+            ),
+            "estimated_sequential_seconds": sum(
+                plan.estimated_seconds for plan in plans
+            ),
+        }
+
+    @classmethod
+    def cb_plan(
+        cls,
+        ctx: click.Context,
+        param: click.Option,
+        value: bool,
+    ) -> None:
+        """CLI callback printing the scan plans as JSON.
+
+        Args:
+            ctx: Click context.
+            param: Click option.
+            value: Whether to print the scan plans.
+        """
+        if not value:
+            return
+
+        config_args = ctx.params.get("config", ())
+        config_files, parse_env_config = cls.config_from_cli_args(*config_args)
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            parse_env_config=parse_env_config,
+            setup_mapper=False,
+        )
+        click.echo(json.dumps(tap.get_scan_plans(), indent=2))
+        ctx.exit()
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Execute standard CLI handler for taps.
+
+        Returns:
+            A click.Command object.
+        """
+        command = super().get_singer_command()
+        command.params.append(
+            click.Option(
+                ["--plan"],
+                is_flag=True,
+                help=(
+                    "Print the scan plan and estimated cost of each table "
+                    "without reading any items."
+                ),
+                callback=cls.cb_plan,
+                expose_value=False,
+            ),
+        )
+        return command
 
     @classmethod
     def append_builtin_config(cls: type[PluginBase], config_jsonschema: dict) -> None:
@@ -75,6 +577,7 @@ class TapDynamoDB(Tap):
                     target_jsonschema["properties"][k] = v
 
         _merge_missing(AWS_AUTH_CONFIG, config_jsonschema)
+        _merge_missing(AWS_CONNECTION_CONFIG, config_jsonschema)
         super().append_builtin_config(config_jsonschema)  # type: ignore
 
 
@@ -1,5 +1,8 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
+from botocore.credentials import RefreshableCredentials
 from moto import mock_aws
 
 from tap_dynamodb.connectors.aws_boto_connector import AWSBotoConnector
@@ -124,3 +127,83 @@ def test_get_resource():
     )
     session = auth.get_session()
     auth.get_resource(session, "dynamodb")
+
+
+@mock_aws
+def test_get_session_assume_role_refresh():
+    config = {
+        "aws_access_key_id": "foo",
+        "aws_secret_access_key": "bar",
+        "aws_default_region": "us-west-2",
+        "aws_assume_role_arn": "arn:aws:iam::123456778910:role/refresh-role",
+    }
+    auth = AWSBotoConnector(config, "dynamodb")
+    credentials = auth.session.get_credentials()
+    assert isinstance(credentials, RefreshableCredentials)
+    assert credentials.method == "custom-tap-dynamodb-assume-role"
+    first_key = credentials.get_frozen_credentials().access_key
+    # Every thread using the connector shares its credentials.
+    assert auth.session.get_credentials() is credentials
+
+    # The credentials of a connector are not shared with other connectors.
+    other_session = AWSBotoConnector(config, "dynamodbstreams").get_session()
+    assert other_session.get_credentials() is not credentials
+
+    # The credentials are renewed once they are about to expire.
+    credentials._expiry_time = datetime.datetime.now(
+        datetime.timezone.utc
+    ) + datetime.timedelta(minutes=5)
+    assert credentials.get_frozen_credentials().access_key != first_key
+    assert credentials._expiry_time > datetime.datetime.now(
+        datetime.timezone.utc
+    ) + datetime.timedelta(minutes=30)
+
+
+@mock_aws
+def test_get_client_config():
+    auth = AWSBotoConnector(
+        {
+            "aws_access_key_id": "foo",
+            "aws_secret_access_key": "bar",
+            "aws_default_region": "us-west-2",
+            "aws_max_pool_connections": 32,
+            "aws_connect_timeout": 5,
+            "aws_read_timeout": 30,
+            "aws_tcp_keepalive": True,
+            "aws_retry_mode": "adaptive",
+        },
+        "dynamodb",
+    )
+    client_config = auth.client.meta.config
+    assert client_config.max_pool_connections == 32
+    assert client_config.connect_timeout == 5
+    assert client_config.read_timeout == 30
+    assert client_config.tcp_keepalive is True
+    assert client_config.retries["mode"] == "adaptive"
+
+    default_config = AWSBotoConnector(
+        {"aws_default_region": "us-west-2"}, "dynamodb"
+    ).get_client_config()
+    assert default_config.max_pool_connections == 10
+    assert default_config.retries == {"mode": "legacy"}
+
+
+@mock_aws
+def test_client_shared_across_threads():
+    auth = AWSBotoConnector(
+        {
+            "aws_access_key_id": "foo",
+            "aws_secret_access_key": "bar",
+            "aws_default_region": "us-west-2",
+        },
+        "dynamodb",
+    )
+    with patch.object(
+        AWSBotoConnector, "get_session", wraps=auth.get_session
+    ) as get_session:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: auth.client, range(32)))
+            resources = list(executor.map(lambda _: auth.resource, range(32)))
+    assert all(client is clients[0] for client in clients)
+    assert all(resource is resources[0] for resource in resources)
+    assert get_session.call_count == 1
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from tap_dynamodb.concurrency import ConcurrentPartitions
+
+
+def test_partitions_consumed_in_order():
+    partitions = ConcurrentPartitions(
+        {
+            key: (lambda key=key: iter(range(key * 10, key * 10 + 5)))
+            for key in range(4)
+        },
+        max_workers=2,
+        max_buffered_items=1,
+    )
+    try:
+        items = {key: list(partitions.iter_partition(key)) for key in range(4)}
+    finally:
+        partitions.close()
+    assert items == {key: list(range(key * 10, key * 10 + 5)) for key in range(4)}
+
+
+def test_partitions_bounded_buffer():
+    produced = {key: 0 for key in range(3)}
+    lock = threading.Lock()
+
+    def _producer(key):
+        for item in range(20):
+            with lock:
+                produced[key] += 1
+            yield item
+
+    partitions = ConcurrentPartitions(
+        {key: (lambda key=key: _producer(key)) for key in range(3)},
+        max_workers=3,
+        max_buffered_items=2,
+    )
+    try:
+        items = partitions.iter_partition(0)
+        assert list(items) == list(range(20))
+        # The partitions ahead hold at most two items, plus the one each worker
+        # is waiting to hand over.
+        with lock:
+            assert produced[1] + produced[2] <= 2 + 2
+    finally:
+        partitions.close()
+
+
+def test_partitions_error():
+    def _fail():
+        yield 1
+        raise ValueError("boom")
+
+    partitions = ConcurrentPartitions(
+        {0: lambda: iter([0]), 1: _fail}, max_workers=2, max_buffered_items=1
+    )
+    try:
+        assert list(partitions.iter_partition(0)) == [0]
+        items = partitions.iter_partition(1)
+        assert next(items) == 1
+        with pytest.raises(ValueError, match="boom"):
+            next(items)
+    finally:
+        partitions.close()
+
+
+def test_partitions_close_stops_workers():
+    partitions = ConcurrentPartitions(
+        {key: (lambda: iter(range(1000))) for key in range(4)},
+        max_workers=4,
+        max_buffered_items=1,
+    )
+    assert next(partitions.iter_partition(0)) == 0
+    # Workers blocked on a full buffer stop instead of hanging.
+    partitions.close()
+
+
+def test_partitions_without_workers():
+    threads = []
+
+    def _producer():
+        for item in range(3):
+            threads.append(threading.current_thread())
+            yield item
+
+    partitions = ConcurrentPartitions(
+        {0: _producer}, max_workers=0, max_buffered_items=1
+    )
+    assert list(partitions.iter_partition(0)) == [0, 1, 2]
+    assert threads == [threading.current_thread()] * 3
+    partitions.close()
@@ -0,0 +1,63 @@
+import base64
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from tap_dynamodb.deserializer import deserialize_item, deserialize_value
+from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+from tests.test_dynamodb_connector import SAMPLE_CONFIG, create_table
+
+
+def test_deserialize_item():
+    item = {
+        "str": {"S": "foo"},
+        "int": {"N": "2023"},
+        "float": {"N": "1.5"},
+        "exp": {"N": "1E+2"},
+        "bool": {"BOOL": True},
+        "null": {"NULL": True},
+        "bin": {"B": b"bar"},
+        "str_set": {"SS": ["a", "b"]},
+        "num_set": {"NS": ["1", "2.5"]},
+        "bin_set": {"BS": [b"a"]},
+        "list": {"L": [{"S": "a"}, {"N": "1"}]},
+        "map": {"M": {"nested": {"M": {"n": {"N": "-3"}}}}},
+    }
+    assert deserialize_item(item) == {
+        "str": "foo",
+        "int": 2023,
+        "float": 1.5,
+        "exp": 100.0,
+        "bool": True,
+        "null": None,
+        "bin": base64.b64encode(b"bar").decode(),
+        "str_set": ["a", "b"],
+        "num_set": [1, 2.5],
+        "bin_set": [base64.b64encode(b"a").decode()],
+        "list": ["a", 1],
+        "map": {"nested": {"n": -3}},
+    }
+
+
+def test_deserialize_value_unknown_type():
+    with pytest.raises(TypeError):
+        deserialize_value({"X": "foo"})
+
+
+@mock_aws
+def test_get_items_native_deserializer():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    table.put_item(Item={"year": 2023, "title": "foo", "info": {"plot": "bar"}})
+    # END PREP
+
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "native_deserializer": True})
+    records = list(db_obj.get_items_iter("table", {}))[0]
+    assert records == [{"year": 2023, "title": "foo", "info": {"plot": "bar"}}]
+
+
+def test_deserialize_item_numbers_as_strings():
+    item = {"int": {"N": "2023"}, "num_set": {"NS": ["2", "1.5"]}}
+    assert deserialize_item(item, str) == {"int": "2023", "num_set": ["1.5", "2"]}
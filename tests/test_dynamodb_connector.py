@@ -1,7 +1,17 @@
+import json
+import logging
+import threading
+import time
+from unittest.mock import patch
+
 import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
 from moto import mock_aws
 
-from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+from tap_dynamodb.dynamodb_connector import DynamoDbConnector, projection_scan_kwargs
+from tap_dynamodb.page_sizer import RECORD_MEMORY_FACTOR, PageSizer
 
 SAMPLE_CONFIG = {
     "aws_access_key_id": "foo",
@@ -186,12 +196,10 @@ def test_get_table_key_properties():
     assert ["year", "title"] == db_obj.get_table_key_properties("table")
 
 
-def test_coerce_types():
-    import decimal
-
+def test_item_to_record():
     db_obj = DynamoDbConnector(SAMPLE_CONFIG)
-    coerced = db_obj._coerce_types({"foo": decimal.Decimal("1.23")})
-    assert coerced == {"foo": "1.23"}
+    record = db_obj.item_to_record({"foo": {"N": "1.23"}, "bar": {"SS": ["a"]}})
+    assert record == {"foo": "1.23", "bar": ["a"]}
 
 
 @mock_aws
@@ -208,3 +216,528 @@ def test_get_sample_records():
     db_obj = DynamoDbConnector(SAMPLE_CONFIG)
     records = db_obj._get_sample_records("table", 2, {})
     assert len(records) == 2
+
+
+@mock_aws
+def test_get_sample_records_distributed():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(40):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector(
+        {
+            **SAMPLE_CONFIG,
+            "infer_schema_sampling": "distributed",
+            "infer_schema_sample_segments": 4,
+        }
+    )
+    with patch.object(
+        db_obj.scan_client, "scan", wraps=db_obj.scan_client.scan
+    ) as scan:
+        records = db_obj._get_sample_records("table", 8, {})
+    assert len(records) == 8
+    assert {call.kwargs["Segment"] for call in scan.call_args_list} == {0, 1, 2, 3}
+    assert all(
+        call.kwargs["ConsistentRead"] is False and call.kwargs["Limit"] == 2
+        for call in scan.call_args_list
+    )
+
+
+@mock_aws
+def test_get_items_parallel():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(20):
+        table.put_item(
+            Item={"year": 2000 + num, "title": f"foo_{num}", "info": {"plot": "bar"}}
+        )
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    pages = list(
+        db_obj.scan_pages(
+            "table", {"TotalSegments": 4, "Limit": 2}, max_buffered_pages=1
+        )
+    )
+    records = [record for page in pages for record in page.items]
+    assert len(records) == 20
+    assert {page.segment for page in pages} <= {0, 1, 2, 3}
+    assert sorted(record["title"] for record in records) == sorted(
+        f"foo_{num}" for num in range(20)
+    )
+
+
+@mock_aws
+def test_get_items_parallel_early_close():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(20):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    items_iter = db_obj.get_items_iter(
+        "table", {"TotalSegments": 4, "Limit": 1}, max_buffered_pages=1
+    )
+    assert len(next(items_iter)) == 1
+    # Closing the generator stops the workers instead of hanging.
+    items_iter.close()
+
+
+@mock_aws
+def test_get_items_prefetch():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(10):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    with patch.object(
+        db_obj.scan_client, "scan", wraps=db_obj.scan_client.scan
+    ) as scan:
+        pages = db_obj.scan_pages("table", {"Limit": 1}, prefetch_pages=2)
+        assert len(next(pages).items) == 1
+        time.sleep(0.5)
+        # The consumed page, two buffered pages and one waiting to be buffered.
+        assert scan.call_count == 4
+        pages.close()
+    assert [
+        len(page.items)
+        for page in db_obj.scan_pages("table", {"Limit": 3}, prefetch_pages=2)
+    ] == [3, 3, 3, 1]
+
+
+@mock_aws
+def test_get_items_prefetch_error():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(10):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    error = ClientError(
+        {"Error": {"Code": "ValidationException", "Message": "boom"}}, "Scan"
+    )
+    with patch.object(
+        db_obj.scan_client,
+        "scan",
+        side_effect=[db_obj.scan_client.scan(TableName="table", Limit=1), error],
+    ):
+        pages = db_obj.scan_pages("table", {"Limit": 1}, prefetch_pages=2)
+        assert len(next(pages).items) == 1
+        with pytest.raises(ClientError):
+            next(pages)
+
+
+@mock_aws
+def test_scan_partitions_prefetch():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(10):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    threads = []
+    scan = db_obj.scan_client.scan
+
+    def _scan(**kwargs):
+        threads.append(threading.current_thread())
+        return scan(**kwargs)
+
+    with patch.object(db_obj.scan_client, "scan", side_effect=_scan):
+        partitions = db_obj.scan_partitions("table", {"Limit": 1}, prefetch_pages=2)
+        assert len(next(partitions.iter_partition(0)).items) == 1
+        time.sleep(0.5)
+        # The consumed page, two buffered pages and one waiting to be buffered.
+        assert len(threads) == 4
+        partitions.close()
+
+        threads.clear()
+        partitions = db_obj.scan_partitions("table", {"Limit": 1}, prefetch_pages=0)
+        pages = partitions.iter_partition(0)
+        assert len(next(pages).items) == 1
+        time.sleep(0.5)
+        # Pages are read on demand, by the consumer.
+        assert threads == [threading.current_thread()]
+        assert sum(len(page.items) for page in pages) == 9
+        partitions.close()
+
+
+@mock_aws
+def test_get_read_capacity_limiter():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    create_table(moto_conn, "table")
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    assert db_obj.get_read_capacity_limiter("table") is None
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "read_capacity_percent": 50})
+    assert db_obj.get_read_capacity_limiter("table").target_rate == 5
+    db_obj = DynamoDbConnector(
+        {**SAMPLE_CONFIG, "read_capacity_percent": 50, "max_read_capacity_units": 2}
+    )
+    assert db_obj.get_read_capacity_limiter("table").target_rate == 2
+
+
+@mock_aws
+def test_get_items_throttled():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    table.put_item(Item={"year": 2023, "title": "foo"})
+    # END PREP
+
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "max_read_capacity_units": 1000})
+    response = db_obj.client.scan(TableName="table")
+    throttled = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": ""}},
+        "Scan",
+    )
+    with (
+        patch.object(
+            db_obj.scan_client, "scan", side_effect=[throttled, response]
+        ) as scan,
+        patch("tap_dynamodb.rate_limiter.time.sleep"),
+    ):
+        records = list(db_obj.get_items_iter("table", {}))[0]
+    assert len(records) == 1
+    assert scan.call_count == 2
+
+
+class _RawBody:
+    def __init__(self, body):
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+def _http_response(request, status_code, body, error_type=None):
+    headers = {"content-type": "application/x-amz-json-1.0"}
+    if error_type:
+        headers["x-amzn-ErrorType"] = error_type
+    return AWSResponse(
+        request.url, status_code, headers, _RawBody(json.dumps(body).encode())
+    )
+
+
+def test_get_items_throttle_reaches_rate_limiter():
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "max_read_capacity_units": 1000})
+    db_obj._table_descriptions["table"] = {"TableName": "table"}
+    requests = []
+
+    def _send(request, **kwargs):
+        requests.append(request)
+        if len(requests) == 1:
+            return _http_response(
+                request,
+                400,
+                {"__type": "ProvisionedThroughputExceededException", "message": ""},
+                "ProvisionedThroughputExceededException",
+            )
+        return _http_response(
+            request, 200, {"Items": [], "Count": 0, "ScannedCount": 0}
+        )
+
+    db_obj.scan_client.meta.events.register("before-send.dynamodb.Scan", _send)
+    limiter = db_obj.get_read_capacity_limiter("table")
+    with (
+        patch.object(limiter, "on_throttle", wraps=limiter.on_throttle) as throttle,
+        patch("tap_dynamodb.retry.time.sleep"),
+        patch("tap_dynamodb.rate_limiter.time.sleep"),
+    ):
+        db_obj._scan_page("table", {}, limiter)
+    # botocore does not retry the throttled request, the retry policy does after
+    # lowering the rate.
+    assert len(requests) == 2
+    assert throttle.call_count == 1
+    assert db_obj.retry_policy.retry_counts == {
+        "ProvisionedThroughputExceededException": 1
+    }
+    assert db_obj.client.meta.config.retries == {"mode": "legacy"}
+
+
+def test_get_items_retry_elapsed_time():
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "retry_max_elapsed_time": 0})
+    requests = []
+
+    def _send(request, **kwargs):
+        requests.append(request)
+        return _http_response(
+            request,
+            500,
+            {"__type": "InternalServerError", "message": ""},
+            "InternalServerError",
+        )
+
+    db_obj.scan_client.meta.events.register("before-send.dynamodb.Scan", _send)
+    with pytest.raises(ClientError):
+        db_obj._scan_page("table", {}, None)
+    # The retry policy is the only retry layer, so its budget bounds the attempts.
+    assert len(requests) == 1
+
+
+@mock_aws
+def test_get_items_retry_same_page():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(3):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    scan = db_obj.scan_client.scan
+    calls = []
+
+    def _scan(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise ClientError(
+                {"Error": {"Code": "RequestLimitExceeded", "Message": ""}}, "Scan"
+            )
+        return scan(**kwargs)
+
+    with (
+        patch.object(db_obj.scan_client, "scan", side_effect=_scan),
+        patch("tap_dynamodb.retry.time.sleep"),
+    ):
+        records = [
+            item
+            for items in db_obj.get_items_iter("table", {"Limit": 1})
+            for item in items
+        ]
+    assert len(records) == 3
+    assert calls[2] == calls[1]
+    assert "ExclusiveStartKey" in calls[1]
+    assert db_obj.retry_policy.retry_counts == {"RequestLimitExceeded": 1}
+
+
+@mock_aws
+def test_get_items_page_metrics(caplog):
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(3):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}"})
+    # END PREP
+
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "page_metrics": True})
+    scan = db_obj.scan_client.scan
+    calls = []
+
+    def _scan(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": ""}}, "Scan"
+            )
+        return scan(**kwargs)
+
+    with (
+        caplog.at_level(logging.INFO, logger="singer_sdk.metrics"),
+        patch.object(db_obj.scan_client, "scan", side_effect=_scan),
+        patch("tap_dynamodb.retry.time.sleep"),
+    ):
+        list(db_obj.get_items_iter("table", {"Limit": 2}, prefetch_pages=0))
+    points = [
+        json.loads(record.getMessage().removeprefix("METRIC: "))
+        for record in caplog.records
+        if record.name == "singer_sdk.metrics"
+    ]
+    page_points = {
+        point["metric"]: point for point in points if "segment" in point["tags"]
+    }
+    assert [
+        point["value"] for point in points if point["metric"] == "page_item_count"
+    ] == [2, 1]
+    assert [
+        point["value"] for point in points if point["metric"] == "page_retry_count"
+    ] == [1, 0]
+    assert page_points["page_byte_count"]["value"] > 0
+    assert page_points["page_request_duration"]["type"] == "timer"
+    assert page_points["page_item_count"]["tags"] == {
+        "table": "table",
+        "operation": "scan",
+        "segment": 0,
+    }
+    assert [point["metric"] for point in points][-1] == "page_wait_duration"
+
+    # Page metrics are disabled by default.
+    caplog.clear()
+    db_obj = DynamoDbConnector(SAMPLE_CONFIG)
+    with caplog.at_level(logging.INFO, logger="singer_sdk.metrics"):
+        list(db_obj.get_items_iter("table", {}))
+    assert not caplog.records
+
+
+def test_projection_scan_kwargs():
+    assert projection_scan_kwargs([("year",), ("info", "plot"), ("info", "year")]) == {
+        "ProjectionExpression": "#proj0, #proj1.#proj2, #proj1.#proj0",
+        "ExpressionAttributeNames": {
+            "#proj0": "year",
+            "#proj1": "info",
+            "#proj2": "plot",
+        },
+    }
+
+
+def test_default_max_pool_connections():
+    assert DynamoDbConnector({}).default_scan_max_pool_connections == 10
+    # The client listing and describing tables makes one request per table
+    # discovered or synced at once.
+    assert DynamoDbConnector({}).default_max_pool_connections == 10
+    assert (
+        DynamoDbConnector(
+            {"scan_segments": 8, "table_sync_workers": 16}
+        ).default_max_pool_connections
+        == 16
+    )
+    assert (
+        DynamoDbConnector({"discovery_workers": 24}).default_max_pool_connections == 24
+    )
+    assert (
+        DynamoDbConnector(
+            {"scan_segments": 8, "table_sync_workers": 4}
+        ).default_scan_max_pool_connections
+        == 32
+    )
+    assert (
+        DynamoDbConnector(
+            {
+                "discovery_workers": 4,
+                "infer_schema_sampling": "distributed",
+                "infer_schema_sample_segments": 16,
+            }
+        ).default_scan_max_pool_connections
+        == 64
+    )
+    # Per table segments, planned scans and queried partitions are accounted for.
+    assert (
+        DynamoDbConnector(
+            {"table_scan_kwargs": {"t": {"TotalSegments": 32}}}
+        ).default_scan_max_pool_connections
+        == 32
+    )
+    assert (
+        DynamoDbConnector(
+            {"plan_scans": True, "table_scan_kwargs": {"t": {"TotalSegments": 32}}}
+        ).default_scan_max_pool_connections
+        == 64
+    )
+    assert (
+        DynamoDbConnector(
+            {
+                "table_sync_workers": 2,
+                "table_query_configs": {"t": {"partition_values": list("abcdefgh")}},
+            }
+        ).default_scan_max_pool_connections
+        == 16
+    )
+    assert (
+        DynamoDbConnector(
+            {"plan_scans": True, "scan_workers": 4, "table_sync_workers": 4}
+        ).default_scan_max_pool_connections
+        == 16
+    )
+    db_obj = DynamoDbConnector(
+        {**SAMPLE_CONFIG, "scan_segments": 32, "table_sync_workers": 2}
+    )
+    assert db_obj.client.meta.config.max_pool_connections == 10
+    assert db_obj.scan_client.meta.config.max_pool_connections == 64
+    db_obj = DynamoDbConnector(
+        {**SAMPLE_CONFIG, "scan_segments": 8, "aws_max_pool_connections": 4}
+    )
+    assert db_obj.client.meta.config.max_pool_connections == 4
+    assert db_obj.scan_client.meta.config.max_pool_connections == 4
+
+
+@mock_aws
+def test_get_items_memory_budget():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(30):
+        table.put_item(Item={"year": 2000 + num, "title": f"foo_{num}", "x" * 2000: 1})
+    # END PREP
+
+    # About 2 KB of DynamoDB JSON per item, two of which fit the budget.
+    budget = 20_000
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "scan_memory_budget": budget})
+    with patch.object(
+        db_obj.scan_client, "scan", wraps=db_obj.scan_client.scan
+    ) as scan:
+        pages = list(db_obj.scan_pages("table", {"Limit": 5}, prefetch_pages=0))
+    limits = [call.kwargs["Limit"] for call in scan.call_args_list]
+    # Without table statistics the first page holds a single item, after which
+    # the pages fit the budget, never exceeding the configured Limit.
+    assert limits[0] == 1
+    assert set(limits[1:]) == {2}
+    assert sum(len(page.items) for page in pages) == 30
+
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "scan_memory_budget": 10**9})
+    with patch.object(
+        db_obj.scan_client, "scan", wraps=db_obj.scan_client.scan
+    ) as scan:
+        list(db_obj.scan_pages("table", {"Limit": 5}, prefetch_pages=0))
+    assert {call.kwargs["Limit"] for call in scan.call_args_list[1:]} == {5}
+
+
+@mock_aws
+def test_get_items_memory_budget_wider_items():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(120):
+        table.put_item(
+            Item={
+                "year": 2000 + num,
+                "title": f"foo_{num}",
+                "data": "x" * (100 if num < 60 else 2000),
+            }
+        )
+    # END PREP
+
+    budget = 40_000
+    db_obj = DynamoDbConnector({**SAMPLE_CONFIG, "scan_memory_budget": budget})
+    page_bytes = []
+    observe = PageSizer.observe
+
+    def _observe(sizer, item_count, byte_count):
+        page_bytes.append(byte_count)
+        observe(sizer, item_count, byte_count)
+
+    with (
+        patch.object(PageSizer, "observe", autospec=True, side_effect=_observe),
+        patch.object(db_obj.scan_client, "scan", wraps=db_obj.scan_client.scan) as scan,
+    ):
+        pages = list(db_obj.scan_pages("table", {}, prefetch_pages=0))
+    limits = [call.kwargs["Limit"] for call in scan.call_args_list]
+    assert sum(len(page.items) for page in pages) == 120
+    first_wide = next(
+        index
+        for index, page in enumerate(pages)
+        if any(len(item["data"]) > 100 for item in page.items)
+    )
+    # The Limit drops once wider items show up.
+    assert max(limits[first_wide + 1 :]) < limits[first_wide]
+    # The page the wider items show up on and the next one, sized from an
+    # estimate still covering narrower items, may exceed the budget. The pages
+    # read after them fit it.
+    assert page_bytes[first_wide] * RECORD_MEMORY_FACTOR > budget
+    assert all(
+        byte_count * RECORD_MEMORY_FACTOR <= budget
+        for byte_count in page_bytes[first_wide + 2 :]
+    )
@@ -0,0 +1,141 @@
+import datetime
+from unittest.mock import MagicMock, patch
+
+from tap_dynamodb.dynamodb_streams_connector import (
+    MAX_EMPTY_PAGES,
+    DynamoDbStreamsConnector,
+)
+from tests.test_dynamodb_connector import SAMPLE_CONFIG
+
+SYNC_STARTED_AT = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def change(sequence_number, created_at=None):
+    return {
+        "eventName": "INSERT",
+        "dynamodb": {
+            "SequenceNumber": sequence_number,
+            "ApproximateCreationDateTime": created_at
+            or SYNC_STARTED_AT - datetime.timedelta(minutes=1),
+        },
+    }
+
+
+def test_get_change_pages_reads_parents_first():
+    client = MagicMock()
+    client.describe_stream.return_value = {
+        "StreamDescription": {
+            "Shards": [
+                {
+                    "ShardId": "child",
+                    "ParentShardId": "parent",
+                    "SequenceNumberRange": {"StartingSequenceNumber": "3"},
+                },
+                {
+                    "ShardId": "parent",
+                    "SequenceNumberRange": {
+                        "StartingSequenceNumber": "1",
+                        "EndingSequenceNumber": "2",
+                    },
+                },
+            ]
+        }
+    }
+    client.get_shard_iterator.side_effect = lambda **kwargs: {
+        "ShardIterator": kwargs["ShardId"]
+    }
+    responses = {
+        "parent": [
+            {"Records": [change("1"), change("2")], "NextShardIterator": "parent"},
+            {"Records": []},
+        ],
+        "child": [
+            {"Records": [change("3")], "NextShardIterator": "child"},
+        ],
+    }
+    client.get_records.side_effect = lambda ShardIterator: (
+        responses[ShardIterator].pop(0)
+        if responses[ShardIterator]
+        else {"Records": [], "NextShardIterator": ShardIterator}
+    )
+
+    conn = DynamoDbStreamsConnector(SAMPLE_CONFIG)
+    with (
+        patch.object(DynamoDbStreamsConnector, "client", client),
+        patch("tap_dynamodb.dynamodb_streams_connector.time.sleep"),
+    ):
+        pages = list(conn.get_change_pages("arn", {}, read_until=SYNC_STARTED_AT))
+    assert [(page.shard_id, page.sequence_number, page.finished) for page in pages] == [
+        ("parent", "2", False),
+        ("parent", "2", True),
+        ("child", "3", False),
+    ]
+    client.get_shard_iterator.assert_any_call(
+        StreamArn="arn", ShardId="child", ShardIteratorType="TRIM_HORIZON"
+    )
+
+
+def test_get_change_pages_resumes_after_sequence_number():
+    client = MagicMock()
+    client.describe_stream.return_value = {
+        "StreamDescription": {
+            "Shards": [
+                {
+                    "ShardId": "done",
+                    "SequenceNumberRange": {"EndingSequenceNumber": "1"},
+                },
+                {"ShardId": "open", "SequenceNumberRange": {}},
+            ]
+        }
+    }
+    client.get_shard_iterator.return_value = {"ShardIterator": "it"}
+    client.get_records.return_value = {"Records": [], "NextShardIterator": "it"}
+
+    conn = DynamoDbStreamsConnector(SAMPLE_CONFIG)
+    with (
+        patch.object(DynamoDbStreamsConnector, "client", client),
+        patch("tap_dynamodb.dynamodb_streams_connector.time.sleep"),
+    ):
+        pages = list(
+            conn.get_change_pages(
+                "arn", {"done": {"finished": True}, "open": {"sequence_number": "5"}}
+            )
+        )
+    assert pages == []
+    # An open shard without new records is caught up after enough empty pages.
+    assert client.get_records.call_count == MAX_EMPTY_PAGES
+    client.get_shard_iterator.assert_called_once_with(
+        StreamArn="arn",
+        ShardId="open",
+        ShardIteratorType="AFTER_SEQUENCE_NUMBER",
+        SequenceNumber="5",
+    )
+
+
+def test_get_change_pages_reads_past_empty_pages():
+    client = MagicMock()
+    client.describe_stream.return_value = {
+        "StreamDescription": {"Shards": [{"ShardId": "open"}]}
+    }
+    client.get_shard_iterator.return_value = {"ShardIterator": "it"}
+    after_start = SYNC_STARTED_AT + datetime.timedelta(seconds=1)
+    responses = [
+        {"Records": [], "NextShardIterator": "it"},
+        {"Records": [], "NextShardIterator": "it"},
+        {"Records": [change("1")], "NextShardIterator": "it"},
+        {"Records": [], "NextShardIterator": "it"},
+        {"Records": [change("2"), change("3", after_start)], "NextShardIterator": "it"},
+        {"Records": [change("4", after_start)], "NextShardIterator": "it"},
+    ]
+    client.get_records.side_effect = lambda ShardIterator: responses.pop(0)
+
+    conn = DynamoDbStreamsConnector(SAMPLE_CONFIG)
+    with (
+        patch.object(DynamoDbStreamsConnector, "client", client),
+        patch("tap_dynamodb.dynamodb_streams_connector.time.sleep"),
+    ):
+        pages = list(conn.get_change_pages("arn", {}, read_until=SYNC_STARTED_AT))
+    # The shard is read past its empty pages, up to the first record written
+    # after the sync started.
+    assert [page.sequence_number for page in pages] == ["1", "3"]
+    assert client.get_records.call_count == 5
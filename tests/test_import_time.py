@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("boto3", "botocore", "genson", "mypy_boto3_dynamodb")
+# The tap's own import time on top of the Singer SDK, in seconds. Importing
+# boto3 alone takes about twice as long.
+TAP_IMPORT_BUDGET = 0.1
+
+
+def _importtime(*args):
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-c", "import tap_dynamodb.tap"],
+        ["-m", "tap_dynamodb", "--about"],
+        ["-m", "tap_dynamodb", "--version"],
+    ],
+)
+def test_heavy_modules_not_imported(args):
+    modules = _importtime(*args)
+    assert "tap_dynamodb.tap" in modules
+    heavy = [module for module in modules if module.split(".")[0] in HEAVY_MODULES]
+    assert heavy == []
+
+
+def test_import_time_budget():
+    # Keep the best of a few runs, so a busy machine does not fail the test.
+    best = min(
+        _importtime("-c", "import singer_sdk, click; import tap_dynamodb.tap")[
+            "tap_dynamodb.tap"
+        ]
+        for _ in range(3)
+    )
+    assert best < TAP_IMPORT_BUDGET
@@ -0,0 +1,40 @@
+import pytest
+
+from tap_dynamodb.page_sizer import RECORD_MEMORY_FACTOR, PageSizer
+
+
+def test_limit_without_estimate():
+    assert PageSizer(1_000_000).limit == 1
+
+
+def test_limit_from_initial_item_bytes():
+    sizer = PageSizer(1_000_000, pages_in_memory=5, item_bytes=1000)
+    assert sizer.limit == 200_000 // (1000 * RECORD_MEMORY_FACTOR)
+
+
+def test_limit_adapts_to_observed_items():
+    sizer = PageSizer(400_000, item_bytes=100)
+    sizer.observe(10, 10_000)
+    assert sizer.item_bytes == 1000
+    assert sizer.limit == 100
+    # Wider items lower the limit at once.
+    sizer.observe(1, 10_000)
+    assert sizer.item_bytes == 10_000
+    assert sizer.limit == 10
+    # Narrower items only raise it as the average comes down.
+    sizer.observe(100, 10_000)
+    assert sizer.item_bytes == 30_000 / 111
+    # Empty pages carry no information about the item size.
+    sizer.observe(0, 200)
+    assert sizer.item_bytes == 30_000 / 111
+
+
+def test_limit_at_least_one():
+    sizer = PageSizer(1000)
+    sizer.observe(1, 1_000_000)
+    assert sizer.limit == 1
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        PageSizer(0)
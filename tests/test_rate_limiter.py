@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+
+from tap_dynamodb.rate_limiter import ReadCapacityLimiter
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        ReadCapacityLimiter(0)
+
+
+@patch("tap_dynamodb.rate_limiter.time.sleep")
+def test_wait_pays_off_debt(sleep):
+    limiter = ReadCapacityLimiter(100)
+    limiter.wait()
+    sleep.assert_not_called()
+    # Consuming more than the bucket holds puts it into debt.
+    limiter.consume(150)
+    sleep.side_effect = lambda delay: limiter.consume(-delay * limiter.rate)
+    limiter.wait()
+    assert sleep.call_count == 1
+    assert sleep.call_args[0][0] == pytest.approx(0.5, abs=0.05)
+
+
+def test_throttle_and_recover():
+    limiter = ReadCapacityLimiter(100, max_concurrency=8, recovery_steps=4)
+    limiter.on_throttle()
+    assert limiter.throttle_count == 1
+    assert limiter.rate == 50
+    assert limiter.concurrency == 4
+    limiter.on_throttle()
+    assert limiter.rate == 25
+    assert limiter.concurrency == 2
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 100
+    assert limiter.concurrency > 2
+
+
+def test_min_rate():
+    limiter = ReadCapacityLimiter(10, min_rate=4)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 4
+
+
+def test_parent_is_charged():
+    parent = ReadCapacityLimiter(100)
+    first = ReadCapacityLimiter(80, parent=parent)
+    second = ReadCapacityLimiter(80, parent=parent)
+    first.consume(60)
+    second.consume(60)
+    # Neither table is in debt on its own, but together they are.
+    assert first._tokens >= 0 and second._tokens >= 0
+    assert parent._tokens < 0
+    first.on_throttle()
+    assert parent.rate == 100
@@ -0,0 +1,75 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from tap_dynamodb.retry import RetryPolicy
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": ""}}, "Scan")
+
+
+@patch("tap_dynamodb.retry.time.sleep")
+def test_retry_until_success(sleep):
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+    request = Mock(
+        side_effect=[
+            client_error("ProvisionedThroughputExceededException"),
+            EndpointConnectionError(endpoint_url="http://localhost"),
+            client_error("ProvisionedThroughputExceededException"),
+            "response",
+        ]
+    )
+    on_retry = Mock()
+    assert policy.call(request, on_retry=on_retry) == "response"
+    assert request.call_count == 4
+    assert on_retry.call_count == 3
+    assert policy.retry_count == 3
+    assert policy.retry_counts == {
+        "ProvisionedThroughputExceededException": 2,
+        "EndpointConnectionError": 1,
+    }
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert all(1 <= delay <= 4 for delay in delays)
+
+
+@patch("tap_dynamodb.retry.time.sleep")
+def test_retry_counts_per_scope(sleep):
+    policy = RetryPolicy()
+    for scope in ("table_0", "table_1", "table_0"):
+        request = Mock(side_effect=[client_error("ThrottlingException"), "response"])
+        policy.call(request, scope=scope)
+    policy.call(Mock(side_effect=[client_error("InternalServerError"), "response"]))
+    assert policy.pop_retry_counts("table_0") == {"ThrottlingException": 2}
+    # The counts of a scope are reset once popped.
+    assert policy.pop_retry_counts("table_0") == {}
+    assert policy.pop_retry_counts("table_1") == {"ThrottlingException": 1}
+    assert policy.retry_count == 4
+
+
+@patch("tap_dynamodb.retry.time.sleep")
+def test_not_retryable(sleep):
+    policy = RetryPolicy()
+    request = Mock(side_effect=client_error("ValidationException"))
+    with pytest.raises(ClientError):
+        policy.call(request)
+    assert request.call_count == 1
+    sleep.assert_not_called()
+
+
+@patch("tap_dynamodb.retry.time.sleep")
+def test_max_elapsed_time(sleep):
+    policy = RetryPolicy(base_delay=10, max_delay=10, max_elapsed_time=25)
+    request = Mock(side_effect=client_error("ThrottlingException"))
+    with patch("tap_dynamodb.retry.time.monotonic", side_effect=[0, 0, 10, 20]):
+        with pytest.raises(ClientError):
+            policy.call(request)
+    assert request.call_count == 3
+    assert policy.retry_count == 2
+
+
+def test_custom_error_codes():
+    policy = RetryPolicy(retryable_error_codes=["ValidationException"])
+    assert policy.is_retryable(client_error("ValidationException"))
+    assert not policy.is_retryable(client_error("ThrottlingException"))
@@ -0,0 +1,58 @@
+from tap_dynamodb.scan_planner import plan_scan
+
+GB = 1024**3
+
+
+def describe(size, count, provisioned=None):
+    table = {"TableName": "table", "TableSizeBytes": size, "ItemCount": count}
+    if provisioned:
+        table["ProvisionedThroughput"] = {"ReadCapacityUnits": provisioned}
+    else:
+        table["BillingModeSummary"] = {"BillingMode": "PAY_PER_REQUEST"}
+    return table
+
+
+def test_plan_on_demand():
+    plan = plan_scan(describe(10 * GB, 10_000_000))
+    assert plan.billing_mode == "PAY_PER_REQUEST"
+    assert plan.total_segments == 5
+    assert plan.read_capacity_units is None
+    assert plan.limit is None
+    # Eventually consistent reads cost half a unit per 4 KB.
+    assert plan.estimated_read_capacity_units == 10 * GB / 4096 / 2
+    assert plan.scan_kwargs == {"ConsistentRead": False, "TotalSegments": 5}
+
+
+def test_plan_provisioned():
+    plan = plan_scan(describe(GB, GB // 1024, provisioned=100))
+    assert plan.total_segments == 1
+    assert plan.read_capacity_units == 50
+    # 50 RCU per second read 400 KB, 400 items of 1 KB.
+    assert plan.limit == 400
+    assert plan.estimated_seconds == GB / 4096 / 2 / 50
+    assert plan.scan_kwargs == {"ConsistentRead": False, "Limit": 400}
+
+
+def test_plan_configured_rate():
+    plan = plan_scan(
+        describe(GB, 1_000_000, provisioned=100),
+        read_capacity_units=1000,
+        consistent_read=True,
+    )
+    assert plan.read_capacity_units == 1000
+    # A second of the rate reads more than a page.
+    assert plan.limit is None
+    assert plan.estimated_read_capacity_units == GB / 4096
+    assert plan.to_dict()["scan_kwargs"] == {"ConsistentRead": True}
+
+
+def test_plan_empty_table():
+    plan = plan_scan(describe(0, 0, provisioned=5))
+    assert plan.total_segments == 1
+    assert plan.limit is None
+    assert plan.estimated_read_capacity_units == 0.5
+
+
+def test_plan_max_segments():
+    assert plan_scan(describe(1000 * GB, 10**9)).total_segments == 64
+    assert plan_scan(describe(1000 * GB, 10**9), max_segments=8).total_segments == 8
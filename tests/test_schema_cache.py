@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from tap_dynamodb.dynamodb_connector import DynamoDbConnector
+from tap_dynamodb.schema_cache import SchemaCache
+from tests.test_dynamodb_connector import SAMPLE_CONFIG, create_table
+
+SCHEMA = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+
+def test_get_put(tmp_path):
+    cache = SchemaCache(tmp_path / "schemas.json")
+    assert cache.get("table", "abc") is None
+    cache.put("table", "abc", SCHEMA)
+    assert cache.get("table", "abc") == SCHEMA
+    assert cache.get("table", "def") is None
+    # The cache is persisted.
+    assert SchemaCache(tmp_path / "schemas.json").get("table", "abc") == SCHEMA
+
+
+def test_ttl(tmp_path):
+    cache = SchemaCache(tmp_path / "schemas.json", ttl=60)
+    with patch("tap_dynamodb.schema_cache.time.time", return_value=1000):
+        cache.put("table", "abc", SCHEMA)
+    with patch("tap_dynamodb.schema_cache.time.time", return_value=1059):
+        assert cache.get("table", "abc") == SCHEMA
+    with patch("tap_dynamodb.schema_cache.time.time", return_value=1061):
+        assert cache.get("table", "abc") is None
+
+
+def test_max_entries(tmp_path):
+    cache = SchemaCache(tmp_path / "schemas.json", max_entries=2)
+    for num in range(3):
+        with patch("tap_dynamodb.schema_cache.time.time", return_value=1000 + num):
+            cache.put(f"table_{num}", "abc", SCHEMA)
+    cache.ttl = float("inf")
+    assert cache.get("table_0", "abc") is None
+    assert cache.get("table_1", "abc") == SCHEMA
+    assert cache.get("table_2", "abc") == SCHEMA
+
+
+def test_corrupt_file(tmp_path):
+    (tmp_path / "schemas.json").write_text("{")
+    cache = SchemaCache(tmp_path / "schemas.json")
+    assert cache.get("table", "abc") is None
+    cache.put("table", "abc", SCHEMA)
+    assert cache.get("table", "abc") == SCHEMA
+
+
+@mock_aws
+def test_get_table_json_schema_cached(tmp_path):
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    table.put_item(Item={"year": 2023, "title": "foo"})
+    # END PREP
+
+    config = {**SAMPLE_CONFIG, "schema_cache_path": str(tmp_path / "schemas.json")}
+    schema = DynamoDbConnector(config).get_table_json_schema("table", 5, {})
+    db_obj = DynamoDbConnector(config)
+    with patch.object(db_obj, "_get_sample_records") as sample:
+        assert db_obj.get_table_json_schema("table", 5, {}) == schema
+        sample.assert_not_called()
+        # Sampling different items invalidates the cached schema.
+        sample.return_value = [{"year": "2023", "title": "foo", "extra": "bar"}]
+        assert (
+            "extra"
+            in db_obj.get_table_json_schema("table", 5, {"Limit": 1})["properties"]
+        )
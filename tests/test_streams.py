@@ -0,0 +1,907 @@
+import gzip
+import json
+import logging
+import threading
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from click.testing import CliRunner
+from moto import mock_aws
+
+from tap_dynamodb.streams import TableStream
+from tap_dynamodb.tap import TapDynamoDB
+from tests.test_dynamodb_connector import SAMPLE_CONFIG, create_table
+
+
+def create_populated_table(num_items=5):
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = create_table(moto_conn, "table")
+    for num in range(num_items):
+        table.put_item(Item={"year": 2023, "title": f"foo_{num}"})
+    return table
+
+
+@mock_aws
+def test_get_records_checkpoints():
+    # PREP
+    create_populated_table()
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "table_scan_kwargs": {"table": {"Limit": 1}},
+            "scan_checkpoint_interval": 2,
+        },
+    )
+    stream = tap.streams["table"]
+    records = stream.get_records(None)
+    for _ in range(3):
+        next(records)
+    checkpoint = stream.stream_state["scan_checkpoint"]
+    assert checkpoint["total_segments"] == 1
+    assert checkpoint["segments"]["0"]["last_evaluated_key"] == {
+        "year": {"N": "2023"},
+        "title": {"S": "foo_1"},
+    }
+    assert len(list(records)) == 2
+    assert "scan_checkpoint" not in stream.stream_state
+
+
+@mock_aws
+def test_get_records_resume():
+    # PREP
+    create_populated_table()
+    # END PREP
+
+    state = {
+        "bookmarks": {
+            "table": {
+                "scan_checkpoint": {
+                    "total_segments": 1,
+                    "segments": {
+                        "0": {
+                            "last_evaluated_key": {
+                                "year": {"N": "2023"},
+                                "title": {"S": "foo_1"},
+                            }
+                        }
+                    },
+                }
+            }
+        }
+    }
+    tap = TapDynamoDB(config={**SAMPLE_CONFIG, "tables": ["table"]}, state=state)
+    records = list(tap.streams["table"].get_records(None))
+    assert [record["title"] for record in records] == ["foo_2", "foo_3", "foo_4"]
+
+
+@mock_aws
+def test_get_records_resume_parallel():
+    # PREP
+    create_populated_table()
+    # END PREP
+
+    state = {
+        "bookmarks": {
+            "table": {
+                "scan_checkpoint": {
+                    "total_segments": 2,
+                    "segments": {"0": {"done": True}, "1": {"done": True}},
+                }
+            }
+        }
+    }
+    tap = TapDynamoDB(
+        config={**SAMPLE_CONFIG, "tables": ["table"], "scan_segments": 2},
+        state=state,
+    )
+    assert list(tap.streams["table"].get_records(None)) == []
+
+
+@mock_aws
+def test_get_records_streams():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = moto_conn.create_table(
+        TableName="table",
+        KeySchema=[{"AttributeName": "title", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "title", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+        StreamSpecification={
+            "StreamEnabled": True,
+            "StreamViewType": "NEW_AND_OLD_IMAGES",
+        },
+    )
+    table.put_item(Item={"title": "foo", "year": 2023})
+    # END PREP
+
+    config = {
+        **SAMPLE_CONFIG,
+        "tables": ["table"],
+        "table_sync_modes": {"table": "streams"},
+    }
+    tap = TapDynamoDB(config=config)
+    stream = tap.streams["table"]
+    assert stream.replication_method == "LOG_BASED"
+    assert "_sdc_deleted_at" in stream.schema["properties"]
+    records = list(stream.get_records(None))
+    # The initial scan is followed by the changes since the stream was enabled.
+    assert [record.get("_sdc_event_name") for record in records] == [None, "INSERT"]
+    position = stream.stream_state["stream_position"]
+    assert position["stream_arn"] == table.latest_stream_arn
+    assert len(position["shards"]) == 1
+
+    table.put_item(Item={"title": "bar", "year": 2024})
+    table.update_item(
+        Key={"title": "foo"},
+        UpdateExpression="SET #y = :y",
+        ExpressionAttributeNames={"#y": "year"},
+        ExpressionAttributeValues={":y": 2025},
+    )
+    table.delete_item(Key={"title": "bar"})
+
+    tap = TapDynamoDB(config=config, state=tap.state)
+    records = list(tap.streams["table"].get_records(None))
+    assert [
+        (record["_sdc_event_name"], record["title"], record["year"])
+        for record in records
+    ] == [
+        ("INSERT", "bar", "2024"),
+        ("MODIFY", "foo", "2025"),
+        ("REMOVE", "bar", "2024"),
+    ]
+    assert records[-1]["_sdc_deleted_at"] is not None
+
+
+def write_export_files(root, export_arn, files):
+    export_dir = root / "exports" / "AWSDynamoDB" / export_arn.rsplit("/", 1)[-1]
+    (export_dir / "data").mkdir(parents=True)
+    manifest_lines = []
+    for name, items in files.items():
+        key = f"exports/AWSDynamoDB/{export_dir.name}/data/{name}.json.gz"
+        lines = "".join(json.dumps({"Item": item}) + "\n" for item in items)
+        (root / key).write_bytes(gzip.compress(lines.encode("utf-8")))
+        manifest_lines.append(json.dumps({"dataFileS3Key": key}) + "\n")
+    manifest_files_key = f"exports/AWSDynamoDB/{export_dir.name}/manifest-files.json"
+    (root / manifest_files_key).write_text("".join(manifest_lines))
+    (export_dir / "manifest-summary.json").write_text(
+        json.dumps({"manifestFilesS3Key": manifest_files_key})
+    )
+
+
+def create_export():
+    table = create_populated_table()
+    client = boto3.client("dynamodb", region_name="us-west-2")
+    client.update_continuous_backups(
+        TableName="table",
+        PointInTimeRecoverySpecification={"PointInTimeRecoveryEnabled": True},
+    )
+    boto3.client("s3", region_name="us-west-2").create_bucket(
+        Bucket="bucket",
+        CreateBucketConfiguration={"LocationConstraint": "us-west-2"},
+    )
+    return client.export_table_to_point_in_time(
+        TableArn=table.table_arn,
+        S3Bucket="bucket",
+        S3Prefix="exports",
+        ExportFormat="DYNAMODB_JSON",
+    )["ExportDescription"]["ExportArn"]
+
+
+@mock_aws
+def test_get_records_export(tmp_path, capsys):
+    # PREP
+    export_arn = create_export()
+    write_export_files(
+        tmp_path,
+        export_arn,
+        {
+            "a": [
+                {"year": {"N": "2023"}, "title": {"S": f"foo_{num}"}}
+                for num in range(3)
+            ],
+            "b": [
+                {
+                    "year": {"N": "2024"},
+                    "title": {"S": "bar"},
+                    "tags": {"SS": ["y", "x"]},
+                }
+            ],
+        },
+    )
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "table_sync_modes": {"table": "export"},
+            "export_arns": {"table": export_arn},
+            "export_filesystem_url": str(tmp_path),
+            "export_poll_interval": 0.1,
+        },
+    )
+    stream = tap.streams["table"]
+    records = list(stream.get_records(None))
+    assert sorted(record["title"] for record in records) == [
+        "bar",
+        "foo_0",
+        "foo_1",
+        "foo_2",
+    ]
+    assert {"year": "2024", "title": "bar", "tags": ["x", "y"]} in records
+    assert "export_position" not in stream.stream_state
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    positions = [
+        message["value"]["bookmarks"]["table"]["export_position"]
+        for message in messages
+        if message["type"] == "STATE"
+    ]
+    # The export is saved before waiting for it.
+    assert positions[0] == {"export_arn": export_arn, "completed_files": []}
+
+
+@mock_aws
+def test_get_records_export_saved_before_waiting(capsys):
+    # PREP
+    create_export()
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "table_sync_modes": {"table": "export"},
+            "export_s3_bucket": "bucket",
+            "export_s3_prefix": "exports",
+        },
+    )
+    stream = tap.streams["table"]
+    with (
+        patch.object(
+            stream._dynamodb_conn, "wait_for_export", side_effect=KeyboardInterrupt
+        ),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        list(stream.get_records(None))
+    # The run is interrupted while the export is running, the next run reuses it.
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert messages[-1]["type"] == "STATE"
+    position = messages[-1]["value"]["bookmarks"]["table"]["export_position"]
+    assert position["export_arn"].startswith("arn:aws:dynamodb:")
+    assert position["completed_files"] == []
+
+
+@mock_aws
+def test_get_records_export_resume(tmp_path):
+    # PREP
+    export_arn = create_export()
+    write_export_files(
+        tmp_path,
+        export_arn,
+        {
+            "a": [{"year": {"N": "2023"}, "title": {"S": "foo"}}],
+            "b": [{"year": {"N": "2024"}, "title": {"S": "bar"}}],
+        },
+    )
+    # END PREP
+
+    state = {
+        "bookmarks": {
+            "table": {
+                "export_position": {
+                    "export_arn": export_arn,
+                    "completed_files": [
+                        f"exports/AWSDynamoDB/{export_arn.rsplit('/', 1)[-1]}"
+                        "/data/a.json.gz"
+                    ],
+                }
+            }
+        }
+    }
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "table_sync_modes": {"table": "export"},
+            "export_filesystem_url": str(tmp_path),
+            "export_poll_interval": 0.1,
+        },
+        state=state,
+    )
+    records = list(tap.streams["table"].get_records(None))
+    assert [record["title"] for record in records] == ["bar"]
+
+
+def create_updates_table():
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    table = moto_conn.create_table(
+        TableName="table",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "tenant", "AttributeType": "S"},
+            {"AttributeName": "updated_at", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "updates",
+                "KeySchema": [
+                    {"AttributeName": "tenant", "KeyType": "HASH"},
+                    {"AttributeName": "updated_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    for num, (tenant, updated_at) in enumerate(
+        [
+            ("a", "2024-01-01"),
+            ("a", "2024-03-01"),
+            ("b", "2024-02-01"),
+            ("b", "2024-04-01"),
+            ("c", "2024-05-01"),
+        ]
+    ):
+        table.put_item(
+            Item={"id": str(num), "tenant": tenant, "updated_at": updated_at}
+        )
+    return table
+
+
+QUERY_CONFIG = {
+    **SAMPLE_CONFIG,
+    "tables": ["table"],
+    "table_sync_modes": {"table": "query"},
+    "table_query_configs": {
+        "table": {
+            "index_name": "updates",
+            "partition_key": "tenant",
+            "partition_values": ["a", "b"],
+            "replication_key": "updated_at",
+        }
+    },
+}
+
+
+@mock_aws
+def test_get_records_query():
+    # PREP
+    create_updates_table()
+    # END PREP
+
+    tap = TapDynamoDB(config=QUERY_CONFIG)
+    stream = tap.streams["table"]
+    assert stream.replication_method == "INCREMENTAL"
+    assert stream.replication_key == "updated_at"
+    stream.sync()
+    assert stream.stream_state["replication_key_value"] == "2024-04-01"
+
+
+@mock_aws
+def test_get_records_query_bookmark(capsys):
+    # PREP
+    create_updates_table()
+    # END PREP
+
+    state = {
+        "bookmarks": {
+            "table": {
+                "replication_key": "updated_at",
+                "replication_key_value": "2024-02-01",
+            }
+        }
+    }
+    tap = TapDynamoDB(config=QUERY_CONFIG, state=state)
+    tap.streams["table"].sync()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [message["record"] for message in messages if message["type"] == "RECORD"]
+    assert sorted(record["updated_at"] for record in records) == [
+        "2024-03-01",
+        "2024-04-01",
+    ]
+
+
+@mock_aws
+def test_discover_streams_concurrently():
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    for num in range(12):
+        create_table(moto_conn, f"table_{num}").put_item(
+            Item={"year": 2023, "title": "foo"}
+        )
+    # END PREP
+
+    tap = TapDynamoDB(config={**SAMPLE_CONFIG, "discovery_workers": 4})
+    table_names = tap.streams["table_0"]._dynamodb_conn.list_tables()
+    assert sorted(tap.streams) == sorted(table_names)
+    assert all(
+        stream.primary_keys == ["year", "title"] for stream in tap.streams.values()
+    )
+    # Each table was described once and the description reused.
+    assert sorted(tap.streams["table_0"]._dynamodb_conn._table_descriptions) == sorted(
+        table_names
+    )
+
+
+@mock_aws
+def test_sync_all_concurrently(capsys):
+    # PREP
+    moto_conn = boto3.resource("dynamodb", region_name="us-west-2")
+    for num, size in enumerate([2, 10, 5]):
+        table = create_table(moto_conn, f"table_{num}")
+        for item in range(size):
+            table.put_item(Item={"year": 2023, "title": f"foo_{item}"})
+    # END PREP
+
+    tap = TapDynamoDB(config={**SAMPLE_CONFIG, "table_sync_workers": 2})
+    started = []
+    sync = TableStream.sync
+
+    def _sync(stream, *args, **kwargs):
+        started.append(stream.name)
+        return sync(stream, *args, **kwargs)
+
+    with patch.object(TableStream, "sync", _sync):
+        tap.sync_all()
+    # The smallest table is synced last.
+    assert started[-1] == "table_0"
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [message for message in messages if message["type"] == "RECORD"]
+    assert len(records) == 17
+    assert set(messages[-1]["value"]["bookmarks"]) == {"table_0", "table_1", "table_2"}
+
+
+@mock_aws
+def test_state_updates_hold_the_tap_lock(capsys):
+    # PREP
+    create_populated_table(2)
+    # END PREP
+
+    tap = TapDynamoDB(config={**SAMPLE_CONFIG, "tables": ["table"]})
+    stream = tap.streams["table"]
+    stream._increment_stream_state({"year": 2023, "title": "foo_0"})
+    # The state of a stream is neither updated nor written while another stream
+    # holds the lock.
+    for update in (
+        lambda: stream.get_context_state({"segment": 0, "total_segments": 1}),
+        lambda: stream._write_starting_replication_value(None),
+        stream.finalize_state_progress_markers,
+    ):
+        with tap.state_lock:
+            thread = threading.Thread(target=update)
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+        thread.join()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert messages[-1]["type"] == "STATE"
+    # Every tap has a lock of its own.
+    other_tap = TapDynamoDB(config={**SAMPLE_CONFIG, "tables": ["table"]})
+    assert other_tap.state_lock is not tap.state_lock
+    assert other_tap.streams["table"]._state_lock is other_tap.state_lock
+
+
+@mock_aws
+def test_get_records_projection():
+    # PREP
+    table = create_populated_table(2)
+    table.put_item(Item={"year": 2024, "title": "bar", "info": {"plot": "baz"}})
+    # END PREP
+
+    config = {**SAMPLE_CONFIG, "tables": ["table"]}
+    catalog = TapDynamoDB(config=config).catalog_dict
+    for metadata in catalog["streams"][0]["metadata"]:
+        if metadata["breadcrumb"] == ["properties", "info"]:
+            metadata["metadata"]["selected"] = False
+    stream = TapDynamoDB(config=config, catalog=catalog).streams["table"]
+    assert stream.get_selected_scan_kwargs() == {
+        "ProjectionExpression": "#proj0, #proj1",
+        "ExpressionAttributeNames": {"#proj0": "year", "#proj1": "title"},
+    }
+    records = list(stream.get_records(None))
+    assert len(records) == 3
+    assert all("info" not in record for record in records)
+
+
+@mock_aws
+def test_sync_batches(capsys, tmp_path):
+    # PREP
+    create_populated_table()
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "table_scan_kwargs": {"table": {"Limit": 3}},
+            "scan_checkpoint_interval": 1,
+            "batch_config": {
+                "encoding": {"format": "jsonl", "compression": "gzip"},
+                "storage": {"root": f"file://{tmp_path}"},
+                "batch_size": 2,
+            },
+        },
+    )
+    tap.sync_all()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert not [message for message in messages if message["type"] == "RECORD"]
+    batches = [message for message in messages if message["type"] == "BATCH"]
+    # Batches hold whole pages of three and two items.
+    assert [len(batch["manifest"]) for batch in batches] == [2, 1]
+    titles = []
+    for batch in batches:
+        for url in batch["manifest"]:
+            with gzip.open(url.removeprefix("file://"), "rt") as batch_file:
+                titles.extend(json.loads(line)["title"] for line in batch_file)
+    assert titles == [f"foo_{num}" for num in range(5)]
+    # The state written after the first batch covers exactly its records.
+    first_batch = messages.index(batches[0])
+    assert not [
+        message
+        for message in messages[:first_batch]
+        if message["type"] == "STATE" and message["value"]
+    ]
+    (partition,) = messages[first_batch + 1]["value"]["bookmarks"]["table"][
+        "partitions"
+    ]
+    assert partition["context"] == {"segment": 0, "total_segments": 1}
+    assert partition["last_evaluated_key"]["title"] == {"S": "foo_2"}
+
+
+@mock_aws
+def test_sync_batches_partitions(capsys, tmp_path):
+    # PREP
+    create_populated_table(10)
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "scan_segments": 2,
+            "table_scan_kwargs": {"table": {"Limit": 3}},
+            "scan_checkpoint_interval": 1,
+            "batch_config": {
+                "encoding": {"format": "jsonl", "compression": "gzip"},
+                "storage": {"root": f"file://{tmp_path}"},
+                "batch_size": 2,
+            },
+        },
+    )
+    segment_titles = [_segment_titles(segment, 2) for segment in range(2)]
+    tap.sync_all()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    batched: list[str] = []
+    for message in messages:
+        if message["type"] == "BATCH":
+            for url in message["manifest"]:
+                with gzip.open(url.removeprefix("file://"), "rt") as batch_file:
+                    batched.extend(json.loads(line)["title"] for line in batch_file)
+        elif message["type"] == "STATE" and message["value"]:
+            # Every STATE message only covers records already in a batch file.
+            for partition in message["value"]["bookmarks"]["table"]["partitions"]:
+                titles = segment_titles[partition["context"]["segment"]]
+                if partition.get("done"):
+                    assert set(titles) <= set(batched)
+                elif "last_evaluated_key" in partition:
+                    key = partition["last_evaluated_key"]["title"]["S"]
+                    assert set(titles[: titles.index(key) + 1]) <= set(batched)
+    assert sorted(batched) == sorted(segment_titles[0] + segment_titles[1])
+    # The scan is complete, the next run starts from scratch.
+    assert messages[-1]["value"]["bookmarks"]["table"]["partitions"] == [
+        {"context": {"segment": segment, "total_segments": 2}} for segment in range(2)
+    ]
+
+
+@mock_aws
+def test_sync_batches_partitions_resume_empty(capsys, tmp_path):
+    # PREP
+    create_populated_table(10)
+    # END PREP
+
+    partitions = [{"segment": segment, "total_segments": 2} for segment in range(2)]
+    segment_titles = [_segment_titles(segment, 2) for segment in range(2)]
+    # Resume the segment holding the items after its last item, so the pages
+    # left to scan are empty, and mark the other one as done.
+    resumed = max(range(2), key=lambda segment: len(segment_titles[segment]))
+    start_key = {"year": {"N": "2023"}, "title": {"S": segment_titles[resumed][-1]}}
+    state = {
+        "bookmarks": {
+            "table": {
+                "partitions": [
+                    {"context": partitions[1 - resumed], "done": True},
+                    {"context": partitions[resumed], "last_evaluated_key": start_key},
+                ]
+            }
+        }
+    }
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "scan_segments": 2,
+            "batch_config": {
+                "encoding": {"format": "jsonl", "compression": "gzip"},
+                "storage": {"root": f"file://{tmp_path}"},
+                "batch_size": 2,
+            },
+        },
+        state=state,
+    )
+    tap.sync_all()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert not [message for message in messages if message["type"] == "BATCH"]
+    # The scan is complete, the next run starts from scratch.
+    assert messages[-1]["type"] == "STATE"
+    assert messages[-1]["value"]["bookmarks"]["table"]["partitions"] == [
+        {"context": partitions[1 - resumed]},
+        {"context": partitions[resumed]},
+    ]
+
+
+@mock_aws
+def test_plan_scans(tmp_path):
+    # PREP
+    create_populated_table()
+    # END PREP
+
+    config = {**SAMPLE_CONFIG, "tables": ["table"], "plan_scans": True}
+    tap = TapDynamoDB(config=config)
+    stream = tap.streams["table"]
+    scan = stream._dynamodb_conn.scan_client.scan
+    with patch.object(
+        stream._dynamodb_conn.scan_client, "scan", side_effect=scan
+    ) as mock_scan:
+        assert len(list(stream.get_records(None))) == 5
+    assert mock_scan.call_args.kwargs["ConsistentRead"] is False
+
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    result = CliRunner().invoke(
+        TapDynamoDB.cli, ["--config", str(config_path), "--plan"]
+    )
+    assert result.exit_code == 0, result.output
+    plans = json.loads(result.stdout)
+    (plan,) = plans["tables"]
+    assert plan["table_name"] == "table"
+    # Half of the provisioned read capacity of the table.
+    assert plan["read_capacity_units"] == 5
+    assert plan["scan_kwargs"] == {"ConsistentRead": False}
+    assert plans["estimated_read_capacity_units"] == 0.5
+
+
+@mock_aws
+def test_schema_evolution(capsys):
+    # PREP
+    table = create_populated_table(2)
+    table.put_item(Item={"year": 2024, "title": "bar", "info": {"plot": "baz"}})
+    table.put_item(Item={"year": 2024, "title": "foo", "info": {"plot": "qux"}})
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "infer_schema_sample_size": 1,
+            "schema_evolution": True,
+        },
+    )
+    assert "info" not in tap.streams["table"].schema["properties"]
+    tap.sync_all()
+    messages = [
+        message
+        for message in map(json.loads, capsys.readouterr().out.splitlines())
+        if message["type"] in ("SCHEMA", "RECORD")
+    ]
+    assert [message["type"] for message in messages] == [
+        "SCHEMA",
+        "RECORD",
+        "RECORD",
+        "SCHEMA",
+        "RECORD",
+        "RECORD",
+    ]
+    assert messages[3]["schema"]["properties"]["info"] == {
+        "type": "object",
+        "properties": {"plot": {"type": "string"}},
+    }
+    assert messages[3]["key_properties"] == ["year", "title"]
+    assert messages[4]["record"]["info"] == {"plot": "baz"}
+    assert messages[5]["record"]["info"] == {"plot": "qux"}
+
+
+def _segment_titles(segment, total_segments):
+    client = boto3.client("dynamodb", region_name="us-west-2")
+    items = client.scan(
+        TableName="table", Segment=segment, TotalSegments=total_segments
+    )["Items"]
+    return [item["title"]["S"] for item in items]
+
+
+def _record_titles(capsys):
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return sorted(
+        message["record"]["title"]
+        for message in messages
+        if message["type"] == "RECORD"
+    )
+
+
+@mock_aws
+def test_sync_partitions(capsys, caplog):
+    # PREP
+    create_populated_table(20)
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "scan_segments": 4,
+            "table_scan_kwargs": {},
+        }
+    )
+    stream = tap.streams["table"]
+    assert stream.partitions == [
+        {"segment": segment, "total_segments": 4} for segment in range(4)
+    ]
+    # The tap's logging setup replaces the root handlers.
+    metrics_logger = logging.getLogger("singer_sdk.metrics")
+    metrics_logger.addHandler(caplog.handler)
+    try:
+        tap.sync_all()
+    finally:
+        metrics_logger.removeHandler(caplog.handler)
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [message for message in messages if message["type"] == "RECORD"]
+    assert sorted(record["record"]["title"] for record in records) == sorted(
+        f"foo_{num}" for num in range(20)
+    )
+    # No partition context is added to the records.
+    assert all(set(record["record"]) == {"year", "title"} for record in records)
+    # The progress of the segments is cleared once the scan completes.
+    assert messages[-1]["value"]["bookmarks"]["table"]["partitions"] == [
+        {"context": partition} for partition in stream.partitions
+    ]
+    points = [
+        json.loads(record.getMessage().removeprefix("METRIC: "))
+        for record in caplog.records
+        if record.name == "singer_sdk.metrics"
+    ]
+    counts = {
+        point["tags"]["context"]["segment"]: point["value"]
+        for point in points
+        if point["metric"] == "partition_record_count"
+    }
+    assert counts == {segment: len(_segment_titles(segment, 4)) for segment in range(4)}
+
+
+@mock_aws
+def test_sync_logs_retries(capsys, caplog):
+    # PREP
+    create_populated_table(5)
+    # END PREP
+
+    tap = TapDynamoDB(
+        config={
+            **SAMPLE_CONFIG,
+            "tables": ["table"],
+            "table_scan_kwargs": {"table": {"Limit": 2}},
+        }
+    )
+    dynamodb_conn = tap.streams["table"]._dynamodb_conn
+    scan = dynamodb_conn.scan_client.scan
+    errors = iter(["ProvisionedThroughputExceededException", "InternalServerError"])
+
+    def _scan(**kwargs):
+        code = next(errors, None)
+        if code is not None:
+            raise ClientError({"Error": {"Code": code, "Message": ""}}, "Scan")
+        return scan(**kwargs)
+
+    metrics_logger = logging.getLogger("singer_sdk.metrics")
+    metrics_logger.addHandler(caplog.handler)
+    try:
+        with (
+            patch.object(dynamodb_conn.scan_client, "scan", side_effect=_scan),
+            patch("tap_dynamodb.retry.time.sleep"),
+        ):
+            tap.sync_all()
+    finally:
+        metrics_logger.removeHandler(caplog.handler)
+    assert len(_record_titles(capsys)) == 5
+    points = [
+        json.loads(record.getMessage().removeprefix("METRIC: "))
+        for record in caplog.records
+        if record.name == "singer_sdk.metrics"
+    ]
+    retries = {
+        point["tags"]["error_code"]: point["value"]
+        for point in points
+        if point["metric"] == "sync_retry_count"
+    }
+    assert retries == {
+        "InternalServerError": 1,
+        "ProvisionedThroughputExceededException": 1,
+    }
+    # The retries are reset once reported.
+    assert dynamodb_conn.retry_policy.pop_retry_counts("table") == {}
+
+
+@mock_aws
+def test_sync_partitions_resume(capsys):
+    # PREP
+    create_populated_table(20)
+    # END PREP
+
+    partitions = [{"segment": segment, "total_segments": 4} for segment in range(4)]
+    segment_titles = [_segment_titles(segment, 4) for segment in range(4)]
+    # Resume the segment holding the most items after its fifth item and mark
+    # another one as done.
+    resumed = max(range(4), key=lambda segment: len(segment_titles[segment]))
+    done = (resumed + 1) % 4
+    start_key = {"year": {"N": "2023"}, "title": {"S": segment_titles[resumed][4]}}
+    state = {
+        "bookmarks": {
+            "table": {
+                "partitions": [
+                    {"context": partitions[done], "done": True},
+                    {"context": partitions[resumed], "last_evaluated_key": start_key},
+                ]
+            }
+        }
+    }
+    tap = TapDynamoDB(
+        config={**SAMPLE_CONFIG, "tables": ["table"], "scan_segments": 4},
+        state=state,
+    )
+    tap.sync_all()
+    expected = segment_titles[resumed][5:] + [
+        title
+        for segment in range(4)
+        if segment not in (resumed, done)
+        for title in segment_titles[segment]
+    ]
+    assert _record_titles(capsys) == sorted(expected)
+
+
+@mock_aws
+def test_sync_partitions_migrate_scan_checkpoint(capsys):
+    # PREP
+    create_populated_table(20)
+    # END PREP
+
+    segment_titles = [_segment_titles(segment, 2) for segment in range(2)]
+    resumed = max(range(2), key=lambda segment: len(segment_titles[segment]))
+    start_key = {"year": {"N": "2023"}, "title": {"S": segment_titles[resumed][4]}}
+    state = {
+        "bookmarks": {
+            "table": {
+                "scan_checkpoint": {
+                    "total_segments": 2,
+                    "segments": {
+                        str(1 - resumed): {"done": True},
+                        str(resumed): {"last_evaluated_key": start_key},
+                    },
+                }
+            }
+        }
+    }
+    tap = TapDynamoDB(
+        config={**SAMPLE_CONFIG, "tables": ["table"], "scan_segments": 2},
+        state=state,
+    )
+    stream = tap.streams["table"]
+    # Listing the partitions leaves the state as it is.
+    assert len(stream.partitions) == 2
+    assert "scan_checkpoint" in stream.stream_state
+    tap.sync_all()
+    # The checkpoint was moved to the partitions before the first one synced.
+    assert _record_titles(capsys) == sorted(segment_titles[resumed][5:])
+    assert "scan_checkpoint" not in stream.stream_state